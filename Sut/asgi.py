@@ -2,6 +2,8 @@
 ASGI config for Sut project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with an ASGI server, e.g. ``uvicorn Sut.asgi:application --workers 4``,
+so the async read endpoints (see Sut/async_api.py) don't hold a worker thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -0,0 +1,108 @@
+"""
+Vistas asíncronas de solo lectura para los endpoints más consultados.
+
+DRF 3.14 no soporta vistas async, así que estas son vistas de Django que
+reutilizan los viewsets, filtros y serializadores existentes: la consulta a
+la base de datos usa el ORM asíncrono y la serialización (que puede tocar el
+almacenamiento o la caché) corre con ``sync_to_async``. Los demás métodos
+HTTP de la misma URL se delegan a la vista DRF síncrona.
+"""
+from contextlib import nullcontext
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.http.response import HttpResponseBase
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .db_routers import replica_reads
+
+
+def api_request(request):
+    """``Request`` de DRF con los autenticadores configurados en REST_FRAMEWORK"""
+    return Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+
+
+def json_renderer():
+    """Primer renderer JSON de DEFAULT_RENDERER_CLASSES"""
+    for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+        if issubclass(renderer_class, JSONRenderer):
+            return renderer_class()
+    return JSONRenderer()
+
+
+def render(response):
+    """Prepara un ``Response`` de DRF para que el handler de Django lo renderice como JSON"""
+    renderer = json_renderer()
+    response.accepted_renderer = renderer
+    response.accepted_media_type = renderer.media_type
+    response.renderer_context = {}
+    return response
+
+
+def error_response(request, exc):
+    """Mismo formato y código que el manejador de excepciones de DRF"""
+    headers = {}
+    if isinstance(exc, NotAuthenticated):
+        # Sin encabezado WWW-Authenticate (p. ej. SessionAuthentication) DRF responde 403
+        authenticate_header = request.authenticators[0].authenticate_header(request) if request.authenticators else None
+        if authenticate_header:
+            headers['WWW-Authenticate'] = authenticate_header
+        else:
+            exc.status_code = 403
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    return render(Response(data, status=exc.status_code, headers=headers))
+
+
+def async_read_view(authenticated=False, replica=False):
+    """
+    Convierte una corrutina ``func(request, ...)`` que recibe un ``Request`` de
+    DRF y devuelve datos serializables, un ``Response`` o una respuesta de
+    Django (p. ej. 304) en una vista asíncrona de Django.
+    Con ``replica=True`` las consultas de ``func`` pueden ir a la réplica.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def view(request, *args, **kwargs):
+            drf_request = api_request(request)
+            try:
+                # La autenticación consulta sesión y usuario en la base de datos
+                user = await sync_to_async(lambda: drf_request.user)()
+                if authenticated and not user.is_authenticated:
+                    raise NotAuthenticated()
+                with replica_reads() if replica else nullcontext():
+                    result = await func(drf_request, *args, **kwargs)
+            except Http404:
+                return error_response(drf_request, NotFound())
+            except APIException as exc:
+                return error_response(drf_request, exc)
+            if isinstance(result, Response):
+                return render(result)
+            if isinstance(result, HttpResponseBase):
+                return result
+            return render(Response(result))
+        return view
+    return decorator
+
+
+def get_or_delegate(async_view, sync_view):
+    """
+    Atiende GET y HEAD con la vista asíncrona y delega cualquier otro método a
+    la vista DRF síncrona, así ambas comparten la misma URL.
+    """
+    delegate = sync_to_async(sync_view)
+
+    @wraps(async_view)
+    async def view(request, *args, **kwargs):
+        if request.method in ('GET', 'HEAD'):
+            return await async_view(request, *args, **kwargs)
+        return await delegate(request, *args, **kwargs)
+
+    # Igual que csrf_exempt, que en Django 4.2 no soporta vistas async;
+    # DRF valida CSRF en SessionAuthentication para los métodos inseguros
+    view.csrf_exempt = True
+    return view
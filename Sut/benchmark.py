@@ -0,0 +1,153 @@
+"""
+Escenarios de benchmark de la API sobre la base de datos configurada.
+
+Cada escenario hace peticiones con el cliente de pruebas de Django y mide
+latencia, consultas SQL y tamaño de respuesta. Los resultados se reportan
+como un diccionario serializable a JSON para comparar corridas entre commits.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from .renderers import FastJSONRenderer
+from companies.models import CompanyProfile
+from students.models import StudentProfile
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def benchmark_host():
+    """Primer host permitido literal; con ALLOWED_HOSTS vacío y DEBUG, Django acepta localhost"""
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+class Scenario:
+    def __init__(self, name, method, path, data=None, user=None, content_type='application/json'):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.data = data
+        self.user = user
+        self.content_type = content_type
+
+    def request(self, client):
+        if self.method == 'get':
+            return client.get(self.path, self.data)
+        return getattr(client, self.method)(self.path, self.data, content_type=self.content_type)
+
+
+def default_scenarios(password):
+    """Escenarios sobre el primer estudiante y la primera empresa con perfil"""
+    student = StudentProfile.objects.select_related('user').order_by('id').first()
+    company = CompanyProfile.objects.select_related('user').order_by('id').first()
+    if student is None or company is None:
+        raise ValueError('Se necesita al menos un estudiante y una empresa; ejecute manage.py seed')
+
+    credentials = {'email': student.user.email, 'password': password}
+    scenarios = [
+        Scenario('login', 'post', '/api/students/auth/login/', credentials),
+        Scenario('feed', 'get', '/api/posts/', user=student.user),
+        Scenario('jobs_list', 'get', '/api/jobs/postings/'),
+        Scenario('jobs_search', 'get', '/api/jobs/postings/', {'q': 'python'}),
+        Scenario('applications_student', 'get', '/api/jobs/applications/', user=student.user),
+        Scenario('applications_company', 'get', '/api/jobs/applications/', user=company.user),
+        Scenario('my_profile', 'get', '/api/students/profiles/my_profile/', user=student.user),
+        Scenario(
+            'profile_update', 'patch', '/api/students/profiles/update_my_profile/',
+            {'bio': 'Perfil actualizado por el benchmark.'}, user=student.user,
+        ),
+    ]
+
+    job = company.job_postings.order_by('-applications_count').first()
+    if job is not None:
+        scenarios.append(Scenario(
+            'applicants_ranked', 'get', f'/api/jobs/postings/{job.id}/applications/',
+            {'ordering': 'score'}, user=company.user,
+        ))
+    return scenarios
+
+
+def run_scenario(scenario, iterations, warmup=3, using='default'):
+    client = Client(SERVER_NAME=benchmark_host())
+    if scenario.user is not None:
+        client.force_login(scenario.user)
+
+    for _ in range(warmup):
+        scenario.request(client)
+
+    latencies = []
+    queries = []
+    sizes = []
+    statuses = set()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with CaptureQueriesContext(connections[using]) as context:
+            request_started = time.perf_counter()
+            response = scenario.request(client)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        queries.append(len(context.captured_queries))
+        sizes.append(len(response.content))
+        statuses.add(response.status_code)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'name': scenario.name,
+        'method': scenario.method.upper(),
+        'path': scenario.path,
+        'iterations': iterations,
+        'status_codes': sorted(statuses),
+        'latency_ms': {
+            'mean': statistics.fmean(latencies),
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'max': max(latencies),
+        },
+        'queries': {'mean': statistics.fmean(queries), 'max': max(queries)},
+        'response_bytes': statistics.fmean(sizes),
+        'throughput_rps': iterations / elapsed if elapsed else None,
+    }
+
+
+def compare_renderers(scenario, iterations, renderers=(JSONRenderer, FastJSONRenderer)):
+    """
+    Tiempo de renderizar la respuesta del escenario con cada renderer, sobre
+    los mismos datos ya serializados; verifica que la salida sea idéntica.
+    """
+    client = Client(SERVER_NAME=benchmark_host())
+    if scenario.user is not None:
+        client.force_login(scenario.user)
+    data = scenario.request(client).data
+
+    timings = {}
+    outputs = set()
+    for renderer_class in renderers:
+        renderer = renderer_class()
+        outputs.add(renderer.render(data))
+        latencies = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            renderer.render(data)
+            latencies.append((time.perf_counter() - started) * 1000)
+        timings[renderer_class.__name__] = {'mean': statistics.fmean(latencies), 'p50': percentile(latencies, 0.50)}
+
+    return {
+        'name': scenario.name,
+        'response_bytes': len(next(iter(outputs))),
+        'identical_output': len(outputs) == 1,
+        'render_ms': timings,
+    }
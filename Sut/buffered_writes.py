@@ -0,0 +1,98 @@
+"""
+Inserciones por lotes en segundo plano.
+
+``BufferedWriter`` acumula instancias de un modelo en memoria y las inserta
+con un solo ``bulk_create`` cuando el búfer llega a ``max_size`` o cuando
+pasan ``max_delay`` segundos desde la primera pendiente, así quien escribe
+no paga una inserción por registro. Es para registros de solo anexado
+(auditoría, eventos) que toleran perderse si el proceso muere antes de
+vaciar el búfer; al terminar el proceso normalmente se vacía con atexit.
+
+Si el lote falla se reintenta registro por registro, así un registro
+inválido no descarta a los demás; solo se pierden (y se registran en el
+log) los que vuelven a fallar.
+"""
+import atexit
+import logging
+import threading
+
+from django.db import connection, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    def __init__(self, model, max_size=100, max_delay=2.0):
+        self.model = model
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def add(self, obj):
+        with self._lock:
+            self._buffer.append(obj)
+            full = len(self._buffer) >= self.max_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.max_delay, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def pending(self):
+        """Copia de los registros aún no insertados por este proceso"""
+        with self._lock:
+            return list(self._buffer)
+
+    def flush_matching(self, predicate):
+        """Inserta ya, en la transacción actual, los registros pendientes que cumplen ``predicate``"""
+        with self._lock:
+            batch = [obj for obj in self._buffer if predicate(obj)]
+            self._buffer = [obj for obj in self._buffer if not predicate(obj)]
+        if batch:
+            self.write(batch)
+        return len(batch)
+
+    def flush(self):
+        """Inserta los registros pendientes; devuelve cuántos"""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if batch:
+            try:
+                self.write(batch)
+            except Exception:
+                logger.warning(
+                    'Falló el lote de %d registros de %s; se reintenta uno por uno',
+                    len(batch), self.model.__name__, exc_info=True,
+                )
+                self.write_one_by_one(batch)
+        return len(batch)
+
+    def write_one_by_one(self, batch):
+        for obj in batch:
+            try:
+                self.write([obj])
+            except Exception:
+                logger.exception('No se pudo insertar %r en %s', obj, self.model.__name__)
+
+    def write(self, batch):
+        """
+        Inserta un lote en una transacción (si falla no queda nada insertado);
+        las subclases pueden mantener datos derivados en la misma transacción.
+        """
+        with transaction.atomic():
+            self.model.objects.bulk_create(batch, batch_size=self.max_size)
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            # El hilo del temporizador abre su propia conexión
+            connection.close()
@@ -0,0 +1,176 @@
+"""
+Pub/sub de eventos para el canal de Server-Sent Events (``/api/events/``).
+
+Cada conexión SSE es una suscripción con una cola acotada en el event loop
+del servidor ASGI; una conexión ociosa solo cuesta esa cola y su generador.
+``publish`` se puede llamar desde código síncrono (señales, vistas DRF) y es
+seguro entre hilos.
+
+El broker se elige con EVENTS_BROKER. ``InMemoryBroker`` reparte dentro del
+proceso; con varios procesos use ``RedisBroker``, que publica en Redis y
+mantiene un único hilo suscrito por proceso que reparte localmente.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTION_QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 3000
+
+
+def user_channel(user_id):
+    return f'user:{user_id}'
+
+
+class Subscription:
+    __slots__ = ('loop', 'queue', 'channels', 'overflowed')
+
+    def __init__(self, loop, channels, maxsize=SUBSCRIPTION_QUEUE_SIZE):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.channels = tuple(channels)
+        self.overflowed = False
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # El event loop ya se cerró; el broker la quitará al desuscribirse
+            pass
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Cliente lento: se descarta el evento y se le pide resincronizar
+            self.overflowed = True
+
+
+class InMemoryBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, channels):
+        """Debe llamarse desde el event loop que consumirá la suscripción"""
+        subscription = Subscription(asyncio.get_running_loop(), channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, channel, event):
+        self.dispatch(channel, event)
+
+    def dispatch(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+
+class RedisBroker(InMemoryBroker):
+    prefix = 'sut:events:'
+
+    def __init__(self, url='redis://localhost:6379/0'):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured('RedisBroker requiere el paquete redis')
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, channel, event):
+        self._client.publish(f'{self.prefix}{channel}', json.dumps(event))
+
+    def subscribe(self, channels):
+        subscription = super().subscribe(channels)
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='events-redis', daemon=True)
+                self._listener.start()
+        return subscription
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f'{self.prefix}*')
+                for message in pubsub.listen():
+                    channel = message['channel'].decode()[len(self.prefix):]
+                    self.dispatch(channel, json.loads(message['data']))
+            except Exception:
+                logger.exception('Se perdió la suscripción a Redis; reintentando')
+                time.sleep(1)
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    broker_class = import_string(getattr(settings, 'EVENTS_BROKER', 'Sut.events.InMemoryBroker'))
+    return broker_class(**getattr(settings, 'EVENTS_BROKER_OPTIONS', {}))
+
+
+def publish_to_users(user_ids, event):
+    broker = get_broker()
+    for user_id in set(user_ids):
+        broker.publish(user_channel(user_id), event)
+
+
+def format_event(event_type, data):
+    return f'event: {event_type}\ndata: {json.dumps(data)}\n\n'
+
+
+async def event_stream(broker, channels, heartbeat=HEARTBEAT_SECONDS, max_duration=None):
+    """
+    Generador asíncrono con el cuerpo de la respuesta SSE.
+
+    Envía comentarios de keep-alive cada ``heartbeat`` segundos y termina tras
+    ``max_duration`` para que EventSource reconecte; así una conexión cuyo
+    cliente desapareció sin avisar no vive para siempre.
+    """
+    loop = asyncio.get_running_loop()
+    max_duration = max_duration or settings.EVENTS_STREAM_MAX_SECONDS
+    deadline = loop.time() + max_duration
+    subscription = broker.subscribe(channels)
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+        while loop.time() < deadline:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), min(heartbeat, max(deadline - loop.time(), 0))
+                )
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            yield format_event(event['type'], event)
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield format_event('resync', {})
+    finally:
+        broker.unsubscribe(subscription)
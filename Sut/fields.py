@@ -0,0 +1,141 @@
+"""
+Selección de campos de las respuestas (sparse fieldsets).
+
+``?fields=id,title,company.company_name`` limita los campos de la
+representación; los nombres con punto seleccionan campos de un objeto
+anidado. ``?expand=job,job.company`` indica qué objetos anidados se
+representan completos: los que no aparecen se reducen a su id. Sin
+``expand`` se conservan todos los objetos anidados, como antes; nombrar un
+subcampo en ``fields`` también expande su objeto.
+
+Los viewsets usan la misma selección para pedir con select_related o
+prefetch_related solo las relaciones que se van a representar.
+"""
+from rest_framework import serializers
+
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+SELECTION_CONTEXT_KEY = 'field_selection'
+
+
+def parse_paths(value):
+    """'id,company.company_name' -> {'id': {}, 'company': {'company_name': {}}}; None si no se indicó"""
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in filter(None, path.strip().split('.')):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class FieldSelection:
+    """Campos (``fields``) y objetos expandidos (``expand``) de una representación; None es "todos" """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request):
+        params = getattr(request, 'query_params', None) or getattr(request, 'GET', {})
+        return cls(parse_paths(params.get(FIELDS_PARAM)), parse_paths(params.get(EXPAND_PARAM)))
+
+    @property
+    def is_default(self):
+        return self.fields is None and self.expand is None
+
+    def includes(self, name):
+        return self.fields is None or name in self.fields
+
+    def expands(self, path):
+        """Si el objeto anidado en ``path`` ('job.company') se representa completo"""
+        selection = self
+        for name in path.split('.'):
+            if not selection.includes(name):
+                return False
+            if selection.expand is not None and name not in selection.expand and not (selection.fields or {}).get(name):
+                return False
+            selection = selection.nested(name)
+        return True
+
+    def nested(self, name):
+        fields = (self.fields or {}).get(name) or None
+        expand = None if self.expand is None else self.expand.get(name, {})
+        return FieldSelection(fields, expand)
+
+    def related(self, *paths):
+        """
+        Rutas de select_related/prefetch_related ('company__user') recortadas a la
+        parte que se va a representar; omite las que no se expanden.
+        """
+        related = []
+        for path in paths:
+            names = path.split('__')
+            depth = 0
+            while depth < len(names) and self.expands('.'.join(names[:depth + 1])):
+                depth += 1
+            if depth:
+                related.append('__'.join(names[:depth]))
+        return related
+
+    def select_related(self, queryset, *paths):
+        related = self.related(*paths)
+        # select_related() sin argumentos seguiría todas las relaciones
+        return queryset.select_related(*related) if related else queryset
+
+    def key(self):
+        return repr((self.fields, self.expand))
+
+
+ALL_FIELDS = FieldSelection()
+
+
+class SelectableFieldsMixin:
+    """
+    Mixin para ModelSerializer que aplica la selección de ``?fields=`` y
+    ``?expand=``. El serializador raíz la lee de la petición y se la pasa a
+    sus serializadores anidados. Solo afecta a la representación: los campos
+    de escritura se conservan. ``context['field_selection']`` reemplaza la
+    selección de la petición.
+    """
+
+    def get_selection(self):
+        selection = getattr(self, '_selection', None)
+        if selection is None:
+            root = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+            request = self.context.get('request')
+            # Quien necesita la representación completa la fija en el contexto
+            selection = self.context.get(SELECTION_CONTEXT_KEY) if root is None else ALL_FIELDS
+            if selection is None:
+                selection = FieldSelection.from_request(request) if request else ALL_FIELDS
+            self._selection = selection
+        return selection
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.get_selection()
+        if selection.is_default:
+            return fields
+
+        selected = {}
+        for name, field in fields.items():
+            if not selection.includes(name) and not field.write_only:
+                continue
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, serializers.BaseSerializer):
+                if not selection.expands(name):
+                    # Solo el id: se lee de la columna sin cargar el objeto relacionado
+                    model_field = self.Meta.model._meta.get_field(field.source or name)
+                    field = serializers.ReadOnlyField(source=model_field.attname)
+                else:
+                    nested._selection = selection.nested(name)
+            selected[name] = field
+        return selected
+
+    def cache_variant(self):
+        variant = super().cache_variant()
+        selection = self.get_selection()
+        return variant if selection.is_default else f'{variant}|{selection.key()}'
@@ -0,0 +1,24 @@
+"""
+Registro de las consultas críticas del proyecto.
+
+Cada app declara sus consultas en un módulo ``hot_queries.py`` usando el
+decorador ``register``; el comando ``explain_hot_queries`` las descubre y
+revisa su plan de ejecución.
+"""
+from django.utils.module_loading import autodiscover_modules
+
+
+registry = {}
+
+
+def register(name):
+    """Registra una función que devuelve el queryset de una consulta crítica"""
+    def decorator(func):
+        registry[name] = func
+        return func
+    return decorator
+
+
+def autodiscover():
+    autodiscover_modules('hot_queries')
+    return registry
@@ -0,0 +1,136 @@
+"""
+Derivados redimensionados de las imágenes subidas.
+
+Al guardar una imagen se encolan sus tamaños en un pool de hilos fuera del
+ciclo de la petición. Cada derivado se vuelve a codificar (WebP o JPEG) sin
+metadatos EXIF y se guarda en ``thumbs/`` junto a la ruta del original.
+Los derivados generados se anotan en la caché (``thumb:<ruta del derivado>``), así
+``srcset`` arma las URLs con una lectura de caché y sin preguntar al
+almacenamiento si existe cada archivo. Si un tamaño no está anotado (aún no
+existe, o la anotación se desalojó o es de otro proceso) ``srcset`` apunta a
+la vista ``thumbnail``, que lo genera si falta, lo anota y redirige a él.
+"""
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from PIL import Image, ImageOps, features
+
+
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = (48, 96, 192)
+IMAGE_SIZES = (320, 640, 1280)
+ALLOWED_SIZES = frozenset(AVATAR_SIZES + IMAGE_SIZES)
+ALLOWED_PREFIXES = ('posts/', 'student_profiles/', 'company_profiles/')
+THUMBNAIL_DIR = 'thumbs'
+DERIVATIVE_CACHE_KEY = 'thumb:{}'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def thumbnail_format():
+    image_format = getattr(settings, 'THUMBNAIL_FORMAT', 'WEBP').upper()
+    if image_format == 'WEBP' and not features.check('webp'):
+        return 'JPEG'
+    return image_format
+
+
+def derivative_name(name, width):
+    root, _ = os.path.splitext(name)
+    extension = 'webp' if thumbnail_format() == 'WEBP' else 'jpg'
+    return f'{THUMBNAIL_DIR}/{root}_{width}w.{extension}'
+
+
+def render_derivative(image, width, image_format):
+    resized = image.copy()
+    resized.thumbnail((width, image.height), Image.LANCZOS)
+    if image_format == 'JPEG' and resized.mode != 'RGB':
+        resized = resized.convert('RGB')
+
+    buffer = io.BytesIO()
+    # Al no pasar exif= la imagen resultante no conserva los metadatos del original
+    resized.save(buffer, image_format, quality=82, optimize=True)
+    return buffer.getvalue()
+
+
+def record_derivatives(targets):
+    """Anota que los derivados ``targets`` (rutas) ya existen"""
+    caches['default'].set_many(dict.fromkeys(map(DERIVATIVE_CACHE_KEY.format, targets), True), None)
+
+
+def generate_derivatives(name, sizes, storage=default_storage):
+    """Genera los tamaños que falten para la imagen ``name``; devuelve sus rutas"""
+    image_format = thumbnail_format()
+    targets = {width: derivative_name(name, width) for width in sizes}
+    missing = {width: target for width, target in targets.items() if not storage.exists(target)}
+    record_derivatives(target for width, target in targets.items() if width not in missing)
+    if not missing:
+        return []
+
+    with storage.open(name) as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image.load()
+
+    created = []
+    for width, target in missing.items():
+        saved = storage.save(target, ContentFile(render_derivative(image, width, image_format)))
+        if saved != target:
+            # Otro proceso generó el mismo tamaño mientras tanto
+            storage.delete(saved)
+        created.append(target)
+    record_derivatives(created)
+    return created
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'THUMBNAIL_WORKERS', 2),
+                thread_name_prefix='thumbnails',
+            )
+        return _executor
+
+
+def _generate_in_background(name, sizes):
+    try:
+        generate_derivatives(name, sizes)
+    except Exception:
+        logger.exception('No se pudieron generar los derivados de %s', name)
+
+
+def schedule_derivatives(fieldfile, sizes):
+    """Encola la generación de derivados una vez confirmada la transacción"""
+    if not fieldfile:
+        return
+    name = fieldfile.name
+    transaction.on_commit(lambda: get_executor().submit(_generate_in_background, name, sizes))
+
+
+def srcset(fieldfile, sizes, request=None):
+    """Mapa {ancho: url} de los derivados de la imagen, o None si no hay imagen"""
+    if not fieldfile:
+        return None
+
+    targets = {width: derivative_name(fieldfile.name, width) for width in sizes}
+    recorded = caches['default'].get_many([DERIVATIVE_CACHE_KEY.format(target) for target in targets.values()])
+    urls = {}
+    for width, target in targets.items():
+        if DERIVATIVE_CACHE_KEY.format(target) in recorded:
+            url = fieldfile.storage.url(target)
+        else:
+            url = f"{reverse('thumbnail')}?{urlencode({'path': fieldfile.name, 'w': width})}"
+        urls[str(width)] = request.build_absolute_uri(url) if request else url
+    return urls
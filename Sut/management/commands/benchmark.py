@@ -0,0 +1,106 @@
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from Sut.benchmark import compare_renderers, default_scenarios, run_scenario
+from Sut.management.commands.seed import SEED_PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta los escenarios de benchmark de la API y reporta latencias p50/p95/p99, '
+        'consultas SQL y throughput en JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--only', nargs='*', help='Nombres de los escenarios a ejecutar')
+        parser.add_argument('--password', default=SEED_PASSWORD, help='Contraseña de los usuarios sembrados')
+        parser.add_argument('--output', help='Archivo donde guardar el reporte JSON')
+        parser.add_argument('--compare', help='Reporte JSON previo contra el cual comparar el p50')
+        parser.add_argument(
+            '--renderers', action='store_true',
+            help='Compara el tiempo de renderizado de JSONRenderer y FastJSONRenderer en los escenarios GET',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scenarios = default_scenarios(options['password'])
+        except ValueError as error:
+            raise CommandError(str(error))
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios if scenario.name in options['only']]
+
+        results = []
+        for scenario in scenarios:
+            result = run_scenario(scenario, options['iterations'], options['warmup'])
+            results.append(result)
+            latency = result['latency_ms']
+            self.stderr.write(
+                f"{result['name']:<22} p50={latency['p50']:.1f}ms p95={latency['p95']:.1f}ms "
+                f"p99={latency['p99']:.1f}ms queries={result['queries']['mean']:.1f} "
+                f"rps={result['throughput_rps']:.1f}"
+            )
+
+        report = {
+            'commit': self.git_commit(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'debug': settings.DEBUG,
+            },
+            'scenarios': results,
+        }
+
+        if options['compare']:
+            self.compare(report, options['compare'])
+
+        if options['renderers']:
+            report['renderers'] = [
+                self.report_renderers(compare_renderers(scenario, options['iterations']))
+                for scenario in scenarios if scenario.method == 'get'
+            ]
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as stream:
+                stream.write(output)
+        else:
+            self.stdout.write(output)
+
+    def report_renderers(self, result):
+        timings = ' '.join(f"{name}={timing['p50']:.2f}ms" for name, timing in result['render_ms'].items())
+        self.stderr.write(
+            f"{result['name']:<22} {timings} bytes={result['response_bytes']} "
+            f"identical={result['identical_output']}"
+        )
+        return result
+
+    def compare(self, report, path):
+        with open(path) as stream:
+            previous = {scenario['name']: scenario for scenario in json.load(stream)['scenarios']}
+        for scenario in report['scenarios']:
+            before = previous.get(scenario['name'])
+            if not before:
+                continue
+            old, new = before['latency_ms']['p50'], scenario['latency_ms']['p50']
+            scenario['p50_change_pct'] = (new - old) / old * 100 if old else None
+            self.stderr.write(f"{scenario['name']:<22} p50 {old:.1f}ms -> {new:.1f}ms")
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,65 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from Sut.hot_queries import autodiscover
+
+
+SQLITE_SEQ_SCAN = re.compile(r'\bSCAN (?:TABLE )?(\w+)(?: AS \w+)?\s*$')
+POSTGRES_SEQ_SCAN = re.compile(r'Seq Scan on (\w+)')
+UNINDEXED_SORTS = ('USE TEMP B-TREE FOR ORDER BY', 'Sort  (')
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta EXPLAIN sobre cada consulta crítica registrada y falla si alguna '
+        'recorre secuencialmente una tabla con más filas que el umbral'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-rows', type=int, default=1000,
+            help='Filas a partir de las cuales un recorrido secuencial se considera un error',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        max_rows = options['max_rows']
+        connection = connections[alias]
+        failures = []
+
+        for name, build_queryset in sorted(autodiscover().items()):
+            plan = build_queryset().using(alias).explain()
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{name}:\n{plan}\n')
+
+            scanned = self.seq_scanned_tables(connection, plan)
+            large = {table: rows for table, rows in scanned.items() if rows > max_rows}
+            if large:
+                detail = ', '.join(f'{table} ({rows} filas)' for table, rows in large.items())
+                failures.append(f'{name}: recorrido secuencial sobre {detail}')
+                self.stdout.write(self.style.ERROR(f'FAIL {name}: {detail}'))
+            elif any(marker in plan for marker in UNINDEXED_SORTS):
+                self.stdout.write(self.style.WARNING(f'SORT {name}: ordenamiento sin índice'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'OK   {name}'))
+
+        if failures:
+            raise CommandError('\n'.join(failures))
+
+    def seq_scanned_tables(self, connection, plan):
+        pattern = POSTGRES_SEQ_SCAN if connection.vendor == 'postgresql' else SQLITE_SEQ_SCAN
+        tables = {match.group(1) for line in plan.splitlines() for match in [pattern.search(line)] if match}
+        return {table: self.table_rows(connection, table) for table in tables}
+
+    def table_rows(self, connection, table):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+                row = cursor.fetchone()
+                if row and row[0] >= 0:
+                    return row[0]
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+            return cursor.fetchone()[0]
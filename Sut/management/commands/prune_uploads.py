@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from Sut.models import Upload
+from Sut.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = 'Elimina las cargas directas que no se completaron dentro del plazo y sus archivos temporales'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.UPLOAD_EXPIRE_HOURS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        expired = Upload.objects.filter(completed_at__isnull=True, created_at__lt=cutoff)
+        count = 0
+        for upload in expired.iterator():
+            discard_upload(upload)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'{count} cargas incompletas eliminadas'))
@@ -0,0 +1,155 @@
+import random
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from companies.models import CompanyProfile
+from jobs.models import JobPosting, JobApplication
+from posts.models import Post
+from students.models import User, StudentProfile
+
+
+SEED_PASSWORD = 'sut-seed-password'
+BATCH_SIZE = 1000
+
+UNIVERSITIES = ['UNAM', 'IPN', 'UAM', 'ITESM', 'UdeG', 'BUAP', 'UANL']
+CAREERS = [
+    'Ingeniería en Sistemas', 'Ingeniería Industrial', 'Administración', 'Contaduría',
+    'Diseño Gráfico', 'Mercadotecnia', 'Ciencia de Datos', 'Derecho',
+]
+SKILLS = [
+    'Python', 'Django', 'React', 'SQL', 'Excel', 'Power BI', 'Java', 'Figma',
+    'Inglés', 'Scrum', 'AWS', 'Docker', 'Contabilidad', 'Ventas', 'Photoshop',
+]
+TITLES = [
+    'Desarrollador Backend', 'Desarrollador Frontend', 'Analista de Datos', 'Becario de Marketing',
+    'Diseñador UX', 'Asistente Contable', 'Ingeniero de Procesos', 'Soporte Técnico',
+]
+LOCATIONS = ['CDMX', 'Guadalajara', 'Monterrey', 'Puebla', 'Querétaro', 'Remoto']
+
+
+class Command(BaseCommand):
+    help = 'Genera datos de prueba con inserciones masivas para benchmarks y desarrollo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=100)
+        parser.add_argument('--companies', type=int, default=10)
+        parser.add_argument('--jobs', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=200)
+        parser.add_argument('--applications', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=None, help='Semilla para resultados reproducibles')
+        parser.add_argument('--password', default=SEED_PASSWORD)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        run = uuid.uuid4().hex[:8]
+        password = make_password(options['password'])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            students = self.create_students(run, options['students'], password)
+            companies = self.create_companies(run, options['companies'], password)
+            jobs = self.create_jobs(companies, options['jobs'])
+            self.create_applications(students, jobs, options['applications'])
+            self.create_posts(
+                [profile.user_id for profile in students + companies], options['posts']
+            )
+            call_command('recount_applications', all=True, stdout=self.stdout)
+            call_command('rebuild_timelines', stdout=self.stdout)
+            call_command('backfill_application_stats', stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Datos generados en {time.perf_counter() - started:.2f}s '
+            f'(lote {run}, contraseña "{options["password"]}")'
+        ))
+
+    def create_users(self, run, prefix, user_type, count, password):
+        users = [
+            User(
+                email=f'{prefix}-{run}-{index}@seed.sut', password=password, user_type=user_type,
+                first_name=prefix.capitalize(), last_name=str(index),
+            )
+            for index in range(count)
+        ]
+        return User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+    def create_students(self, run, count, password):
+        users = self.create_users(run, 'student', 'student', count, password)
+        profiles = [
+            StudentProfile(
+                user=user,
+                university=self.random.choice(UNIVERSITIES),
+                career=self.random.choice(CAREERS),
+                semester=self.random.randint(1, 10),
+                graduation_year=self.random.randint(2025, 2030),
+                bio='Estudiante generado para pruebas de rendimiento.',
+                skills=', '.join(self.random.sample(SKILLS, 4)),
+            )
+            for user in users
+        ]
+        return StudentProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+
+    def create_companies(self, run, count, password):
+        users = self.create_users(run, 'company', 'company', count, password)
+        industries = [choice for choice, _ in CompanyProfile.INDUSTRY_CHOICES]
+        profiles = [
+            CompanyProfile(
+                user=user,
+                company_name=f'Empresa {run} {index}',
+                industry=self.random.choice(industries),
+                description='Empresa generada para pruebas de rendimiento.',
+                address='Av. Reforma 100, CDMX',
+            )
+            for index, user in enumerate(users)
+        ]
+        return CompanyProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+
+    def create_jobs(self, companies, count):
+        if not companies:
+            return []
+        job_types = [choice for choice, _ in JobPosting.JOB_TYPE_CHOICES]
+        jobs = []
+        for _ in range(count):
+            salary_min = self.random.randrange(8000, 40000, 500)
+            jobs.append(JobPosting(
+                company=self.random.choice(companies),
+                title=self.random.choice(TITLES),
+                description='Buscamos talento para unirse a nuestro equipo. ' * 5,
+                requirements=', '.join(self.random.sample(SKILLS, 5)),
+                responsibilities='Colaborar con el equipo y entregar resultados.',
+                location=self.random.choice(LOCATIONS),
+                job_type=self.random.choice(job_types),
+                salary_min=salary_min,
+                salary_max=salary_min + self.random.randrange(2000, 20000, 500),
+                status=self.random.choices(['active', 'closed', 'draft'], weights=[8, 1, 1])[0],
+            ))
+        return JobPosting.objects.bulk_create(jobs, batch_size=BATCH_SIZE)
+
+    def create_applications(self, students, jobs, count):
+        count = min(count, len(students) * len(jobs))
+        statuses = [choice for choice, _ in JobApplication.STATUS_CHOICES]
+        pairs = set()
+        while len(pairs) < count:
+            pairs.add((self.random.randrange(len(students)), self.random.randrange(len(jobs))))
+        applications = [
+            JobApplication(
+                student=students[student], job=jobs[job],
+                cover_letter='Me interesa mucho esta vacante.',
+                status=self.random.choice(statuses),
+            )
+            for student, job in pairs
+        ]
+        return JobApplication.objects.bulk_create(applications, batch_size=BATCH_SIZE)
+
+    def create_posts(self, user_ids, count):
+        if not user_ids:
+            return []
+        posts = [
+            Post(user_id=self.random.choice(user_ids), content=f'Publicación de prueba {index}')
+            for index in range(count)
+        ]
+        return Post.objects.bulk_create(posts, batch_size=BATCH_SIZE)
@@ -0,0 +1,155 @@
+"""
+Métricas en memoria por endpoint y utilidades de medición por petición.
+
+Cada proceso guarda histogramas de latencia y contadores de consultas SQL,
+tiempo de serialización y bytes de respuesta por vista y método. Se exponen
+en formato de texto de Prometheus desde ``/api/_metrics/``.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MAX_PROFILES = 20
+
+_current_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+class RequestTimings:
+    """Tiempos acumulados durante una petición (segundos)"""
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.sections = {}
+        self._depth = {}
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.db_queries += 1
+
+
+def start_request():
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def end_request(token):
+    _current_timings.reset(token)
+
+
+@contextmanager
+def timed(section):
+    """
+    Suma el tiempo del bloque a la sección de la petición en curso.
+
+    Las llamadas anidadas a la misma sección solo cuentan la más externa, así
+    los serializadores anidados no duplican su tiempo.
+    """
+    timings = _current_timings.get()
+    if timings is None or timings._depth.get(section):
+        yield
+        return
+
+    timings._depth[section] = 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings._depth[section] = 0
+        timings.sections[section] = timings.sections.get(section, 0.0) + time.perf_counter() - started
+
+
+class EndpointStats:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.duration = 0.0
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.response_bytes = 0
+        self.statuses = {}
+
+    def observe(self, duration, timings, status_code, response_bytes):
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                self.buckets[index] += 1
+                break
+        self.count += 1
+        self.duration += duration
+        self.db_queries += timings.db_queries
+        self.db_time += timings.db_time
+        self.serializer_time += timings.sections.get('serialize', 0.0)
+        self.response_bytes += response_bytes or 0
+        status_class = f'{status_code // 100}xx'
+        self.statuses[status_class] = self.statuses.get(status_class, 0) + 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.profiles = deque(maxlen=MAX_PROFILES)
+
+    def observe(self, view, method, duration, timings, status_code, response_bytes):
+        with self._lock:
+            stats = self._endpoints.get((view, method))
+            if stats is None:
+                stats = self._endpoints[(view, method)] = EndpointStats()
+            stats.observe(duration, timings, status_code, response_bytes)
+
+    def add_profile(self, profile):
+        self.profiles.append(profile)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self.profiles.clear()
+
+    def prometheus(self):
+        """Exporta las métricas en el formato de texto de Prometheus"""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = [
+                '# HELP sut_request_duration_seconds Request wall time by view',
+                '# TYPE sut_request_duration_seconds histogram',
+            ]
+            for (view, method), stats in endpoints:
+                labels = f'view="{view}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'sut_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'sut_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f'sut_request_duration_seconds_sum{{{labels}}} {stats.duration:.6f}')
+                lines.append(f'sut_request_duration_seconds_count{{{labels}}} {stats.count}')
+
+            counters = [
+                ('sut_requests_total', 'Requests by view and status class', None),
+                ('sut_db_queries_total', 'SQL queries executed by view', 'db_queries'),
+                ('sut_db_duration_seconds_total', 'Time spent in SQL by view', 'db_time'),
+                ('sut_serializer_duration_seconds_total', 'Time spent serializing by view', 'serializer_time'),
+                ('sut_response_bytes_total', 'Response body bytes by view', 'response_bytes'),
+            ]
+            for name, description, attribute in counters:
+                lines.append(f'# HELP {name} {description}')
+                lines.append(f'# TYPE {name} counter')
+                for (view, method), stats in endpoints:
+                    labels = f'view="{view}",method="{method}"'
+                    if attribute is None:
+                        for status_class, count in sorted(stats.statuses.items()):
+                            lines.append(f'{name}{{{labels},status="{status_class}"}} {count}')
+                    else:
+                        lines.append(f'{name}{{{labels}}} {getattr(stats, attribute)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,125 @@
+import cProfile
+import io
+import pstats
+import random
+import time
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+
+from . import metrics
+
+
+def is_staff(request):
+    """Si el usuario ya autenticado de la petición es staff; no lo carga si aún no se leyó"""
+    user = getattr(request, 'user', None)
+    # Bajo ASGI no se puede consultar la base aquí
+    if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+        return False
+    return bool(getattr(user, 'is_staff', False))
+
+
+class RequestMetricsMiddleware:
+    """
+    Mide cada petición: vista, tiempo total, consultas SQL y su tiempo,
+    tiempo de serialización y tamaño de la respuesta.
+
+    Acumula histogramas por endpoint en ``metrics.registry`` y, solo para
+    usuarios staff o con DEBUG, agrega el encabezado ``Server-Timing``. El
+    tiempo de serialización incluye la codificación de la respuesta
+    (Sut/renderers.py) y las representaciones de los serializadores con
+    caché. Con METRICS_PROFILE_SAMPLE_RATE > 0 una
+    fracción de las peticiones se ejecuta bajo cProfile y se guarda el perfil
+    de las que superan METRICS_PROFILE_THRESHOLD_MS.
+
+    Funciona bajo WSGI y ASGI; con ASGI el perfil de una petición puede
+    incluir otras corrutinas que corrieron en el mismo event loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.sample_rate = getattr(settings, 'METRICS_PROFILE_SAMPLE_RATE', 0.0)
+        self.profile_threshold = getattr(settings, 'METRICS_PROFILE_THRESHOLD_MS', 500) / 1000
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with self.measure(request) as measurement:
+            response = self.get_response(request)
+        return self.finish(request, response, measurement)
+
+    async def __acall__(self, request):
+        with self.measure(request) as measurement:
+            response = await self.get_response(request)
+        return self.finish(request, response, measurement)
+
+    @contextmanager
+    def measure(self, request):
+        timings, token = metrics.start_request()
+        measurement = {'timings': timings, 'profiler': self.start_profiler()}
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.execute_wrapper))
+                try:
+                    yield measurement
+                finally:
+                    if measurement['profiler'] is not None:
+                        measurement['profiler'].disable()
+        finally:
+            metrics.end_request(token)
+            measurement['duration'] = time.perf_counter() - started
+
+    def start_profiler(self):
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Ya hay otro perfilador activo
+            return None
+        return profiler
+
+    def finish(self, request, response, measurement):
+        duration, timings, profiler = measurement['duration'], measurement['timings'], measurement['profiler']
+        view = getattr(request.resolver_match, 'view_name', None) or 'unresolved'
+        response_bytes = None if response.streaming else len(response.content)
+        metrics.registry.observe(view, request.method, duration, timings, response.status_code, response_bytes)
+        if settings.DEBUG or is_staff(request):
+            response['Server-Timing'] = self.server_timing(duration, timings)
+
+        if profiler is not None and duration >= self.profile_threshold:
+            metrics.registry.add_profile(self.profile_summary(request, view, duration, profiler))
+        return response
+
+    def server_timing(self, duration, timings):
+        entries = [
+            f'db;dur={timings.db_time * 1000:.1f};desc="{timings.db_queries} queries"',
+        ]
+        for section, elapsed in timings.sections.items():
+            entries.append(f'{section};dur={elapsed * 1000:.1f}')
+        entries.append(f'total;dur={duration * 1000:.1f}')
+        return ', '.join(entries)
+
+    def profile_summary(self, request, view, duration, profiler):
+        output = io.StringIO()
+        pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(30)
+        return {
+            'view': view,
+            'method': request.method,
+            'path': request.path,
+            'duration_ms': duration * 1000,
+            'captured_at': time.time(),
+            'stats': output.getvalue(),
+        }
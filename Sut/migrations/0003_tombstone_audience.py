@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Sut', '0002_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tombstone',
+            name='user_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='user_type',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+    ]
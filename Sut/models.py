@@ -0,0 +1,62 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    Registro de un objeto eliminado para la sincronización incremental (ver Sut/sync.py).
+
+    Solo lo reciben el usuario ``user_id`` o los usuarios de tipo ``user_type``
+    si se indican; sin ninguno de los dos es visible para todos.
+    """
+    collection = models.CharField(max_length=100)
+    object_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(null=True, blank=True)
+    user_type = models.CharField(max_length=10, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.collection}:{self.object_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['collection', 'deleted_at'], name='sut_tombstone_collection_idx'),
+        ]
+
+
+class ModelVersion(models.Model):
+    """Hora del último cambio de la representación de algún objeto de un modelo (ver Sut/serializer_cache.py)"""
+    label = models.CharField(max_length=100, primary_key=True)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.label}@{self.changed_at.isoformat()}"
+
+
+class Upload(models.Model):
+    """Carga directa de un archivo de medios, en curso o completada (ver Sut/uploads.py)"""
+    PURPOSE_CHOICES = (
+        ('student_profile', 'Student profile picture'),
+        ('company_profile', 'Company profile picture'),
+        ('post', 'Post image'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='uploads')
+    purpose = models.CharField(max_length=20, choices=PURPOSE_CHOICES)
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    name = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.purpose}:{self.filename}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['completed_at', 'created_at'], name='sut_upload_pending_idx'),
+        ]
@@ -0,0 +1,27 @@
+"""
+Paginación por defecto de los listados: keyset (cursor) sobre el orden del queryset.
+
+A diferencia de OFFSET, el costo de cada página no crece con su posición y
+las inserciones concurrentes no duplican ni saltan elementos. El orden es
+el del queryset (o el ``ordering`` del modelo) seguido del pk.
+
+CursorPagination de DRF solo se posiciona con el primer campo del orden:
+los empates en ese campo se recorren con un desplazamiento dentro del
+cursor, no con el pk. Agregar el pk solo hace que el orden de los empates
+sea estable entre páginas; si muchas filas comparten el primer campo, esas
+páginas cuestan como OFFSET.
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def get_ordering(self, request, queryset, view):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        ordering = ordering or list(queryset.model._meta.ordering) or ['-pk']
+        if not {'pk', '-pk', 'id', '-id'} & set(ordering):
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+        return tuple(ordering)
@@ -0,0 +1,174 @@
+"""
+Caché de representaciones serializadas por objeto.
+
+Cada objeto se guarda bajo ``ser:<app.model>:<pk>`` junto con su
+``updated_at``; una entrada cuyo sello no coincide con el objeto se
+descarta. Como la representación incluye URLs absolutas, dentro de cada
+entrada se separa por variante (esquema y host de la petición).
+
+El backend es el alias ``SERIALIZER_CACHE_ALIAS`` de ``CACHES``. Las
+señales de cada app llaman a ``invalidate`` cuando cambia un objeto o
+alguno de los objetos que su representación anida, pero solo en la caché
+del proceso que escribió: por eso el caché se usa solo con una caché
+compartida entre procesos (p. ej. Redis), ``SERIALIZER_CACHE_ENABLED``, y
+una caché por proceso es un error (``check_serializer_cache``). Los campos
+de ``cache_stamp_fields`` forman el sello, así los contadores que se
+actualizan con F() sin tocar ``updated_at`` también invalidan la entrada.
+
+Cada invalidación además actualiza la versión del modelo (``ModelVersion``,
+la hora del último cambio), que los listados usan para sus ETag sin
+renderizar el cuerpo (ver Sut/sync.py). La versión se guarda en la base de
+datos, en la misma transacción que la escritura, así todos los procesos la
+ven aunque la caché no sea compartida.
+"""
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import models
+from django.utils import timezone
+from rest_framework import serializers
+
+from .metrics import timed
+from .models import ModelVersion
+
+
+# Variantes por entrada (host y selección de campos); las demás no se guardan
+MAX_CACHE_VARIANTS = 8
+PER_PROCESS_CACHES = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    return caches[getattr(settings, 'SERIALIZER_CACHE_ALIAS', 'serializers')]
+
+
+def cache_enabled():
+    return getattr(settings, 'SERIALIZER_CACHE_ENABLED', False)
+
+
+@checks.register(checks.Tags.caches)
+def check_serializer_cache(app_configs, **kwargs):
+    """Una caché por proceso seguiría sirviendo representaciones invalidadas en otro proceso"""
+    if cache_enabled() and isinstance(get_cache(), PER_PROCESS_CACHES):
+        return [checks.Error(
+            'SERIALIZER_CACHE_ENABLED requiere que SERIALIZER_CACHE_ALIAS '
+            f'({settings.SERIALIZER_CACHE_ALIAS}) sea una caché compartida entre procesos',
+            hint='Configure SERIALIZER_CACHE_BACKEND (p. ej. Redis) o desactive SERIALIZER_CACHE_ENABLED',
+            id='Sut.E001',
+        )]
+    return []
+
+
+def cache_key(model, pk):
+    return f'ser:{model._meta.label_lower}:{pk}'
+
+
+def touch(model):
+    """Marca que cambió la representación de algún objeto del modelo"""
+    label, now = model._meta.label_lower, timezone.now()
+    if not ModelVersion.objects.filter(label=label).update(changed_at=now):
+        ModelVersion.objects.bulk_create([ModelVersion(label=label, changed_at=now)], ignore_conflicts=True)
+
+
+def model_versions(models):
+    """
+    Hora del último cambio de cada modelo (timestamp). Un modelo que nunca se
+    tocó se inicia en la hora actual.
+    """
+    labels = [model._meta.label_lower for model in models]
+    versions = ModelVersion.objects.filter(label__in=labels)
+    found = dict(versions.values_list('label', 'changed_at'))
+    missing = [label for label in labels if label not in found]
+    if missing:
+        now = timezone.now()
+        ModelVersion.objects.bulk_create(
+            [ModelVersion(label=label, changed_at=now) for label in missing], ignore_conflicts=True,
+        )
+        found.update(versions.filter(label__in=missing).values_list('label', 'changed_at'))
+    return [found[label].timestamp() for label in labels]
+
+
+def invalidate(model, pks):
+    """Elimina del caché las representaciones de los objetos indicados"""
+    keys = [cache_key(model, pk) for pk in pks]
+    if keys:
+        get_cache().delete_many(keys)
+        touch(model)
+
+
+def instance_stamp(instance, fields=('updated_at',)):
+    values = [getattr(instance, name, None) for name in fields]
+    if values[0] is None:
+        return None
+    return '|'.join(value.isoformat() if hasattr(value, 'isoformat') else str(value) for value in values)
+
+
+class CachedListSerializer(serializers.ListSerializer):
+    """Obtiene del caché todas las representaciones de la lista con un solo get_many"""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        items = list(iterable)
+        if not cache_enabled():
+            return [self.child.to_representation(item) for item in items]
+        with timed('serialize'):
+            model = self.child.Meta.model
+            keys = {item.pk: cache_key(model, item.pk) for item in items if item.pk is not None}
+            entries = get_cache().get_many(list(keys.values())) if keys else {}
+            return [
+                self.child.to_cached_representation(item, entries.get(keys.get(item.pk)))
+                for item in items
+            ]
+
+
+class CachedRepresentationMixin:
+    """
+    Mixin para ModelSerializer que reutiliza la representación guardada del objeto.
+
+    La clase debe declarar ``list_serializer_class = CachedListSerializer`` en
+    su Meta para que los listados también lean del caché en bloque.
+    """
+
+    # El primero es updated_at; los demás cambian sin tocarlo (p. ej. contadores)
+    cache_stamp_fields = ('updated_at',)
+
+    def cache_variant(self):
+        request = self.context.get('request')
+        return request.build_absolute_uri('/') if request else ''
+
+    def to_representation(self, instance):
+        with timed('serialize'):
+            if not cache_enabled():
+                return super().to_representation(instance)
+            entry = None
+            if instance.pk is not None:
+                entry = get_cache().get(cache_key(type(instance), instance.pk))
+            return self.to_cached_representation(instance, entry)
+
+    def to_cached_representation(self, instance, entry):
+        stamp = instance_stamp(instance, self.cache_stamp_fields)
+        if instance.pk is None or stamp is None:
+            return super().to_representation(instance)
+
+        variant = self.cache_variant()
+        if entry and entry['stamp'] == stamp and variant in entry['variants']:
+            return entry['variants'][variant]
+
+        data = super().to_representation(instance)
+        if not entry or entry['stamp'] != stamp:
+            entry = {'stamp': stamp, 'variants': {}}
+        if len(entry['variants']) >= MAX_CACHE_VARIANTS:
+            return data
+        entry['variants'][variant] = data
+        get_cache().set(cache_key(type(instance), instance.pk), entry)
+        return data
+
+
+def invalidate_queryset(queryset):
+    invalidate(queryset.model, queryset.values_list('pk', flat=True))
+
+
+def user_fields_changed(update_fields):
+    """Los guardados que solo tocan last_login o password no cambian ninguna representación"""
+    return not update_fields or not set(update_fields) <= {'last_login', 'password'}
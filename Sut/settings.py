@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 from pathlib import Path
 import os
 
+import django
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,9 +47,11 @@ INSTALLED_APPS = [
     'students',
     'jobs',
     'posts',
+    'Sut',
 ]
 
 MIDDLEWARE = [
+    'Sut.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -57,6 +62,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Perfilado muestreado de peticiones lentas (ver Sut/middleware.py)
+METRICS_PROFILE_SAMPLE_RATE = float(os.environ.get('METRICS_PROFILE_SAMPLE_RATE', 0))
+METRICS_PROFILE_THRESHOLD_MS = int(os.environ.get('METRICS_PROFILE_THRESHOLD_MS', 500))
+
 ROOT_URLCONF = 'Sut.urls'
 
 TEMPLATES = [
@@ -81,13 +90,105 @@ WSGI_APPLICATION = 'Sut.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=postgresql usa las mismas variables DB_* que setup_db.py.
+# DB_POOL=pgbouncer desactiva los cursores del lado del servidor (modo
+# transacción de pgbouncer); DB_POOL=psycopg usa el pool de psycopg 3
+# integrado en Django 5.1+. DB_REPLICA_HOST agrega la réplica de lectura
+# (en los tests es un espejo de default; corra la suite sin ella porque los
+# TestCase solo permiten consultas a 'default').
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+DB_POOL = os.environ.get('DB_POOL', '')
+
+
+def postgres_database(prefix, defaults):
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get(f'{prefix}_NAME', defaults.get('NAME', 'Sut')),
+        'USER': os.environ.get(f'{prefix}_USER', defaults.get('USER', 'postgres')),
+        'PASSWORD': os.environ.get(f'{prefix}_PASSWORD', defaults.get('PASSWORD', 'postgres')),
+        'HOST': os.environ.get(f'{prefix}_HOST', defaults.get('HOST', 'localhost')),
+        'PORT': os.environ.get(f'{prefix}_PORT', defaults.get('PORT', '5432')),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_POOL == 'pgbouncer',
+        'OPTIONS': {
+            'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5)),
+        },
+    }
+    if DB_POOL == 'psycopg':
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured('DB_POOL=psycopg requiere Django 5.1 o superior con psycopg 3')
+        # El pool reemplaza a las conexiones persistentes
+        database['CONN_MAX_AGE'] = 0
+        database['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        }
+    return database
+
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {'default': postgres_database('DB', {})}
+    if os.environ.get('DB_REPLICA_HOST'):
+        DATABASES['replica'] = postgres_database('DB_REPLICA', DATABASES['default'])
+        DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        }
     }
+
+DATABASE_ROUTERS = ['Sut.db_routers.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+SERIALIZER_CACHE_ALIAS = 'serializers'
+
+SERIALIZER_CACHE_BACKEND = os.environ.get(
+    'SERIALIZER_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+)
+
+CACHES = {
+    # Con varios procesos use una caché compartida (p. ej. Redis) para que la
+    # invalidación de sesiones y principals llegue a todos
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+    SERIALIZER_CACHE_ALIAS: {
+        'BACKEND': SERIALIZER_CACHE_BACKEND,
+        'LOCATION': os.environ.get('SERIALIZER_CACHE_LOCATION', 'serializers'),
+        'TIMEOUT': int(os.environ.get('SERIALIZER_CACHE_TIMEOUT', 60 * 60)),
+    },
 }
 
+# Las invalidaciones solo llegan a todos los procesos con una caché compartida
+SERIALIZER_CACHE_ENABLED = not SERIALIZER_CACHE_BACKEND.endswith(('.LocMemCache', '.DummyCache'))
+
+if 'redis' not in SERIALIZER_CACHE_BACKEND.lower():
+    # LocMemCache descarta las entradas menos usadas al superar MAX_ENTRIES
+    CACHES[SERIALIZER_CACHE_ALIAS]['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.environ.get('SERIALIZER_CACHE_MAX_ENTRIES', 10000)),
+    }
+
+
+# Sesiones y autenticación (ver students/auth.py)
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+
+PRINCIPAL_CACHE_ALIAS = 'default'
+PRINCIPAL_CACHE_TIMEOUT = int(os.environ.get('PRINCIPAL_CACHE_TIMEOUT', 60 * 15))
+
+# ModelBackend se conserva para las sesiones iniciadas antes del backend cacheado.
+# El principal cacheado solo se habilita con una caché compartida entre procesos
+AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+if not CACHES[PRINCIPAL_CACHE_ALIAS]['BACKEND'].endswith(('.LocMemCache', '.DummyCache')):
+    AUTHENTICATION_BACKENDS.insert(0, 'students.auth.CachedModelBackend')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -125,9 +226,73 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
-# Media files (User uploads)
-MEDIA_URL = '/media/'
+# Media files (User uploads). En producción MEDIA_URL apunta al servidor web o
+# la CDN; con MEDIA_STORAGE=s3 los archivos viven en el bucket (ver Sut/storage.py)
+MEDIA_URL = os.environ.get('MEDIA_URL', '/media/')
 MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_STORAGE = os.environ.get('MEDIA_STORAGE', 'local')
+MEDIA_S3_BUCKET = os.environ.get('MEDIA_S3_BUCKET', '')
+
+if MEDIA_STORAGE == 's3':
+    DEFAULT_STORAGE = {
+        'BACKEND': 'Sut.storage.S3MediaStorage',
+        'OPTIONS': {
+            'bucket': MEDIA_S3_BUCKET,
+            # p. ej. http://localhost:9000 para MinIO
+            'endpoint_url': os.environ.get('MEDIA_S3_ENDPOINT_URL') or None,
+            'region_name': os.environ.get('MEDIA_S3_REGION') or None,
+            'access_key': os.environ.get('MEDIA_S3_ACCESS_KEY') or None,
+            'secret_key': os.environ.get('MEDIA_S3_SECRET_KEY') or None,
+        },
+    }
+elif MEDIA_STORAGE == 'local':
+    DEFAULT_STORAGE = {'BACKEND': 'Sut.storage.LocalMediaStorage'}
+else:
+    raise ImproperlyConfigured(f'MEDIA_STORAGE desconocido: {MEDIA_STORAGE!r}')
+
+STORAGES = {
+    'default': DEFAULT_STORAGE,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Cargas directas y reanudables (ver Sut/uploads.py)
+UPLOAD_TEMP_DIR = BASE_DIR / 'var' / 'uploads'
+UPLOAD_TEMP_PREFIX = 'uploads/'
+UPLOAD_CHUNK_SIZE = int(os.environ.get('UPLOAD_CHUNK_SIZE', 1024 * 1024))
+UPLOAD_MAX_SIZE = int(os.environ.get('UPLOAD_MAX_SIZE', 10 * 1024 * 1024))
+UPLOAD_EXPIRE_HOURS = int(os.environ.get('UPLOAD_EXPIRE_HOURS', 24))
+
+# Canal de eventos SSE (ver Sut/events.py). Con varios procesos use
+# EVENTS_BROKER=Sut.events.RedisBroker y EVENTS_BROKER_URL
+EVENTS_BROKER = os.environ.get('EVENTS_BROKER', 'Sut.events.InMemoryBroker')
+EVENTS_BROKER_OPTIONS = {'url': os.environ['EVENTS_BROKER_URL']} if os.environ.get('EVENTS_BROKER_URL') else {}
+EVENTS_STREAM_MAX_SECONDS = int(os.environ.get('EVENTS_STREAM_MAX_SECONDS', 300))
+
+# Días que se conservan los tombstones de la sincronización incremental (ver Sut/sync.py)
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+# Índice de recomendaciones de empleos (ver jobs/recommendations.py); todos los
+# procesos deben ver el mismo directorio
+RECOMMENDATIONS_INDEX_DIR = os.environ.get('RECOMMENDATIONS_INDEX_DIR', BASE_DIR / 'var' / 'recommendations')
+
+# Puntajes de candidatos por versión del empleo (ver jobs/ranking.py)
+RANKING_CACHE_ALIAS = 'default'
+RANKING_CACHE_TIMEOUT = int(os.environ.get('RANKING_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Historial de estados de las aplicaciones, insertado por lotes (ver jobs/status_log.py)
+APPLICATION_EVENTS_BATCH_SIZE = int(os.environ.get('APPLICATION_EVENTS_BATCH_SIZE', 100))
+APPLICATION_EVENTS_FLUSH_SECONDS = float(os.environ.get('APPLICATION_EVENTS_FLUSH_SECONDS', 2))
+
+# Timeline materializado del feed (ver posts/timeline.py)
+TIMELINE_MAX_ENTRIES = int(os.environ.get('TIMELINE_MAX_ENTRIES', 800))
+TIMELINE_FANOUT_MAX_AUDIENCE = int(os.environ.get('TIMELINE_FANOUT_MAX_AUDIENCE', 10000))
+TIMELINE_TRIM_INTERVAL = int(os.environ.get('TIMELINE_TRIM_INTERVAL', 100))
+# Hilos que escriben los timelines fuera de la petición; 0 los escribe en la misma transacción
+TIMELINE_FANOUT_WORKERS = int(os.environ.get('TIMELINE_FANOUT_WORKERS', 1))
+
+# Derivados de imágenes (ver Sut/images.py)
+THUMBNAIL_FORMAT = os.environ.get('THUMBNAIL_FORMAT', 'WEBP')
+THUMBNAIL_WORKERS = int(os.environ.get('THUMBNAIL_WORKERS', 2))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -143,6 +308,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'Sut.pagination.KeysetPagination',
+    # orjson con respaldo a json de la biblioteca estándar (ver Sut/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': [
+        'Sut.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'Sut.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 CSRF_TRUSTED_ORIGINS = [
@@ -156,3 +332,6 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+
+# Sincronización incremental de los listados (ver Sut/sync.py)
+CORS_EXPOSE_HEADERS = ['ETag', 'Last-Modified', 'X-Synced-At']
@@ -0,0 +1,231 @@
+"""
+Backends de almacenamiento de medios con cargas directas.
+
+``STORAGES['default']`` elige el backend (ver settings.MEDIA_STORAGE):
+
+* ``LocalMediaStorage``: sistema de archivos en MEDIA_ROOT. Las cargas
+  directas llegan en fragmentos (``PUT`` con Content-Range) que se anexan a
+  un archivo temporal; cada fragmento es una petición corta, así que un
+  archivo grande no ocupa un worker durante toda la carga y se puede
+  reanudar desde el último byte recibido.
+* ``S3MediaStorage``: bucket S3 o compatible (MinIO, R2, etc. con
+  ``endpoint_url``). El cliente sube el archivo con un PUT prefirmado
+  directamente al bucket, sin pasar por los workers.
+
+Al completar una carga se verifica con Pillow que el archivo sea una imagen
+del tipo declarado y queda con un nombre derivado de su contenido
+(``<carpeta>/<hash>.<ext>``, con la extensión del tipo y nunca la del
+nombre que envió el cliente), así que nunca cambia y se puede
+servir con caché de larga duración desde el servidor web o la CDN::
+
+    location /media/ {
+        alias /srv/sut/media/;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+"""
+import hashlib
+import mimetypes
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, Storage
+from django.utils.deconstruct import deconstructible
+from PIL import Image
+
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+HASH_LENGTH = 32
+# Tipos de imagen aceptados: formato de Pillow y extensión con la que se guardan
+IMAGE_FORMATS = {
+    'image/jpeg': ('JPEG', '.jpg'),
+    'image/png': ('PNG', '.png'),
+    'image/webp': ('WEBP', '.webp'),
+    'image/gif': ('GIF', '.gif'),
+}
+
+
+class UploadError(ValueError):
+    pass
+
+
+class InvalidImageError(UploadError):
+    """El contenido no es una imagen del tipo declarado; la carga se descarta"""
+
+
+def content_hashed_name(directory, content_type, digest):
+    return f'{directory}{digest[:HASH_LENGTH]}{IMAGE_FORMATS[content_type][1]}'
+
+
+def verify_image(stream, content_type):
+    """Comprueba que ``stream`` sea una imagen válida en el formato de ``content_type``"""
+    if content_type not in IMAGE_FORMATS:
+        raise InvalidImageError(f'Tipo no permitido: {content_type}')
+    try:
+        with Image.open(stream) as image:
+            image_format = image.format
+            image.verify()
+    except Exception:
+        raise InvalidImageError('El archivo no es una imagen válida')
+    if image_format != IMAGE_FORMATS[content_type][0]:
+        raise InvalidImageError(f'El contenido no corresponde a {content_type}')
+
+
+def file_digest(chunks):
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class LocalMediaStorage(FileSystemStorage):
+    upload_mode = 'chunked'
+
+    def upload_path(self, upload):
+        return Path(settings.UPLOAD_TEMP_DIR) / f'{upload.pk}.part'
+
+    def upload_offset(self, upload):
+        try:
+            return self.upload_path(upload).stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def start_upload(self, upload):
+        return {'mode': self.upload_mode, 'chunk_size': settings.UPLOAD_CHUNK_SIZE}
+
+    def write_upload_chunk(self, upload, offset, data):
+        """Anexa un fragmento en ``offset``; devuelve el nuevo total recibido"""
+        path = self.upload_path(upload)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        received = self.upload_offset(upload)
+        if offset != received:
+            raise UploadError(f'Se esperaba el byte {received}')
+        if offset + len(data) > upload.size:
+            raise UploadError('El fragmento excede el tamaño declarado')
+        with open(path, 'ab') as stream:
+            stream.write(data)
+        return offset + len(data)
+
+    def finish_upload(self, upload, directory):
+        path = self.upload_path(upload)
+        if self.upload_offset(upload) != upload.size:
+            raise UploadError('La carga no está completa')
+        with open(path, 'rb') as stream:
+            verify_image(stream, upload.content_type)
+            stream.seek(0)
+            name = content_hashed_name(directory, upload.content_type, file_digest(iter(lambda: stream.read(1 << 20), b'')))
+            if not self.exists(name):
+                stream.seek(0)
+                name = self.save(name, File(stream))
+        path.unlink()
+        return name
+
+    def discard_upload(self, upload):
+        self.upload_path(upload).unlink(missing_ok=True)
+
+
+@deconstructible
+class S3MediaStorage(Storage):
+    """
+    Storage de Django sobre la API de S3. ``client`` permite inyectar un
+    cliente compatible con el de boto3; si no se indica se crea uno.
+    """
+    upload_mode = 'presigned'
+
+    def __init__(
+        self, bucket=None, endpoint_url=None, region_name=None, access_key=None, secret_key=None,
+        public_url=None, presign_expires=3600, client=None,
+    ):
+        self.bucket = bucket or settings.MEDIA_S3_BUCKET
+        self.public_url = (public_url or settings.MEDIA_URL).rstrip('/')
+        self.presign_expires = presign_expires
+        self._client = client
+        self._client_options = {
+            'endpoint_url': endpoint_url, 'region_name': region_name,
+            'aws_access_key_id': access_key, 'aws_secret_access_key': secret_key,
+        }
+
+    @property
+    def client(self):
+        if self._client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise ImproperlyConfigured('S3MediaStorage requiere el paquete boto3')
+            self._client = boto3.client('s3', **self._client_options)
+        return self._client
+
+    def _open(self, name, mode='rb'):
+        return ContentFile(self.client.get_object(Bucket=self.bucket, Key=name)['Body'].read(), name=name)
+
+    def _save(self, name, content):
+        content.seek(0)
+        self.client.put_object(
+            Bucket=self.bucket, Key=name, Body=content.read(), CacheControl=IMMUTABLE_CACHE_CONTROL,
+            ContentType=mimetypes.guess_type(name)[0] or 'application/octet-stream',
+        )
+        return name
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=name)
+
+    def head(self, name):
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=name)
+        except Exception as error:
+            if getattr(error, 'response', {}).get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def exists(self, name):
+        return self.head(name) is not None
+
+    def size(self, name):
+        return self.head(name)['ContentLength']
+
+    def url(self, name):
+        return f'{self.public_url}/{name}'
+
+    def upload_key(self, upload):
+        return f'{settings.UPLOAD_TEMP_PREFIX}{upload.pk}'
+
+    def upload_offset(self, upload):
+        head = self.head(self.upload_key(upload))
+        return head['ContentLength'] if head else 0
+
+    def start_upload(self, upload):
+        url = self.client.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': self.bucket, 'Key': self.upload_key(upload), 'ContentType': upload.content_type},
+            ExpiresIn=self.presign_expires,
+        )
+        return {'mode': self.upload_mode, 'url': url, 'method': 'PUT', 'headers': {'Content-Type': upload.content_type}}
+
+    def write_upload_chunk(self, upload, offset, data):
+        raise UploadError('Este almacenamiento recibe la carga directamente en la URL prefirmada')
+
+    def finish_upload(self, upload, directory):
+        """Copia el objeto subido a su nombre por contenido y borra el temporal"""
+        key = self.upload_key(upload)
+        head = self.head(key)
+        if head is None or head['ContentLength'] != upload.size:
+            raise UploadError('La carga no está completa')
+        # Las imágenes están acotadas por UPLOAD_MAX_SIZE: se verifican en memoria
+        body = self.client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+        verify_image(BytesIO(body), upload.content_type)
+        # El ETag de un PUT simple es el MD5 del contenido
+        name = content_hashed_name(directory, upload.content_type, head['ETag'].strip('"'))
+        if not self.exists(name):
+            self.client.copy_object(
+                Bucket=self.bucket, Key=name, CopySource={'Bucket': self.bucket, 'Key': key},
+                CacheControl=IMMUTABLE_CACHE_CONTROL, ContentType=upload.content_type, MetadataDirective='REPLACE',
+            )
+        self.delete(key)
+        return name
+
+    def discard_upload(self, upload):
+        self.delete(self.upload_key(upload))
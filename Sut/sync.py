@@ -0,0 +1,214 @@
+"""
+Sincronización incremental y respuestas condicionales de los listados.
+
+Con ``?updated_since=<ISO 8601>`` un listado devuelve solo lo modificado
+después de esa fecha junto con los ids eliminados (tombstones)::
+
+    {"results": [...], "deleted": [...], "synced_at": "...", "truncated": false}
+
+El cliente guarda ``synced_at`` para la siguiente llamada; si ``truncated``
+es verdadero debe volver a pedir el listado completo.
+
+Los tombstones se registran con su audiencia (``record_tombstone``) y cada
+usuario solo recibe los ids de objetos que pudo ver.
+
+Los listados también responden ETag y Last-Modified, y 304 a
+If-None-Match / If-Modified-Since. El validador se calcula después de leer
+la página pero sin serializarla, así su costo es el de la página y no el de
+la tabla: la versión de cada modelo que ``serializer_cache`` guarda en la
+base (cambia con cualquier invalidación, incluso de objetos anidados, en
+cualquier proceso) más (pk, updated_at)
+de las filas de la respuesta, que cubren las escrituras masivas que no
+emiten señales sobre esas filas.
+"""
+import hashlib
+from collections import namedtuple
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import Tombstone
+from .serializer_cache import model_versions
+
+
+UPDATED_SINCE_PARAM = 'updated_since'
+SYNCED_AT_HEADER = 'X-Synced-At'
+SYNC_MAX_ITEMS = 500
+# Margen para no perder escrituras cuya transacción confirmó después de leer
+SYNC_CLOCK_SKEW = timedelta(seconds=2)
+
+
+def parse_updated_since(request):
+    value = request.query_params.get(UPDATED_SINCE_PARAM)
+    if not value:
+        return None
+    # Un '+' sin codificar en la query string llega como espacio
+    since = parse_datetime(value.strip().replace(' ', '+'))
+    if since is None:
+        raise ValidationError({UPDATED_SINCE_PARAM: 'Fecha inválida, use el formato ISO 8601'})
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, dt_timezone.utc)
+    return since
+
+
+def record_tombstone(instance, user_ids=None, user_types=()):
+    """
+    Registra la eliminación para los usuarios ``user_ids`` y los de tipo
+    ``user_types``, los únicos que podían ver el objeto. Sin audiencia
+    (``user_ids=None`` y sin tipos) la reciben todos.
+    """
+    collection, object_id = instance._meta.label_lower, instance.pk
+    if user_ids is None and not user_types:
+        Tombstone.objects.create(collection=collection, object_id=object_id)
+        return
+    tombstones = [Tombstone(collection=collection, object_id=object_id, user_id=pk) for pk in user_ids or () if pk]
+    tombstones.extend(Tombstone(collection=collection, object_id=object_id, user_type=kind) for kind in user_types)
+    Tombstone.objects.bulk_create(tombstones)
+
+
+def tombstones_since(model, since, user=None):
+    """Ids eliminados después de ``since``; con ``user``, solo los que ese usuario podía ver"""
+    tombstones = Tombstone.objects.filter(collection=model._meta.label_lower, deleted_at__gt=since)
+    if user is not None and getattr(user, 'user_type', None) != 'admin':
+        visible = Q(user_id__isnull=True, user_type='')
+        if user.is_authenticated:
+            visible |= Q(user_id=user.pk) | Q(user_type=user.user_type)
+        tombstones = tombstones.filter(visible)
+    return list(tombstones.order_by().values_list('object_id', flat=True).distinct())
+
+
+def tombstones_expired(since):
+    """Los tombstones anteriores a la retención ya se purgaron: el delta no sería completo"""
+    return since < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+
+def sync_started_at():
+    return timezone.now() - SYNC_CLOCK_SKEW
+
+
+def changed_since(queryset, since, limit=SYNC_MAX_ITEMS):
+    """Objetos modificados después de ``since`` en orden de updated_at y si se truncó la lista"""
+    rows = list(queryset.filter(updated_at__gt=since).order_by('updated_at', 'pk')[:limit + 1])
+    return rows[:limit], len(rows) > limit
+
+
+class Delta(namedtuple('Delta', ['changed', 'deleted', 'synced_at', 'truncated'])):
+    """Objetos modificados, ids eliminados, hora de sincronización y si el delta está incompleto"""
+
+
+def changes_since(queryset, since, user=None, removed=()):
+    synced_at = sync_started_at()
+    changed, truncated = changed_since(queryset, since)
+    deleted = sorted(set(tombstones_since(queryset.model, since, user)) | set(removed))
+    return Delta(changed, deleted, synced_at, truncated or tombstones_expired(since))
+
+
+def delta_payload(delta, serialize):
+    return {
+        'results': serialize(delta.changed),
+        'deleted': delta.deleted,
+        'synced_at': delta.synced_at.isoformat(),
+        'truncated': delta.truncated,
+    }
+
+
+def rows_state(objs, *prefix):
+    """(*prefix, pk, updated_at) de cada objeto de la respuesta, para sus validadores"""
+    return [(*prefix, obj.pk, obj.updated_at) for obj in objs]
+
+
+class Validators(namedtuple('Validators', ['etag', 'last_modified', 'synced_at'])):
+    """ETag débil, Last-Modified (timestamp) y hora de sincronización de un listado"""
+
+
+def collection_validators(request, models, rows, *extra):
+    """
+    Validadores de una respuesta a partir de sus filas (``rows_state``) y de
+    ``extra`` (p. ej. el total o los ids eliminados); se calculan antes de serializar.
+    """
+    synced_at = sync_started_at()
+    versions = model_versions(models)
+    last_modified = max(versions + [row[-1].timestamp() for row in rows if row[-1]])
+    user = request.user
+    fingerprint = repr((
+        request.get_full_path(),
+        user.pk if user.is_authenticated else None,
+        versions,
+        rows,
+        extra,
+    ))
+    etag = f'W/"{hashlib.md5(fingerprint.encode()).hexdigest()}"'
+    return Validators(etag, int(last_modified), synced_at)
+
+
+def delta_validators(request, models, delta):
+    return collection_validators(request, models, rows_state(delta.changed), delta.deleted, delta.truncated)
+
+
+def not_modified(request, validators):
+    """Respuesta 304 si el cliente ya tiene esta versión del listado, si no None"""
+    return get_conditional_response(request, etag=validators.etag, last_modified=validators.last_modified)
+
+
+def set_validators(response, validators):
+    response.headers['ETag'] = validators.etag
+    response.headers['Last-Modified'] = http_date(validators.last_modified)
+    # Punto de partida de ?updated_since= para quien recibió el listado completo
+    response.headers[SYNCED_AT_HEADER] = validators.synced_at.isoformat()
+    # El navegador guarda la respuesta pero siempre la revalida
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class SyncListMixin:
+    """
+    ``list`` con ?updated_since= y respuestas condicionales.
+
+    ``sync_models`` son los modelos cuya representación aparece en el
+    listado (el del queryset y los que anida).
+    """
+    sync_models = ()
+
+    def get_sync_removed(self, since):
+        """Ids que siguen existiendo pero dejaron de ser visibles después de ``since``"""
+        return []
+
+    def sync_changes(self, queryset, since):
+        return changes_since(queryset, since, self.request.user, self.get_sync_removed(since))
+
+    def sync_delta(self, delta):
+        return Response(delta_payload(delta, lambda objs: self.get_serializer(objs, many=True).data))
+
+    def page_validators(self, page):
+        """Validadores de la página ya leída; con paginación por número incluyen el total"""
+        django_paginator = getattr(getattr(self.paginator, 'page', None), 'paginator', None)
+        extra = (django_paginator.count,) if django_paginator is not None else ()
+        return collection_validators(self.request, self.sync_models, rows_state(page), *extra)
+
+    def list(self, request, *args, **kwargs):
+        since = parse_updated_since(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        if since is None:
+            page = self.paginate_queryset(queryset)
+            objs = list(queryset) if page is None else page
+            validators = self.page_validators(objs)
+        else:
+            delta = self.sync_changes(queryset, since)
+            validators = delta_validators(request, self.sync_models, delta)
+
+        response = not_modified(request, validators)
+        if response is None:
+            if since is not None:
+                response = self.sync_delta(delta)
+            elif page is not None:
+                response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+            else:
+                response = Response(self.get_serializer(objs, many=True).data)
+        return set_validators(response, validators)
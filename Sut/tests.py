@@ -0,0 +1,350 @@
+import hashlib
+import json
+import tempfile
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from PIL import Image
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from companies.models import CompanyProfile
+from jobs.models import JobPosting, JobApplication
+from jobs.tests import create_job
+from students.models import StudentProfile, User
+
+from .db_routers import ReplicaRouter, replica_reads
+from .events import InMemoryBroker, event_stream
+from .metrics import registry
+from .models import Upload
+from .renderers import FastJSONParser, FastJSONRenderer
+from .storage import IMMUTABLE_CACHE_CONTROL, InvalidImageError, S3MediaStorage
+from .uploads import complete_upload
+
+
+class SeedAndBenchmarkTests(TestCase):
+    def test_seed_then_benchmark(self):
+        call_command(
+            'seed', students=5, companies=2, jobs=4, posts=6, applications=8, seed=1, stdout=StringIO(),
+        )
+        self.assertEqual(StudentProfile.objects.count(), 5)
+        self.assertEqual(JobApplication.objects.count(), 8)
+        self.assertEqual(sum(JobPosting.objects.values_list('applications_count', flat=True)), 8)
+
+        output = StringIO()
+        call_command('benchmark', iterations=2, warmup=0, renderers=True, stdout=output, stderr=StringIO())
+        report = json.loads(output.getvalue())
+        for scenario in report['scenarios']:
+            self.assertEqual(scenario['status_codes'], [200], scenario['name'])
+            self.assertIn('p99', scenario['latency_ms'])
+        for result in report['renderers']:
+            self.assertTrue(result['identical_output'], result['name'])
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+
+    def test_server_timing_and_staff_only_metrics(self):
+        response = self.client.get('/api/jobs/postings/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        with override_settings(DEBUG=True):
+            self.assertIn('total;dur=', self.client.get('/api/jobs/postings/')['Server-Timing'])
+
+        user = User.objects.create_user(email='staff@example.com', password='x', user_type='student')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get('/api/_metrics/').status_code, 403)
+        self.assertNotIn('Server-Timing', self.client.get('/api/students/profiles/'))
+
+        user.is_staff = True
+        user.save()
+        response = self.client.get('/api/jobs/postings/')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        # Se mide la serialización de toda respuesta JSON, no solo la de los serializadores con caché
+        self.assertIn('serialize;dur=', self.client.get('/api/jobs/applications/')['Server-Timing'])
+        response = self.client.get('/api/_metrics/')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('sut_request_duration_seconds_count{view="job-posting-list",method="GET"} 3', body)
+        self.assertIn('sut_db_queries_total{view="job-posting-list",method="GET"}', body)
+
+
+@override_settings(TIMELINE_FANOUT_WORKERS=0)
+class AsyncReadEndpointTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('student@example.com', 'password123', user_type='student')
+        StudentProfile.objects.create(
+            user=self.user, university='UNAM', career='Sistemas', semester=5, graduation_year=2026,
+        )
+        company_user = User.objects.create_user('company@example.com', 'password123', user_type='company')
+        company = CompanyProfile.objects.create(
+            user=company_user, company_name='Acme', industry='tech', description='Acme Corp', address='Calle 1',
+        )
+        self.job = create_job(company)
+        create_job(company, title='Draft', status='draft')
+
+    async def test_read_endpoints_under_asgi(self):
+        response = await self.async_client.get('/api/posts/')
+        self.assertEqual(response.status_code, 403)
+
+        response = await self.async_client.get('/api/jobs/postings/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+
+        response = await self.async_client.get(f'/api/jobs/postings/{self.job.id}/')
+        self.assertEqual(response.json()['title'], 'Backend Developer')
+        response = await self.async_client.get('/api/jobs/postings/999999/')
+        self.assertEqual(response.status_code, 404)
+
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get('/api/posts/')
+        self.assertEqual([item['item_type'] for item in response.json()['results']], ['job'])
+
+        response = await self.async_client.get('/api/students/auth/me/')
+        self.assertEqual(response.json()['email'], 'student@example.com')
+        response = await self.async_client.get('/api/students/profiles/my_profile/')
+        self.assertEqual(response.json()['university'], 'UNAM')
+
+    def test_other_methods_use_sync_views(self):
+        self.client.force_login(self.user)
+        response = self.client.post('/api/posts/', {'content': 'hola'}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.put('/api/students/profiles/my_profile/', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 405)
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def test_only_reads_inside_block_use_replica(self):
+        router = ReplicaRouter()
+        with replica_reads():
+            self.assertIsNone(router.db_for_read(JobPosting))
+
+        replica = dict(settings.DATABASES['default'])
+        with mock.patch.dict(settings.DATABASES, {'replica': replica}):
+            self.assertIsNone(router.db_for_read(JobPosting))
+            with replica_reads():
+                self.assertEqual(router.db_for_read(JobPosting), 'replica')
+                self.assertEqual(router.db_for_write(JobPosting), 'default')
+            self.assertFalse(router.allow_migrate('replica', 'jobs'))
+
+
+class EventStreamTests(TestCase):
+    async def test_stream_delivers_events_published_from_other_threads(self):
+        broker = InMemoryBroker()
+        stream = event_stream(broker, ['user:1'], heartbeat=0.05, max_duration=5)
+        self.assertTrue((await anext(stream)).startswith('retry:'))
+
+        await sync_to_async(broker.publish)('user:2', {'type': 'application.updated', 'status': 'rejected'})
+        await sync_to_async(broker.publish)('user:1', {'type': 'application.updated', 'status': 'interview'})
+        chunk = await anext(stream)
+        self.assertTrue(chunk.startswith('event: application.updated\n'))
+        self.assertIn('"interview"', chunk)
+        self.assertEqual(await anext(stream), ': keep-alive\n\n')
+
+        await stream.aclose()
+        self.assertEqual(broker.subscriber_count(), 0)
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response.status_code, 403)
+
+
+class FastJSONTests(SimpleTestCase):
+    def test_same_output_as_drf_renderer(self):
+        data = {
+            'id': 1, 'salary': Decimal('1500.50'), 'ratio': 0.1, 'ok': True, 'none': None,
+            'created_at': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'deadline': date(2024, 6, 1), 'uuid': uuid.UUID(int=7), 'tags': ('a', 'b'),
+            'text': 'Programación\u2028línea', 'srcset': {48: 'a.webp'}, 'nested': [{'x': [1, 2]}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_floats(self):
+        data = {'values': [0.1, 1.5, 1e16, 1e-05, -2.5e300, None]}
+        rendered = FastJSONRenderer().render(data)
+        # Solo cambia la forma del exponente (1e16 frente a 1e+16)
+        self.assertEqual(rendered, b'{"values":[0.1,1.5,1e16,0.00001,-2.5e300,null]}')
+        self.assertEqual(json.loads(rendered), json.loads(JSONRenderer().render(data)))
+
+        for value in (float('nan'), float('inf'), -float('inf')):
+            with self.assertRaises(ValueError):
+                JSONRenderer().render({'nested': [{'value': value}]})
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render({'nested': [{'value': value}]})
+
+        with mock.patch.object(FastJSONRenderer, 'strict', False):
+            self.assertEqual(FastJSONRenderer().render([float('nan')]), b'[NaN]')
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"a": [1, "ñ"]}'.encode())), {'a': [1, 'ñ']})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"a": NaN}'))
+
+
+def image_bytes(image_format):
+    buffer = BytesIO()
+    Image.new('RGB', (2, 2), 'red').save(buffer, image_format)
+    return buffer.getvalue()
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(
+            MEDIA_ROOT=media_root.name, UPLOAD_TEMP_DIR=f'{media_root.name}/tmp', UPLOAD_CHUNK_SIZE=10,
+        ))
+        self.user = User.objects.create_user('student@example.com', 'password123', user_type='student')
+        self.profile = StudentProfile.objects.create(
+            user=self.user, university='UNAM', career='Sistemas', semester=5, graduation_year=2026,
+        )
+        self.client.force_login(self.user)
+        self.content = image_bytes('PNG')
+
+    def put_chunk(self, url, start, end):
+        return self.client.put(
+            url, self.content[start:end + 1], content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{end}/{len(self.content)}',
+        )
+
+    def start_upload(self, filename='Foto.PNG'):
+        response = self.client.post('/api/uploads/', {
+            'filename': filename, 'content_type': 'image/png', 'size': len(self.content), 'purpose': 'student_profile',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def put_rest(self, url, start):
+        while start < len(self.content):
+            start = self.put_chunk(url, start, min(start + 10, len(self.content)) - 1).json()['offset']
+
+    def test_resumable_upload_attached_to_profile(self):
+        data = self.start_upload()
+        self.assertEqual(data['mode'], 'chunked')
+        url = data['url']
+
+        self.assertEqual(self.put_chunk(url, 0, 9).json()['offset'], 10)
+        # Un fragmento repetido o fuera de orden indica desde dónde reanudar
+        response = self.put_chunk(url, 0, 9)
+        self.assertEqual((response.status_code, response.json()['offset']), (409, 10))
+        self.assertEqual(self.client.post(f'{url}complete/').status_code, 409)
+        self.assertEqual(self.client.get(url).json()['offset'], 10)
+        self.put_rest(url, 10)
+
+        response = self.client.post(f'{url}complete/')
+        name = response.json()['name']
+        self.assertEqual(name, f'student_profiles/{hashlib.sha256(self.content).hexdigest()[:32]}.png')
+
+        upload_id = response.json()['id']
+        response = self.client.patch(
+            '/api/students/profiles/update_my_profile/', {'profile_picture_upload': upload_id},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.profile_picture.name, name)
+
+        other = User.objects.create_user('other@example.com', 'password123', user_type='student')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_content_that_is_not_the_declared_image_is_discarded(self):
+        # La extensión sale del tipo verificado, nunca del nombre del cliente
+        self.content = b'<script>alert(1)</script>'
+        url = self.start_upload('x.html')['url']
+        self.put_rest(url, 0)
+        response = self.client.post(f'{url}complete/')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Upload.objects.exists())
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        self.content = image_bytes('GIF')
+        url = self.start_upload()['url']
+        self.put_rest(url, 0)
+        self.assertEqual(self.client.post(f'{url}complete/').status_code, 400)
+
+
+class FakeS3Error(Exception):
+    def __init__(self, code):
+        self.response = {'Error': {'Code': code}}
+
+
+class FakeS3Client:
+    """Sustituto en memoria de las llamadas de boto3 que usa S3MediaStorage"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **metadata):
+        self.objects[Key] = (Body, metadata)
+
+    def get_object(self, Bucket, Key):
+        return {'Body': BytesIO(self.objects[Key][0])}
+
+    def head_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise FakeS3Error('404')
+        body = self.objects[Key][0]
+        return {'ContentLength': len(body), 'ETag': f'"{hashlib.md5(body).hexdigest()}"'}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def copy_object(self, Bucket, Key, CopySource, MetadataDirective, **metadata):
+        self.objects[Key] = (self.objects[CopySource['Key']][0], metadata)
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        return f"https://{Params['Bucket']}.s3.test/{Params['Key']}?signature=x"
+
+
+class S3MediaStorageTests(TestCase):
+    def test_presigned_upload_is_renamed_by_content(self):
+        client = FakeS3Client()
+        logo = image_bytes('JPEG')
+        storage = S3MediaStorage(bucket='media', public_url='https://cdn.test/media/', client=client)
+        user = User.objects.create_user('company@example.com', 'password123', user_type='company')
+        upload = Upload.objects.create(
+            user=user, purpose='company_profile', filename='logo.JPEG', content_type='image/jpeg', size=len(logo),
+        )
+
+        instructions = storage.start_upload(upload)
+        self.assertEqual(instructions['mode'], 'presigned')
+        self.assertIn(str(upload.pk), instructions['url'])
+        # El navegador sube el archivo directamente al bucket
+        client.put_object(Bucket='media', Key=storage.upload_key(upload), Body=logo)
+
+        name = storage.finish_upload(upload, 'company_profiles/')
+        self.assertEqual(name, f"company_profiles/{hashlib.md5(logo).hexdigest()}.jpg")
+        self.assertEqual(client.objects[name][1]['CacheControl'], IMMUTABLE_CACHE_CONTROL)
+        self.assertFalse(storage.exists(storage.upload_key(upload)))
+        self.assertEqual(storage.url(name), f'https://cdn.test/media/{name}')
+        self.assertEqual(storage.open(name).read(), logo)
+
+    def test_presigned_upload_that_is_not_an_image_is_discarded(self):
+        client = FakeS3Client()
+        storage = S3MediaStorage(bucket='media', public_url='https://cdn.test/media/', client=client)
+        user = User.objects.create_user('company@example.com', 'password123', user_type='company')
+        body = b'<html><script>alert(1)</script></html>'
+        upload = Upload.objects.create(
+            user=user, purpose='company_profile', filename='logo.html', content_type='image/png', size=len(body),
+        )
+        client.put_object(Bucket='media', Key=storage.upload_key(upload), Body=body)
+
+        with self.assertRaises(InvalidImageError):
+            complete_upload(upload, storage)
+        self.assertEqual(client.objects, {})
+        self.assertFalse(Upload.objects.exists())
@@ -0,0 +1,146 @@
+"""
+Cargas directas y reanudables de imágenes.
+
+1. ``POST /api/uploads/`` con ``{filename, content_type, size, purpose}``
+   crea la carga y devuelve cómo subir el archivo según el almacenamiento
+   (ver Sut/storage.py):
+
+   * ``chunked``: ``PUT <url>`` con fragmentos de hasta ``chunk_size`` bytes
+     y ``Content-Range: bytes <inicio>-<fin>/<total>``. ``GET <url>``
+     devuelve el ``offset`` recibido para reanudar tras un corte.
+   * ``presigned``: un ``PUT`` del archivo completo a ``url`` con ``headers``.
+
+2. ``POST /api/uploads/<id>/complete/`` guarda el archivo con su nombre por
+   contenido.
+3. El id de la carga se envía en lugar del archivo: ``profile_picture_upload``
+   en update_my_profile o ``image_upload`` al crear una publicación.
+
+Las subidas multipart de siempre siguen funcionando y también reciben un
+nombre por contenido (``ContentHashedImageField``).
+"""
+import re
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Upload
+from .storage import IMAGE_FORMATS, InvalidImageError, UploadError, content_hashed_name, file_digest
+
+
+PURPOSE_DIRECTORIES = {
+    'student_profile': 'student_profiles/',
+    'company_profile': 'company_profiles/',
+    'post': 'posts/',
+}
+ALLOWED_CONTENT_TYPES = tuple(IMAGE_FORMATS)
+CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class UploadCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Upload
+        fields = ['filename', 'content_type', 'size', 'purpose']
+
+    def validate_content_type(self, value):
+        if value not in ALLOWED_CONTENT_TYPES:
+            raise serializers.ValidationError(f"Tipo no permitido, use {', '.join(ALLOWED_CONTENT_TYPES)}")
+        return value
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f'El tamaño debe estar entre 1 y {settings.UPLOAD_MAX_SIZE} bytes')
+        return value
+
+
+def upload_state(upload, storage=default_storage):
+    return {
+        'id': str(upload.pk),
+        'purpose': upload.purpose,
+        'size': upload.size,
+        'offset': upload.size if upload.completed_at else storage.upload_offset(upload),
+        'completed': upload.completed_at is not None,
+        'name': upload.name or None,
+    }
+
+
+def parse_content_range(value, upload):
+    """(inicio, fin) de un encabezado Content-Range para esta carga"""
+    match = CONTENT_RANGE_RE.match(value or '')
+    if not match:
+        raise UploadError('Se requiere Content-Range: bytes <inicio>-<fin>/<total>')
+    start, end, total = map(int, match.groups())
+    if total != upload.size or end < start or end - start + 1 > settings.UPLOAD_CHUNK_SIZE:
+        raise UploadError(f'Rango inválido; los fragmentos son de hasta {settings.UPLOAD_CHUNK_SIZE} bytes')
+    return start, end
+
+
+def write_chunk(upload, content_range, data, storage=default_storage):
+    start, end = parse_content_range(content_range, upload)
+    if len(data) != end - start + 1:
+        raise UploadError('El cuerpo no coincide con Content-Range')
+    return storage.write_upload_chunk(upload, start, data)
+
+
+def complete_upload(upload, storage=default_storage):
+    """Guarda el archivo; si no es una imagen del tipo declarado descarta la carga y propaga el error"""
+    if upload.completed_at is None:
+        try:
+            upload.name = storage.finish_upload(upload, PURPOSE_DIRECTORIES[upload.purpose])
+        except InvalidImageError:
+            discard_upload(upload, storage)
+            raise
+        upload.completed_at = timezone.now()
+        upload.save(update_fields=['name', 'completed_at'])
+    return upload
+
+
+def discard_upload(upload, storage=default_storage):
+    if upload.completed_at is None:
+        storage.discard_upload(upload)
+    upload.delete()
+
+
+def resolve_upload(user, upload_id, purpose):
+    """Nombre del archivo de una carga completada del usuario"""
+    upload = Upload.objects.filter(
+        pk=upload_id, user=user, purpose=purpose, completed_at__isnull=False,
+    ).only('name').first()
+    if upload is None:
+        raise serializers.ValidationError({'upload': 'Carga no encontrada o incompleta'})
+    return upload.name
+
+
+class ContentHashedImageField(serializers.ImageField):
+    """ImageField que renombra el archivo recibido con el hash de su contenido"""
+
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        # ImageField ya lo abrió con Pillow: content_type es el del formato detectado
+        if file.content_type not in IMAGE_FORMATS:
+            raise serializers.ValidationError(f"Tipo no permitido, use {', '.join(ALLOWED_CONTENT_TYPES)}")
+        file.name = content_hashed_name('', file.content_type, file_digest(file.chunks()))
+        return file
+
+
+class MediaUploadMixin:
+    """
+    Mixin para ModelSerializer: las imágenes reciben nombres por contenido y
+    ``upload_fields`` ({campo: (campo de imagen, purpose)}) aceptan el id de
+    una carga directa completada en lugar del archivo.
+    """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: ContentHashedImageField,
+    }
+    upload_fields = {}
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        for field_name, (target, purpose) in self.upload_fields.items():
+            upload_id = attrs.pop(field_name, None)
+            if upload_id is not None:
+                attrs[target] = resolve_upload(self.context['request'].user, upload_id, purpose)
+        return attrs
@@ -15,18 +15,25 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+from .views import events, media, metrics, metrics_profiles, thumbnail, upload_complete, upload_detail, uploads
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/media/thumbnail/', thumbnail, name='thumbnail'),
+    path('api/_metrics/', metrics, name='metrics'),
+    path('api/_metrics/profiles/', metrics_profiles, name='metrics-profiles'),
+    path('api/events/', events, name='events'),
+    path('api/uploads/', uploads, name='uploads'),
+    path('api/uploads/<uuid:pk>/', upload_detail, name='upload-detail'),
+    path('api/uploads/<uuid:pk>/complete/', upload_complete, name='upload-complete'),
     path('api/students/', include('students.urls')),
     path('api/companies/', include('companies.urls')),
     path('api/jobs/', include('jobs.urls')),
     path('api/posts/', include('posts.urls')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.DEBUG and settings.MEDIA_URL.startswith('/'):
+    urlpatterns += [re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$', media)]
 
@@ -0,0 +1,148 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import (
+    Http404, HttpResponse, HttpResponseForbidden, HttpResponseNotAllowed, HttpResponseRedirect, JsonResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+from django.views.static import serve
+from rest_framework import status
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from .events import event_stream, get_broker, user_channel
+from .images import ALLOWED_PREFIXES, ALLOWED_SIZES, derivative_name, generate_derivatives
+from .metrics import registry
+from .models import Upload
+from .storage import IMMUTABLE_CACHE_CONTROL, InvalidImageError, UploadError
+from .uploads import UploadCreateSerializer, complete_upload, discard_upload, upload_state, write_chunk
+
+
+@require_GET
+def thumbnail(request):
+    """Genera bajo demanda un tamaño de imagen que aún no existe y redirige a él"""
+    path = request.GET.get('path', '')
+    try:
+        width = int(request.GET.get('w', ''))
+    except ValueError:
+        raise Http404
+    if (
+        width not in ALLOWED_SIZES
+        or not path.startswith(ALLOWED_PREFIXES)
+        or '..' in path.split('/')
+        or not default_storage.exists(path)
+    ):
+        raise Http404
+
+    generate_derivatives(path, [width])
+    return HttpResponseRedirect(default_storage.url(derivative_name(path, width)))
+
+
+@require_GET
+def metrics(request):
+    """Métricas por endpoint de este proceso en formato Prometheus (solo staff)"""
+    if not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@require_GET
+def metrics_profiles(request):
+    """Perfiles cProfile recientes de peticiones lentas muestreadas (solo staff)"""
+    if not request.user.is_staff:
+        return HttpResponseForbidden()
+    return JsonResponse({'profiles': list(registry.profiles)})
+
+
+async def events(request):
+    """
+    Server-Sent Events del usuario autenticado: cambios de estado y nuevas
+    aplicaciones. Solo disponible bajo ASGI.
+    """
+    # require_GET no soporta vistas async en Django 4.2
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not await sync_to_async(lambda: request.user.is_authenticated)():
+        return HttpResponseForbidden()
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse('El canal de eventos requiere un servidor ASGI', status=501)
+
+    response = StreamingHttpResponse(
+        event_stream(get_broker(), [user_channel(request.user.pk)]), content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Evita que nginx acumule el stream en su buffer
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def media(request, path):
+    """Sirve MEDIA_ROOT en desarrollo; en producción lo hace el servidor web o la CDN"""
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    # Los nombres por contenido nunca cambian de contenido
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
+
+
+def upload_error(upload, error):
+    return Response(
+        {'error': str(error), 'offset': upload_state(upload)['offset']}, status=status.HTTP_409_CONFLICT,
+    )
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def uploads(request):
+    """Crea una carga directa y devuelve cómo subir el archivo (ver Sut/uploads.py)"""
+    serializer = UploadCreateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    upload = serializer.save(user=request.user)
+
+    instructions = default_storage.start_upload(upload)
+    instructions.setdefault('url', request.build_absolute_uri(reverse('upload-detail', args=[upload.pk])))
+    return Response({**upload_state(upload), **instructions}, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+@parser_classes([])
+def upload_detail(request, pk):
+    """Estado de la carga (GET), un fragmento con Content-Range (PUT) o cancelarla (DELETE)"""
+    upload = get_object_or_404(Upload, pk=pk, user=request.user)
+    if request.method == 'GET':
+        return Response(upload_state(upload))
+    if request.method == 'DELETE':
+        discard_upload(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    if upload.completed_at is not None:
+        return upload_error(upload, 'La carga ya se completó')
+    try:
+        with transaction.atomic():
+            # Serializa los fragmentos concurrentes de la misma carga
+            Upload.objects.select_for_update().get(pk=upload.pk)
+            write_chunk(upload, request.headers.get('Content-Range'), request.body)
+    except UploadError as error:
+        return upload_error(upload, error)
+    return Response(upload_state(upload))
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def upload_complete(request, pk):
+    """Guarda el archivo recibido con su nombre por contenido"""
+    upload = get_object_or_404(Upload, pk=pk, user=request.user)
+    try:
+        complete_upload(upload)
+    except InvalidImageError as error:
+        # La carga ya se descartó
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+    except UploadError as error:
+        return upload_error(upload, error)
+    return Response(upload_state(upload))
@@ -1,6 +1,7 @@
 import { useState, useRef, useEffect } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { students, companies } from '../services/api';
+import { uploadFile } from '../services/uploads';
 import axios from 'axios';
 import '../styles/CreatePost.css';
 
@@ -85,7 +86,7 @@ const CreatePost = ({ onPostCreated }) => {
       const formData = new FormData();
       formData.append('content', content.trim());
       if (imageFile) {
-        formData.append('image', imageFile);
+        formData.append('image_upload', await uploadFile(imageFile, 'post'));
       }
 
       const csrfToken = getCsrfToken();
@@ -2,6 +2,7 @@ import { useState, useEffect, useRef } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import { students, companies } from '../services/api';
+import { toSrcSet } from '../services/images';
 import ConfirmModal from './ConfirmModal';
 
 const Navbar = () => {
@@ -10,6 +11,7 @@ const Navbar = () => {
   const [showLogoutConfirm, setShowLogoutConfirm] = useState(false);
   const [showDropdown, setShowDropdown] = useState(false);
   const [profilePictureUrl, setProfilePictureUrl] = useState(null);
+  const [profilePictureSrcSet, setProfilePictureSrcSet] = useState(null);
   const [searchTerm, setSearchTerm] = useState('');
   const dropdownRef = useRef(null);
 
@@ -40,9 +42,11 @@ const Navbar = () => {
       if (user.user_type === 'student') {
         const response = await students.getMyProfile();
         setProfilePictureUrl(response.data.profile_picture_url);
+        setProfilePictureSrcSet(response.data.profile_picture_srcset);
       } else if (user.user_type === 'company') {
         const response = await companies.getMyProfile();
         setProfilePictureUrl(response.data.profile_picture_url);
+        setProfilePictureSrcSet(response.data.profile_picture_srcset);
       }
     } catch (err) {
       console.error('Error fetching profile picture:', err);
@@ -129,7 +133,13 @@ const Navbar = () => {
               <div className="profile-dropdown" ref={dropdownRef}>
                 <button onClick={toggleDropdown} className="profile-button">
                   {profilePictureUrl ? (
-                    <img src={profilePictureUrl} alt="Perfil" className="profile-avatar" />
+                    <img
+                      src={profilePictureUrl}
+                      srcSet={toSrcSet(profilePictureSrcSet)}
+                      sizes="40px"
+                      alt="Perfil"
+                      className="profile-avatar"
+                    />
                   ) : (
                     <div className="profile-avatar-placeholder">
                       {getUserInitials()}
@@ -2,13 +2,16 @@ import { useState, useEffect } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { useNavigate } from 'react-router-dom';
 import { api } from '../services/api';
+import { toSrcSet } from '../services/images';
 import '../styles/PostsFeed.css';
 
 const PostsFeed = ({ refreshTrigger }) => {
   const { user } = useAuth();
   const navigate = useNavigate();
   const [posts, setPosts] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
   useEffect(() => {
@@ -19,7 +22,8 @@ const PostsFeed = ({ refreshTrigger }) => {
     try {
       setLoading(true);
       const response = await api.get('/posts/');
-      setPosts(response.data);
+      setPosts(response.data.results);
+      setNextPage(response.data.next);
       setError('');
     } catch (err) {
       setError('Error al cargar las publicaciones');
@@ -29,6 +33,24 @@ const PostsFeed = ({ refreshTrigger }) => {
     }
   };
 
+  const fetchMorePosts = async () => {
+    if (!nextPage || loadingMore) {
+      return;
+    }
+
+    try {
+      setLoadingMore(true);
+      const response = await api.get(nextPage);
+      setPosts((prev) => [...prev, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (err) {
+      setError('Error al cargar más publicaciones');
+      console.error('Error fetching more posts:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDeletePost = async (postId) => {
     if (!window.confirm('¿Estás seguro de que deseas eliminar esta publicación?')) {
       return;
@@ -36,7 +58,7 @@ const PostsFeed = ({ refreshTrigger }) => {
 
     try {
       await api.delete(`/posts/${postId}/`);
-      setPosts(posts.filter(post => post.id !== postId));
+      setPosts(posts.filter(post => post.item_type !== 'post' || post.id !== postId));
     } catch (err) {
       setError('Error al eliminar la publicación');
       console.error('Error deleting post:', err);
@@ -82,6 +104,8 @@ const PostsFeed = ({ refreshTrigger }) => {
           {job.user_profile_picture_url ? (
             <img
               src={job.user_profile_picture_url}
+              srcSet={toSrcSet(job.user_profile_picture_srcset)}
+              sizes="44px"
               alt={job.company.company_name}
               className="author-avatar author-avatar-img"
             />
@@ -139,6 +163,8 @@ const PostsFeed = ({ refreshTrigger }) => {
           {post.user_profile_picture_url ? (
             <img
               src={post.user_profile_picture_url}
+              srcSet={toSrcSet(post.user_profile_picture_srcset)}
+              sizes="44px"
               alt={post.user_name}
               className="author-avatar author-avatar-img"
             />
@@ -173,7 +199,13 @@ const PostsFeed = ({ refreshTrigger }) => {
         <p>{post.content}</p>
         {post.image_url && (
           <div className="post-image">
-            <img src={post.image_url} alt="Post" />
+            <img
+              src={post.image_url}
+              srcSet={toSrcSet(post.image_srcset)}
+              sizes="(max-width: 700px) 100vw, 640px"
+              loading="lazy"
+              alt="Post"
+            />
           </div>
         )}
       </div>
@@ -205,6 +237,15 @@ const PostsFeed = ({ refreshTrigger }) => {
           return renderRegularPost(item);
         }
       })}
+      {nextPage && (
+        <button
+          onClick={fetchMorePosts}
+          className="btn btn-secondary btn-block"
+          disabled={loadingMore}
+        >
+          {loadingMore ? 'Cargando...' : 'Cargar más publicaciones'}
+        </button>
+      )}
     </div>
   );
 };
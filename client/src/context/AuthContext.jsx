@@ -1,5 +1,6 @@
 import { createContext, useState, useContext, useEffect } from 'react';
 import { auth } from '../services/api';
+import { clearSyncedCollections } from '../services/sync';
 
 const AuthContext = createContext(null);
 
@@ -24,6 +25,7 @@ export const AuthProvider = ({ children }) => {
 
   const login = async (credentials) => {
     const response = await auth.login(credentials);
+    clearSyncedCollections();
     setUser(response.data.user);
     return response.data;
   };
@@ -39,6 +41,7 @@ export const AuthProvider = ({ children }) => {
     } catch (error) {
       console.error('Logout error:', error);
     } finally {
+      clearSyncedCollections();
       setUser(null);
     }
   };
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { companies } from '../services/api';
+import { uploadFile } from '../services/uploads';
 import ImageCropModal from '../components/ImageCropModal';
 import '../styles/Profile.css';
 
@@ -110,11 +111,16 @@ const CompanyProfile = () => {
       setLoading(true);
       const submitData = new FormData();
 
-      Object.keys(formData).forEach((key) => {
-        if (formData[key] !== null && formData[key] !== '') {
-          submitData.append(key, formData[key]);
+      const { profile_picture: picture, ...fields } = formData;
+
+      Object.keys(fields).forEach((key) => {
+        if (fields[key] !== null && fields[key] !== '') {
+          submitData.append(key, fields[key]);
         }
       });
+      if (picture) {
+        submitData.append('profile_picture_upload', await uploadFile(picture, 'company_profile'));
+      }
 
       const response = await companies.updateMyProfile(submitData);
       setProfile(response.data);
@@ -1,25 +1,33 @@
 import { useState, useEffect } from 'react';
 import { useParams } from 'react-router-dom';
 import { jobs, applications } from '../services/api';
+import { subscribeEvents } from '../services/events';
 
 const JobApplications = () => {
   const { id } = useParams();
   const [job, setJob] = useState(null);
   const [jobApplications, setJobApplications] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [ordering, setOrdering] = useState('recent');
+  const [selected, setSelected] = useState(new Set());
 
   useEffect(() => {
     fetchData();
-  }, [id]);
+    return subscribeEvents((type, event) => {
+      if (type === 'resync' || String(event.job) === String(id)) {
+        fetchData();
+      }
+    });
+  }, [id, ordering]);
 
   const fetchData = async () => {
     try {
       const [jobRes, appsRes] = await Promise.all([
         jobs.getById(id),
-        jobs.getApplications(id),
+        jobs.getApplications(id, ordering === 'score' ? { ordering: 'score', page_size: 200 } : { page_size: 200 }),
       ]);
       setJob(jobRes.data);
-      setJobApplications(appsRes.data);
+      setJobApplications(appsRes.data.results);
     } catch (error) {
       console.error('Error fetching data:', error);
     } finally {
@@ -41,6 +49,40 @@ const JobApplications = () => {
     }
   };
 
+  const toggleSelected = (applicationId) => {
+    setSelected((prev) => {
+      const next = new Set(prev);
+      if (next.has(applicationId)) {
+        next.delete(applicationId);
+      } else {
+        next.add(applicationId);
+      }
+      return next;
+    });
+  };
+
+  const toggleAll = () => {
+    setSelected(selected.size === jobApplications.length ? new Set() : new Set(jobApplications.map((app) => app.id)));
+  };
+
+  const handleBulkStatusChange = async (newStatus) => {
+    if (!newStatus || selected.size === 0) {
+      return;
+    }
+    try {
+      // Una sola petición para todas las aplicaciones seleccionadas
+      const response = await applications.bulkUpdateStatus([...selected], newStatus);
+      const updated = new Set(response.data.results.map((row) => row.id));
+      setJobApplications(
+        jobApplications.map((app) => (updated.has(app.id) ? { ...app, status: newStatus } : app))
+      );
+      setSelected(new Set());
+    } catch (error) {
+      console.error('Error updating statuses:', error);
+      alert('Error al actualizar los estados');
+    }
+  };
+
   const getStatusLabel = (status) => {
     const statuses = {
       pending: 'Pendiente',
@@ -67,6 +109,10 @@ const JobApplications = () => {
           <h1>Aplicaciones para {job.title}</h1>
           <p className="subtitle">{jobApplications.length} aplicaciones recibidas</p>
         </div>
+        <select value={ordering} onChange={(e) => setOrdering(e.target.value)} className="status-select">
+          <option value="recent">Más recientes</option>
+          <option value="score">Mayor afinidad</option>
+        </select>
       </div>
 
       {jobApplications.length === 0 ? (
@@ -75,10 +121,41 @@ const JobApplications = () => {
         </div>
       ) : (
         <div className="applications-list">
+          <div className="application-bulk-actions">
+            <label>
+              <input
+                type="checkbox"
+                checked={selected.size === jobApplications.length}
+                onChange={toggleAll}
+              />
+              {selected.size} seleccionadas
+            </label>
+            <select
+              value=""
+              disabled={selected.size === 0}
+              onChange={(e) => handleBulkStatusChange(e.target.value)}
+              className="status-select"
+            >
+              <option value="">Cambiar estado a...</option>
+              <option value="reviewing">En Revisión</option>
+              <option value="interview">Entrevista</option>
+              <option value="accepted">Aceptado</option>
+              <option value="rejected">Rechazado</option>
+            </select>
+          </div>
           {jobApplications.map((app) => (
             <div key={app.id} className="application-card-detailed">
               <div className="application-student-info">
+                <input
+                  type="checkbox"
+                  checked={selected.has(app.id)}
+                  onChange={() => toggleSelected(app.id)}
+                  aria-label="Seleccionar aplicación"
+                />
                 <h3>{app.student.user.first_name} {app.student.user.last_name}</h3>
+                {app.score !== undefined && (
+                  <p className="match-score">{Math.round(app.score * 100)}% de afinidad</p>
+                )}
                 <p>📧 {app.student.user.email}</p>
                 <p>📞 {app.student.user.phone}</p>
                 <p>🎓 {app.student.career} - {app.student.university}</p>
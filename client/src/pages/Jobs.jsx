@@ -5,29 +5,34 @@ import { useAuth } from '../context/AuthContext';
 
 const Jobs = () => {
   const [jobsList, setJobsList] = useState([]);
-  const [filteredJobs, setFilteredJobs] = useState([]);
+  const [totalCount, setTotalCount] = useState(0);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [recommended, setRecommended] = useState([]);
   const [searchParams] = useSearchParams();
   const { user } = useAuth();
   const searchTerm = searchParams.get('search') || '';
 
   useEffect(() => {
     fetchJobs();
-  }, []);
+  }, [searchTerm]);
 
   useEffect(() => {
-    if (searchTerm) {
-      filterJobs(searchTerm);
-    } else {
-      setFilteredJobs(jobsList);
+    if (user?.user_type === 'student') {
+      jobs.getRecommended()
+        .then((response) => setRecommended(response.data.slice(0, 5)))
+        .catch((error) => console.error('Error fetching recommendations:', error));
     }
-  }, [searchTerm, jobsList]);
+  }, [user]);
 
   const fetchJobs = async () => {
     try {
-      const response = await jobs.getAll();
-      setJobsList(response.data);
-      setFilteredJobs(response.data);
+      setLoading(true);
+      const response = await jobs.getAll(searchTerm ? { q: searchTerm } : {});
+      setJobsList(response.data.results);
+      setTotalCount(response.data.count);
+      setNextPage(response.data.next);
     } catch (error) {
       console.error('Error fetching jobs:', error);
     } finally {
@@ -35,19 +40,21 @@ const Jobs = () => {
     }
   };
 
-  const filterJobs = (term) => {
-    const lowerTerm = term.toLowerCase();
-    const filtered = jobsList.filter((job) => {
-      return (
-        job.title.toLowerCase().includes(lowerTerm) ||
-        job.description.toLowerCase().includes(lowerTerm) ||
-        job.location.toLowerCase().includes(lowerTerm) ||
-        job.company.company_name.toLowerCase().includes(lowerTerm) ||
-        job.requirements.toLowerCase().includes(lowerTerm) ||
-        job.responsibilities.toLowerCase().includes(lowerTerm)
-      );
-    });
-    setFilteredJobs(filtered);
+  const fetchMoreJobs = async () => {
+    if (!nextPage || loadingMore) {
+      return;
+    }
+
+    try {
+      setLoadingMore(true);
+      const response = await jobs.getNextPage(nextPage);
+      setJobsList((prev) => [...prev, ...response.data.results]);
+      setNextPage(response.data.next);
+    } catch (error) {
+      console.error('Error fetching jobs:', error);
+    } finally {
+      setLoadingMore(false);
+    }
   };
 
   const getJobTypeLabel = (type) => {
@@ -71,7 +78,7 @@ const Jobs = () => {
           <h1>Oportunidades Laborales</h1>
           {searchTerm && (
             <p className="subtitle">
-              {filteredJobs.length} resultado{filteredJobs.length !== 1 ? 's' : ''} para "{searchTerm}"
+              {totalCount} resultado{totalCount !== 1 ? 's' : ''} para "{searchTerm}"
             </p>
           )}
         </div>
@@ -82,8 +89,22 @@ const Jobs = () => {
         )}
       </div>
 
+      {!searchTerm && recommended.length > 0 && (
+        <div className="recommended-jobs">
+          <h2>Recomendados para ti</h2>
+          <ul>
+            {recommended.map((job) => (
+              <li key={job.id}>
+                <Link to={`/jobs/${job.id}`}>{job.title}</Link> · {job.company.company_name}
+                <span className="match-score"> {Math.round(job.match_score * 100)}% de afinidad</span>
+              </li>
+            ))}
+          </ul>
+        </div>
+      )}
+
       <div className="jobs-grid">
-        {filteredJobs.length === 0 ? (
+        {jobsList.length === 0 ? (
           <div className="no-data">
             {searchTerm ? (
               <>
@@ -97,7 +118,7 @@ const Jobs = () => {
             )}
           </div>
         ) : (
-          filteredJobs.map((job) => (
+          jobsList.map((job) => (
             <div key={job.id} className="job-card">
               <div className="job-header">
                 <div className="job-header-left">
@@ -144,6 +165,16 @@ const Jobs = () => {
           ))
         )}
       </div>
+
+      {nextPage && (
+        <button
+          onClick={fetchMoreJobs}
+          className="btn btn-secondary btn-block"
+          disabled={loadingMore}
+        >
+          {loadingMore ? 'Cargando...' : 'Cargar más empleos'}
+        </button>
+      )}
     </div>
   );
 };
@@ -1,19 +1,23 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { applications } from '../services/api';
+import { syncCollection } from '../services/sync';
+import { subscribeEvents } from '../services/events';
 
 const MyApplications = () => {
   const [myApplications, setMyApplications] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [timelines, setTimelines] = useState({});
 
   useEffect(() => {
     fetchApplications();
+    // Cualquier cambio en mis aplicaciones trae solo el delta desde la última sincronización
+    return subscribeEvents(() => fetchApplications());
   }, []);
 
   const fetchApplications = async () => {
     try {
-      const response = await applications.getAll();
-      setMyApplications(response.data);
+      setMyApplications(await syncCollection('applications', applications.getAll));
     } catch (error) {
       console.error('Error fetching applications:', error);
     } finally {
@@ -21,6 +25,19 @@ const MyApplications = () => {
     }
   };
 
+  const toggleTimeline = async (id) => {
+    if (timelines[id]) {
+      setTimelines(({ [id]: _, ...rest }) => rest);
+      return;
+    }
+    try {
+      const response = await applications.getTimeline(id);
+      setTimelines((prev) => ({ ...prev, [id]: response.data }));
+    } catch (error) {
+      console.error('Error fetching application timeline:', error);
+    }
+  };
+
   const getStatusLabel = (status) => {
     const statuses = {
       pending: 'Pendiente',
@@ -93,12 +110,24 @@ const MyApplications = () => {
                     <p>{app.notes}</p>
                   </div>
                 )}
+                {timelines[app.id] && (
+                  <ul className="application-timeline">
+                    {timelines[app.id].map((event, index) => (
+                      <li key={event.id ?? `pending-${index}`}>
+                        {new Date(event.created_at).toLocaleString()}: {getStatusLabel(event.to_status)}
+                      </li>
+                    ))}
+                  </ul>
+                )}
               </div>
 
               <div className="application-footer">
                 <Link to={`/jobs/${app.job.id}`} className="btn btn-secondary btn-small">
                   Ver Empleo
                 </Link>
+                <button type="button" className="btn btn-secondary btn-small" onClick={() => toggleTimeline(app.id)}>
+                  {timelines[app.id] ? 'Ocultar historial' : 'Ver historial'}
+                </button>
               </div>
             </div>
           ))}
@@ -5,15 +5,39 @@ import { jobs } from '../services/api';
 const MyJobs = () => {
   const [myJobs, setMyJobs] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [analytics, setAnalytics] = useState(null);
 
   useEffect(() => {
     fetchMyJobs();
+    fetchAnalytics();
   }, []);
 
+  const fetchAnalytics = async () => {
+    try {
+      const response = await jobs.getAnalytics();
+      setAnalytics(response.data);
+    } catch (error) {
+      console.error('Error fetching analytics:', error);
+    }
+  };
+
+  const formatDuration = (seconds) => {
+    if (seconds === null) {
+      return 'Sin respuestas';
+    }
+    const hours = seconds / 3600;
+    return hours < 48 ? `${Math.round(hours)} h` : `${Math.round(hours / 24)} días`;
+  };
+
   const fetchMyJobs = async () => {
     try {
-      const response = await jobs.getAll();
-      setMyJobs(response.data);
+      let response = await jobs.getAll({ page_size: 100 });
+      let results = response.data.results;
+      while (response.data.next) {
+        response = await jobs.getNextPage(response.data.next);
+        results = results.concat(response.data.results);
+      }
+      setMyJobs(results);
     } catch (error) {
       console.error('Error fetching jobs:', error);
     } finally {
@@ -44,6 +68,18 @@ const MyJobs = () => {
         </Link>
       </div>
 
+      {analytics && (
+        <div className="analytics-summary">
+          <p>
+            <strong>{analytics.totals.created}</strong> aplicaciones en los últimos 30 días ·
+            En revisión: {analytics.totals.current.reviewing || 0} ·
+            Entrevista: {analytics.totals.current.interview || 0} ·
+            Aceptados: {analytics.totals.current.accepted || 0}
+          </p>
+          <p>Tiempo promedio de primera respuesta: {formatDuration(analytics.totals.first_response.average_seconds)}</p>
+        </div>
+      )}
+
       {myJobs.length === 0 ? (
         <div className="no-data">
           <p>No has publicado ningún empleo todavía.</p>
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../context/AuthContext';
 import { students } from '../services/api';
+import { uploadFile } from '../services/uploads';
 import ImageCropModal from '../components/ImageCropModal';
 import '../styles/Profile.css';
 
@@ -114,11 +115,16 @@ const StudentProfile = () => {
       setLoading(true);
       const submitData = new FormData();
 
-      Object.keys(formData).forEach((key) => {
-        if (formData[key] !== null && formData[key] !== '') {
-          submitData.append(key, formData[key]);
+      const { profile_picture: picture, ...fields } = formData;
+
+      Object.keys(fields).forEach((key) => {
+        if (fields[key] !== null && fields[key] !== '') {
+          submitData.append(key, fields[key]);
         }
       });
+      if (picture) {
+        submitData.append('profile_picture_upload', await uploadFile(picture, 'student_profile'));
+      }
 
       const response = await students.updateMyProfile(submitData);
       setProfile(response.data);
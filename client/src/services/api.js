@@ -1,6 +1,6 @@
 import axios from 'axios';
 
-const API_BASE_URL = 'http://localhost:8000/api';
+export const API_BASE_URL = 'http://localhost:8000/api';
 
 const api = axios.create({
   baseURL: API_BASE_URL,
@@ -72,18 +72,25 @@ export const companies = {
 };
 
 export const jobs = {
-  getAll: () => api.get('/jobs/postings/'),
+  getAll: (params) => api.get('/jobs/postings/', { params }),
+  getNextPage: (url) => api.get(url),
+  getPopular: () => api.get('/jobs/postings/popular/'),
+  getRecommended: () => api.get('/jobs/postings/recommended/'),
+  getAnalytics: (params) => api.get('/jobs/postings/analytics/', { params }),
   getById: (id) => api.get(`/jobs/postings/${id}/`),
   create: (data) => api.post('/jobs/postings/', data),
+  bulkCreate: (rows) => api.post('/jobs/postings/bulk/', rows),
   update: (id, data) => api.patch(`/jobs/postings/${id}/`, data),
   delete: (id) => api.delete(`/jobs/postings/${id}/`),
-  getApplications: (id) => api.get(`/jobs/postings/${id}/applications/`),
+  getApplications: (id, params) => api.get(`/jobs/postings/${id}/applications/`, { params }),
 };
 
 export const applications = {
-  getAll: () => api.get('/jobs/applications/'),
+  getAll: (params) => api.get('/jobs/applications/', { params }),
   create: (data) => api.post('/jobs/applications/', data),
   updateStatus: (id, status) => api.patch(`/jobs/applications/${id}/update_status/`, { status }),
+  bulkUpdateStatus: (ids, status) => api.post('/jobs/applications/bulk_update_status/', { ids, status }),
+  getTimeline: (id) => api.get(`/jobs/applications/${id}/timeline/`),
 };
 
 export { api };
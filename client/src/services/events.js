@@ -0,0 +1,34 @@
+import { API_BASE_URL } from './api';
+
+// Canal SSE compartido: una sola conexión por pestaña para todos los componentes
+let source = null;
+const listeners = new Set();
+
+const EVENT_TYPES = ['application.created', 'application.updated', 'resync'];
+
+const dispatch = (type, data) => {
+  listeners.forEach((listener) => listener(type, data));
+};
+
+const connect = () => {
+  source = new EventSource(`${API_BASE_URL}/events/`, { withCredentials: true });
+  EVENT_TYPES.forEach((type) => {
+    source.addEventListener(type, (event) => dispatch(type, JSON.parse(event.data)));
+  });
+  // Tras una reconexión se pudieron perder eventos: los listados se resincronizan
+  source.addEventListener('open', () => dispatch('resync', {}));
+};
+
+export const subscribeEvents = (listener) => {
+  listeners.add(listener);
+  if (!source) {
+    connect();
+  }
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0 && source) {
+      source.close();
+      source = null;
+    }
+  };
+};
@@ -0,0 +1,8 @@
+export const toSrcSet = (srcset) => {
+  if (!srcset) {
+    return undefined;
+  }
+  return Object.entries(srcset)
+    .map(([width, url]) => `${url} ${width}w`)
+    .join(', ');
+};
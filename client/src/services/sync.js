@@ -0,0 +1,46 @@
+// Copias locales de listados que se actualizan con ?updated_since= en lugar
+// de volver a descargarlos completos en cada montaje.
+const collections = new Map();
+
+const mergeDelta = (items, delta) => {
+  const deleted = new Set(delta.deleted);
+  const changed = new Map(delta.results.map((item) => [item.id, item]));
+  const kept = items
+    .filter((item) => !deleted.has(item.id))
+    .map((item) => changed.get(item.id) || item);
+  const known = new Set(kept.map((item) => item.id));
+  // El delta viene en orden de updated_at: los nuevos más recientes van primero
+  const added = delta.results.filter((item) => !known.has(item.id)).reverse();
+  return [...added, ...kept];
+};
+
+// Los listados vienen paginados por cursor: se recorren todas las páginas
+const fetchAll = async (request) => {
+  let response = await request();
+  const syncedAt = response.headers['x-synced-at'];
+  let items = response.data.results;
+  while (response.data.next) {
+    const cursor = new URL(response.data.next).searchParams.get('cursor');
+    response = await request({ cursor });
+    items = items.concat(response.data.results);
+  }
+  return { items, syncedAt };
+};
+
+export const syncCollection = async (key, request) => {
+  const cached = collections.get(key);
+  if (cached && cached.syncedAt) {
+    const { data } = await request({ updated_since: cached.syncedAt });
+    if (!data.truncated) {
+      const items = mergeDelta(cached.items, data);
+      collections.set(key, { items, syncedAt: data.synced_at });
+      return items;
+    }
+  }
+
+  const { items, syncedAt } = await fetchAll(request);
+  collections.set(key, { items, syncedAt });
+  return items;
+};
+
+export const clearSyncedCollections = () => collections.clear();
@@ -0,0 +1,49 @@
+import axios from 'axios';
+import api from './api';
+
+// Cargas directas de imágenes (ver Sut/uploads.py): devuelven el id que se
+// envía en lugar del archivo (profile_picture_upload, image_upload).
+const MAX_RETRIES = 3;
+
+const sendChunks = async (file, url, chunkSize) => {
+  let offset = (await api.get(url)).data.offset;
+  let retries = 0;
+  while (offset < file.size) {
+    const end = Math.min(offset + chunkSize, file.size);
+    try {
+      const response = await api.put(url, file.slice(offset, end), {
+        headers: {
+          'Content-Type': 'application/octet-stream',
+          'Content-Range': `bytes ${offset}-${end - 1}/${file.size}`,
+        },
+      });
+      offset = response.data.offset;
+      retries = 0;
+    } catch (err) {
+      // Tras un corte o un fragmento rechazado se reanuda desde lo recibido
+      if (retries >= MAX_RETRIES) {
+        throw err;
+      }
+      retries += 1;
+      offset = err.response?.data?.offset ?? (await api.get(url)).data.offset;
+    }
+  }
+};
+
+export const uploadFile = async (file, purpose) => {
+  const { data } = await api.post('/uploads/', {
+    filename: file.name,
+    content_type: file.type,
+    size: file.size,
+    purpose,
+  });
+
+  if (data.mode === 'presigned') {
+    await axios({ method: data.method, url: data.url, data: file, headers: data.headers });
+  } else {
+    await sendChunks(file, data.url, data.chunk_size);
+  }
+
+  await api.post(`/uploads/${data.id}/complete/`);
+  return data.id;
+};
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_companyprofile_profile_picture'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companyprofile',
+            index=models.Index(fields=['updated_at'], name='companies_updated_idx'),
+        ),
+    ]
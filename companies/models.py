@@ -32,3 +32,6 @@ class CompanyProfile(models.Model):
     class Meta:
         verbose_name = 'Company Profile'
         verbose_name_plural = 'Company Profiles'
+        indexes = [
+            models.Index(fields=['updated_at'], name='companies_updated_idx'),
+        ]
@@ -1,16 +1,25 @@
 from rest_framework import serializers
 from .models import CompanyProfile
 from students.serializers import UserSerializer
+from Sut.images import AVATAR_SIZES, srcset
+from Sut.fields import SelectableFieldsMixin
+from Sut.serializer_cache import CachedRepresentationMixin, CachedListSerializer
+from Sut.uploads import MediaUploadMixin
 
 
-class CompanyProfileSerializer(serializers.ModelSerializer):
+class CompanyProfileSerializer(SelectableFieldsMixin, MediaUploadMixin, CachedRepresentationMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    profile_picture_upload = serializers.UUIDField(write_only=True, required=False)
     profile_picture_url = serializers.SerializerMethodField()
+    profile_picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = CompanyProfile
         fields = '__all__'
         read_only_fields = ['id', 'is_verified', 'created_at', 'updated_at']
+        list_serializer_class = CachedListSerializer
+
+    upload_fields = {'profile_picture_upload': ('profile_picture', 'company_profile')}
 
     def get_profile_picture_url(self, obj):
         if obj.profile_picture:
@@ -19,3 +28,6 @@ class CompanyProfileSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.profile_picture.url)
             return obj.profile_picture.url
         return None
+
+    def get_profile_picture_srcset(self, obj):
+        return srcset(obj.profile_picture, AVATAR_SIZES, self.context.get('request'))
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import CompanyProfile
+from students.auth import invalidate_principal
+from students.models import User
+from Sut.images import AVATAR_SIZES, schedule_derivatives
+from Sut.serializer_cache import invalidate, invalidate_queryset, user_fields_changed
+from Sut.sync import record_tombstone
+
+
+@receiver([post_save, post_delete], sender=CompanyProfile)
+def invalidate_company_profile(sender, instance, **kwargs):
+    invalidate(CompanyProfile, [instance.pk])
+    invalidate_principal(instance.user_id)
+
+
+@receiver(post_delete, sender=CompanyProfile)
+def record_company_profile_tombstone(sender, instance, **kwargs):
+    # Las empresas solo ven su propio perfil
+    record_tombstone(instance, user_ids=[instance.user_id], user_types=['student'])
+
+
+@receiver(post_save, sender=CompanyProfile)
+def generate_company_picture_derivatives(sender, instance, **kwargs):
+    schedule_derivatives(instance.profile_picture, AVATAR_SIZES)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_company_profile(sender, instance, update_fields=None, **kwargs):
+    if user_fields_changed(update_fields) and instance.user_type == 'company':
+        invalidate_queryset(CompanyProfile.objects.filter(user=instance))
@@ -2,21 +2,26 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from .models import CompanyProfile
 from .serializers import CompanyProfileSerializer
+from Sut.fields import FieldSelection
+from Sut.renderers import FastJSONParser
+from Sut.sync import SyncListMixin
 
 
-class CompanyProfileViewSet(viewsets.ModelViewSet):
+class CompanyProfileViewSet(SyncListMixin, viewsets.ModelViewSet):
     queryset = CompanyProfile.objects.all()
+    sync_models = (CompanyProfile,)
     serializer_class = CompanyProfileSerializer
     permission_classes = [IsAuthenticated]
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (MultiPartParser, FormParser, FastJSONParser)
 
     def get_queryset(self):
+        queryset = FieldSelection.from_request(self.request).select_related(CompanyProfile.objects.all(), 'user')
         if self.request.user.user_type == 'company':
-            return CompanyProfile.objects.filter(user=self.request.user)
-        return CompanyProfile.objects.all()
+            return queryset.filter(user=self.request.user)
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
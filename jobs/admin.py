@@ -1,10 +1,10 @@
 from django.contrib import admin
-from .models import JobPosting, JobApplication
+from .models import ApplicationStatusEvent, JobPosting, JobApplication
 
 
 @admin.register(JobPosting)
 class JobPostingAdmin(admin.ModelAdmin):
-    list_display = ['title', 'company', 'location', 'job_type', 'status', 'created_at']
+    list_display = ['title', 'company', 'location', 'job_type', 'status', 'applications_count', 'created_at']
     list_filter = ['job_type', 'status', 'created_at']
     search_fields = ['title', 'company__company_name', 'location']
 
@@ -14,3 +14,10 @@ class JobApplicationAdmin(admin.ModelAdmin):
     list_display = ['student', 'job', 'status', 'applied_at']
     list_filter = ['status', 'applied_at']
     search_fields = ['student__user__email', 'job__title']
+
+
+@admin.register(ApplicationStatusEvent)
+class ApplicationStatusEventAdmin(admin.ModelAdmin):
+    list_display = ['application', 'from_status', 'to_status', 'changed_by', 'created_at']
+    list_filter = ['to_status', 'created_at']
+    raw_id_fields = ['application', 'changed_by']
@@ -0,0 +1,197 @@
+"""
+Embudo de contratación a partir de acumulados diarios.
+
+``ApplicationDailyStats`` guarda por (empleo, día, estado) cuántas
+aplicaciones se crearon, entraron y salieron de ese estado, y las primeras
+respuestas de la empresa. Los acumulados se actualizan al insertar cada
+lote del historial de estados (jobs/status_log.py), en la misma
+transacción, y ``manage.py backfill_application_stats`` los reconstruye
+desde el historial y las aplicaciones.
+
+Los reportes solo leen los acumulados: su costo depende de los empleos y
+los días del rango, no del número de aplicaciones. El conteo actual por
+estado es la suma de ``entered - exited`` de todos los días.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Subquery, Sum
+from django.utils import timezone
+
+from .models import ApplicationDailyStats, ApplicationStatusEvent, JobApplication
+
+
+COUNTERS = ('created', 'entered', 'exited', 'first_responses', 'first_response_seconds')
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+
+def new_deltas():
+    return defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+
+def add_event(deltas, event, job_id, applied_at, responded):
+    """Suma a ``deltas`` un evento del historial; ``responded`` son las aplicaciones ya respondidas"""
+    day = timezone.localdate(event.created_at)
+    target = deltas[job_id, day, event.to_status]
+    target['entered'] += 1
+    if not event.from_status:
+        target['created'] += 1
+        return
+    deltas[job_id, day, event.from_status]['exited'] += 1
+    if event.application_id not in responded:
+        responded.add(event.application_id)
+        target['first_responses'] += 1
+        target['first_response_seconds'] += max(0, int((event.created_at - applied_at).total_seconds()))
+
+
+def event_deltas(events):
+    """
+    Acumulados de un lote de eventos aún no insertados. Devuelve también los
+    eventos cuya aplicación sigue existiendo: los demás no se pueden guardar.
+    """
+    application_ids = {event.application_id for event in events}
+    applications = {
+        pk: (job_id, applied_at)
+        for pk, job_id, applied_at in JobApplication.objects.filter(pk__in=application_ids).order_by().values_list(
+            'pk', 'job_id', 'applied_at',
+        )
+    }
+    responded = set(
+        ApplicationStatusEvent.objects.filter(application_id__in=applications).exclude(from_status='')
+        .order_by().values_list('application_id', flat=True).distinct()
+    )
+    deltas = new_deltas()
+    events = sorted((event for event in events if event.application_id in applications), key=lambda event: event.created_at)
+    for event in events:
+        add_event(deltas, event, *applications[event.application_id], responded)
+    return deltas, events
+
+
+def apply_deltas(deltas):
+    """Suma los acumulados con un UPDATE por fila; crea antes las filas que falten"""
+    if not deltas:
+        return
+    with transaction.atomic():
+        ApplicationDailyStats.objects.bulk_create([
+            ApplicationDailyStats(job_id=job_id, day=day, status=status) for job_id, day, status in deltas
+        ], ignore_conflicts=True)
+        for (job_id, day, status), counters in deltas.items():
+            ApplicationDailyStats.objects.filter(job_id=job_id, day=day, status=status).update(**{
+                name: F(name) + value for name, value in counters.items() if value
+            })
+
+
+def record_removal(application):
+    """
+    Descuenta una aplicación eliminada de su estado. Se anota en el último día
+    con acumulados de ese estado y nunca crea filas: al eliminar un empleo sus
+    acumulados ya pudieron borrarse en la misma cascada. Sus eventos aún en el
+    búfer se insertan antes de eliminarla (ver signals.py).
+    """
+    latest = ApplicationDailyStats.objects.filter(job_id=application.job_id, status=application.status).order_by('-day')
+    ApplicationDailyStats.objects.filter(pk=Subquery(latest.values('pk')[:1])).update(exited=F('exited') + 1)
+
+
+def backfill(batch_size=1000):
+    """
+    Reconstruye todos los acumulados. Las aplicaciones anteriores al historial
+    cuentan como creadas en su estado inicial conocido el día en que se
+    aplicó; sin eventos de respuesta no aportan tiempo de respuesta.
+    """
+    deltas = new_deltas()
+    applications = JobApplication.objects.order_by('pk').values_list('pk', 'job_id', 'applied_at', 'status')
+    last_pk = 0
+    while True:
+        batch = list(applications.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        events = defaultdict(list)
+        for event in ApplicationStatusEvent.objects.filter(application_id__in=[row[0] for row in batch]).order_by(
+            'created_at', 'id',
+        ):
+            events[event.application_id].append(event)
+
+        for pk, job_id, applied_at, status in batch:
+            history = events[pk]
+            if not history or history[0].from_status:
+                initial = history[0].from_status if history else status
+                counters = deltas[job_id, timezone.localdate(applied_at), initial]
+                counters['created'] += 1
+                counters['entered'] += 1
+            responded = set()
+            for event in history:
+                add_event(deltas, event, job_id, applied_at, responded)
+
+    with transaction.atomic():
+        ApplicationDailyStats.objects.all().delete()
+        ApplicationDailyStats.objects.bulk_create([
+            ApplicationDailyStats(job_id=job_id, day=day, status=status, **counters)
+            for (job_id, day, status), counters in deltas.items()
+        ], batch_size=batch_size)
+    return len(deltas)
+
+
+def report_range(since=None, until=None):
+    until = until or timezone.localdate()
+    since = since or until - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if since > until:
+        raise ValueError('since debe ser anterior o igual a until')
+    if (until - since).days >= MAX_RANGE_DAYS:
+        raise ValueError(f'El rango no puede superar {MAX_RANGE_DAYS} días')
+    return since, until
+
+
+def first_response(count, seconds):
+    return {'count': count, 'average_seconds': round(seconds / count) if count else None}
+
+
+def funnel_report(jobs, since, until):
+    """Embudo de los empleos ``jobs`` (queryset) entre ``since`` y ``until`` inclusive"""
+    stats = ApplicationDailyStats.objects.filter(job__in=jobs)
+    in_range = stats.filter(day__range=(since, until))
+
+    by_day = defaultdict(lambda: {'created': 0, 'entered': {}})
+    for day, status, created, entered in in_range.values_list('day', 'status').annotate(
+        Sum('created'), Sum('entered'),
+    ).order_by('day'):
+        by_day[day]['created'] += created
+        by_day[day]['entered'][status] = entered
+
+    jobs_report = {
+        pk: {'job': pk, 'title': title, 'created': 0, 'entered': {}, 'current': {}, 'first_response': [0, 0]}
+        for pk, title in jobs.values_list('pk', 'title')
+    }
+    for job_id, status, created, entered, responses, seconds in in_range.values_list('job_id', 'status').annotate(
+        Sum('created'), Sum('entered'), Sum('first_responses'), Sum('first_response_seconds'),
+    ).order_by():
+        report = jobs_report[job_id]
+        report['created'] += created
+        report['entered'][status] = entered
+        report['first_response'][0] += responses
+        report['first_response'][1] += seconds
+    for job_id, status, current in stats.values_list('job_id', 'status').annotate(
+        current=Sum('entered') - Sum('exited'),
+    ).order_by():
+        jobs_report[job_id]['current'][status] = current
+
+    totals = {'created': 0, 'entered': defaultdict(int), 'current': defaultdict(int), 'first_response': [0, 0]}
+    for report in jobs_report.values():
+        totals['created'] += report['created']
+        for key in ('entered', 'current'):
+            for status, count in report[key].items():
+                totals[key][status] += count
+        totals['first_response'][0] += report['first_response'][0]
+        totals['first_response'][1] += report['first_response'][1]
+        report['first_response'] = first_response(*report['first_response'])
+    totals['first_response'] = first_response(*totals['first_response'])
+
+    return {
+        'since': since,
+        'until': until,
+        'totals': {**totals, 'entered': dict(totals['entered']), 'current': dict(totals['current'])},
+        'by_day': [{'day': day, **values} for day, values in by_day.items()],
+        'by_job': list(jobs_report.values()),
+    }
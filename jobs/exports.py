@@ -0,0 +1,111 @@
+"""
+Exportación en streaming de aplicaciones a CSV o NDJSON.
+
+Las filas se leen planas con ``values()`` y ``iterator(chunk_size=...)``, de
+modo que la memoria usada no depende del número de aplicaciones exportadas.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('status', 'status'),
+    ('applied_at', 'applied_at'),
+    ('updated_at', 'updated_at'),
+    ('cover_letter', 'cover_letter'),
+    ('notes', 'notes'),
+    ('job_id', 'job_id'),
+    ('job_title', 'job__title'),
+    ('student_id', 'student_id'),
+    ('email', 'student__user__email'),
+    ('first_name', 'student__user__first_name'),
+    ('last_name', 'student__user__last_name'),
+    ('phone', 'student__user__phone'),
+    ('university', 'student__university'),
+    ('career', 'student__career'),
+    ('semester', 'student__semester'),
+    ('graduation_year', 'student__graduation_year'),
+    ('skills', 'student__skills'),
+    ('cv_url', 'student__cv_url'),
+    ('linkedin_url', 'student__linkedin_url'),
+]
+
+# Una celda que empieza así se interpreta como fórmula en las hojas de cálculo
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """Objeto tipo archivo cuyo write devuelve la línea en lugar de guardarla"""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, updated_since=None):
+    if updated_since is not None:
+        queryset = queryset.filter(updated_at__gte=updated_since)
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    names = [name for name, _ in EXPORT_COLUMNS]
+    rows = queryset.order_by('updated_at', 'id').values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for row in rows:
+        yield dict(zip(names, row))
+
+
+def csv_cell(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Los textos del usuario se exportan como texto, nunca como fórmula
+        return "'" + value
+    return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for row in rows:
+        yield writer.writerow(csv_cell(value) for value in row.values())
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def parse_updated_since(request):
+    value = request.query_params.get('updated_since')
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({'updated_since': 'Debe ser una fecha y hora ISO 8601'})
+    return parsed
+
+
+def export_response(request, queryset, filename):
+    """Arma la respuesta en streaming según ?output=csv|ndjson y ?updated_since="""
+    output = request.query_params.get('output', 'csv')
+    if output not in EXPORT_FORMATS:
+        raise ValidationError({'output': f"Debe ser uno de: {', '.join(EXPORT_FORMATS)}"})
+
+    rows = export_rows(queryset, parse_updated_since(request))
+    lines = csv_lines(rows) if output == 'csv' else ndjson_lines(rows)
+    response = StreamingHttpResponse(lines, content_type=EXPORT_FORMATS[output])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
@@ -0,0 +1,74 @@
+from decimal import Decimal, InvalidOperation
+
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .search import search
+
+
+class JobPostingSearchFilter(BaseFilterBackend):
+    """
+    Búsqueda y filtros del listado de empleos del lado del servidor.
+
+    Parámetros: q, job_type, location, industry, salary_min, salary_max,
+    deadline_before y deadline_after. Con ``q`` los resultados se ordenan por relevancia.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        job_type = params.get('job_type')
+        if job_type:
+            queryset = queryset.filter(job_type=job_type)
+
+        location = params.get('location')
+        if location:
+            queryset = queryset.filter(location__icontains=location)
+
+        industry = params.get('industry')
+        if industry:
+            queryset = queryset.filter(company__industry=industry)
+
+        salary_min = self.parse_decimal(params, 'salary_min')
+        if salary_min is not None:
+            queryset = queryset.filter(salary_max__gte=salary_min)
+
+        salary_max = self.parse_decimal(params, 'salary_max')
+        if salary_max is not None:
+            queryset = queryset.filter(salary_min__lte=salary_max)
+
+        deadline_before = self.parse_date(params, 'deadline_before')
+        if deadline_before is not None:
+            queryset = queryset.filter(deadline__lte=deadline_before)
+
+        deadline_after = self.parse_date(params, 'deadline_after')
+        if deadline_after is not None:
+            queryset = queryset.filter(deadline__gte=deadline_after)
+
+        text = params.get('q', '').strip()
+        if text:
+            queryset = search(queryset, text).order_by('-search_rank', '-created_at')
+
+        return queryset
+
+    def parse_decimal(self, params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({name: 'Debe ser un número'})
+
+    def parse_date(self, params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Debe ser una fecha con formato YYYY-MM-DD'})
+        return parsed
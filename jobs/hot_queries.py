@@ -0,0 +1,27 @@
+from Sut.hot_queries import register
+from .models import JobPosting, JobApplication
+
+
+@register('jobs.active_postings')
+def active_postings():
+    return JobPosting.objects.filter(status='active').order_by('-created_at', '-id')[:20]
+
+
+@register('jobs.popular_postings')
+def popular_postings():
+    return JobPosting.objects.filter(status='active').order_by('-applications_count', '-created_at')[:20]
+
+
+@register('jobs.company_postings')
+def company_postings():
+    return JobPosting.objects.filter(company__user_id=0).order_by('-created_at')
+
+
+@register('jobs.company_applications')
+def company_applications():
+    return JobApplication.objects.filter(job__company__user_id=0).order_by('-applied_at')
+
+
+@register('jobs.student_applications')
+def student_applications():
+    return JobApplication.objects.filter(student__user_id=0).order_by('-applied_at')
@@ -0,0 +1,84 @@
+"""
+Importación masiva de empleos desde JSON o CSV.
+
+Todas las filas se validan en una sola pasada; las válidas se insertan con
+``bulk_create`` por lotes dentro de una transacción y las inválidas se
+reportan con su índice y errores.
+"""
+import codecs
+import csv
+import json
+import os
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import as_serializer_error
+
+from .models import JobPosting
+from .recommendations import schedule_refresh
+from .serializers import JobPostingImportSerializer
+from posts.timeline import fan_out, schedule
+
+
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_ROWS = 50000
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def read_csv_rows(stream):
+    text = codecs.iterdecode(stream, 'utf-8-sig')
+    # Las celdas vacías se omiten para que apliquen los valores por defecto y los campos opcionales
+    try:
+        return [
+            {key: value for key, value in row.items() if key and value not in ('', None)}
+            for row in csv.DictReader(text)
+        ]
+    except UnicodeDecodeError:
+        raise ImportFormatError('El CSV debe estar codificado en UTF-8')
+    except csv.Error as error:
+        raise ImportFormatError(f'CSV inválido: {error}')
+
+
+def read_rows(stream, filename):
+    """Lee las filas de un archivo binario .csv o .json (un arreglo de objetos)"""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.csv':
+        return read_csv_rows(stream)
+    if extension == '.json':
+        try:
+            rows = json.load(stream)
+        except ValueError as error:
+            raise ImportFormatError(f'JSON inválido: {error}')
+        if not isinstance(rows, list):
+            raise ImportFormatError('Se esperaba un arreglo de empleos')
+        return rows
+    raise ImportFormatError('Formato no soportado, use .csv o .json')
+
+
+def import_job_postings(company, rows, batch_size=IMPORT_BATCH_SIZE):
+    """Valida e inserta las filas para la empresa; devuelve (empleos creados, errores por fila)"""
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise ImportFormatError(f'Se permiten como máximo {MAX_IMPORT_ROWS} filas por importación')
+
+    # Una sola instancia del serializer evita reconstruir sus campos en cada fila
+    serializer = JobPostingImportSerializer()
+    postings = []
+    errors = []
+    for index, row in enumerate(rows):
+        try:
+            validated_data = serializer.run_validation(row)
+        except ValidationError as error:
+            errors.append({'row': index, 'errors': as_serializer_error(error)})
+        else:
+            postings.append(JobPosting(company=company, **validated_data))
+
+    with transaction.atomic():
+        created = JobPosting.objects.bulk_create(postings, batch_size=batch_size)
+        # bulk_create no emite post_save
+        schedule(fan_out, [('job', job.pk, job.created_at) for job in created if job.status == 'active'])
+    if created:
+        schedule_refresh()
+    return created, errors
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobs.analytics import backfill
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los acumulados diarios del embudo de contratación desde el historial de estados'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        rows = backfill(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{rows} filas de acumulados generadas'))
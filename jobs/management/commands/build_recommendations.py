@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from jobs.recommendations import refresh_index
+
+
+class Command(BaseCommand):
+    help = 'Actualiza el índice TF-IDF de recomendaciones de empleos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Reconstruye el índice desde cero (compacta el vocabulario) en lugar de actualizarlo',
+        )
+
+    def handle(self, *args, **options):
+        index = refresh_index(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Índice {index.version}: {len(index)} empleos, {len(index.vocabulary)} términos'
+        ))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from companies.models import CompanyProfile
+from jobs.imports import IMPORT_BATCH_SIZE, ImportFormatError, import_job_postings, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Importa empleos en bloque desde un archivo CSV o JSON para una empresa'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Archivo .csv o .json con los empleos')
+        parser.add_argument('--company', required=True, help='Id o correo del usuario de la empresa')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        company = self.get_company(options['company'])
+        started = time.perf_counter()
+
+        try:
+            with open(options['path'], 'rb') as stream:
+                rows = read_rows(stream, options['path'])
+            created, errors = import_job_postings(company, rows, batch_size=options['batch_size'])
+        except (OSError, ImportFormatError) as error:
+            raise CommandError(str(error))
+
+        for error in errors:
+            self.stderr.write(f"Fila {error['row']}: {error['errors']}")
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(created)} empleos creados, {len(errors)} filas con errores en {elapsed:.2f}s'
+        ))
+
+    def get_company(self, value):
+        lookup = {'pk': value} if value.isdigit() else {'user__email': value.lower()}
+        try:
+            return CompanyProfile.objects.get(**lookup)
+        except CompanyProfile.DoesNotExist:
+            raise CommandError(f'No existe la empresa {value}')
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from jobs.models import JobPosting, JobApplication
+
+
+class Command(BaseCommand):
+    help = 'Reconcilia el contador applications_count de cada JobPosting con las aplicaciones reales'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Reconstruye el contador de todos los empleos, no solo los desincronizados',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Solo reporta los empleos desincronizados sin modificarlos',
+        )
+
+    def handle(self, *args, **options):
+        actual_count = Coalesce(Subquery(
+            JobApplication.objects.filter(job=OuterRef('pk')).order_by().values('job').annotate(
+                total=Count('pk')
+            ).values('total')
+        ), 0)
+
+        with transaction.atomic():
+            postings = JobPosting.objects.all()
+            if not options['all']:
+                drifted = JobPosting.objects.annotate(actual=actual_count).exclude(
+                    applications_count=F('actual')
+                ).values_list('pk', flat=True)
+                postings = postings.filter(pk__in=list(drifted))
+
+            if options['dry_run']:
+                self.stdout.write(f'{postings.count()} empleos desincronizados')
+                return
+
+            updated = postings.update(applications_count=actual_count)
+
+        self.stdout.write(self.style.SUCCESS(f'{updated} contadores actualizados'))
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:10
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_applications_count(apps, schema_editor):
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    JobApplication = apps.get_model('jobs', 'JobApplication')
+    counts = JobApplication.objects.filter(job=OuterRef('pk')).order_by().values('job').annotate(
+        total=Count('pk')
+    ).values('total')
+    JobPosting.objects.update(applications_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='applications_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', '-applications_count'], name='jobs_popular_idx'),
+        ),
+        migrations.RunPython(backfill_applications_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+from jobs.search import install_search_index, uninstall_search_index
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor.connection, backfill=True)
+
+
+def drop_search_index(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_companyprofile_profile_picture'),
+        ('jobs', '0003_jobposting_applications_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'job_type', '-created_at'], name='jobs_status_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'deadline'], name='jobs_status_deadline_idx'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
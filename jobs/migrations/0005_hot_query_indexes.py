@@ -0,0 +1,37 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_jobposting_search_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobposting',
+            name='jobs_status_deadline_idx',
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-applied_at'], name='jobs_app_job_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['student', '-applied_at'], name='jobs_app_student_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('deadline__isnull', False)), fields=['status', 'deadline'], name='jobs_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='jobs_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['company', '-created_at'], name='jobs_company_created_idx'),
+        ),
+    ]
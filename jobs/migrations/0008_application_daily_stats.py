@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-18 20:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_application_status_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reviewing', 'Reviewing'), ('interview', 'Interview'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], max_length=20)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('entered', models.PositiveIntegerField(default=0)),
+                ('exited', models.PositiveIntegerField(default=0)),
+                ('first_responses', models.PositiveIntegerField(default=0)),
+                ('first_response_seconds', models.PositiveBigIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.jobposting')),
+            ],
+            options={
+                'verbose_name': 'Application Daily Stats',
+                'verbose_name_plural': 'Application Daily Stats',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='applicationdailystats',
+            constraint=models.UniqueConstraint(fields=('job', 'day', 'status'), name='jobs_daily_stats_unique'),
+        ),
+    ]
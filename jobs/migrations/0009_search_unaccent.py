@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from jobs.search import install_search_index
+
+
+def reinstall_search_index(apps, schema_editor):
+    # En PostgreSQL recalcula search_document con la configuración sin acentos
+    install_search_index(schema_editor.connection, backfill=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_application_daily_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,21 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+from Sut.fields import ALL_FIELDS
 from companies.models import CompanyProfile
 from students.models import StudentProfile
 
 
+class JobPostingQuerySet(models.QuerySet):
+    def with_related(self, selection=ALL_FIELDS):
+        """Trae la empresa y su usuario en la misma consulta si la representación los incluye"""
+        return selection.select_related(self, 'company__user')
+
+    def inactive_since(self, since):
+        """Ids de empleos que dejaron de estar activos (cerrados o en borrador) después de since"""
+        return self.filter(updated_at__gt=since).exclude(status='active').values_list('id', flat=True)
+
+
 class JobPosting(models.Model):
     JOB_TYPE_CHOICES = (
         ('full_time', 'Full Time'),
@@ -30,6 +43,9 @@ class JobPosting(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField(null=True, blank=True)
+    applications_count = models.PositiveIntegerField(default=0)
+
+    objects = JobPostingQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.title} - {self.company.company_name}"
@@ -38,6 +54,28 @@ class JobPosting(models.Model):
         verbose_name = 'Job Posting'
         verbose_name_plural = 'Job Postings'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-applications_count'], name='jobs_popular_idx'),
+            models.Index(fields=['status', 'job_type', '-created_at'], name='jobs_status_type_idx'),
+            models.Index(
+                fields=['status', 'deadline'], condition=models.Q(deadline__isnull=False),
+                name='jobs_status_deadline_idx',
+            ),
+            models.Index(fields=['status', '-created_at', '-id'], name='jobs_active_created_idx'),
+            models.Index(fields=['company', '-created_at'], name='jobs_company_created_idx'),
+            models.Index(fields=['status', 'updated_at'], name='jobs_status_updated_idx'),
+        ]
+
+
+class JobApplicationQuerySet(models.QuerySet):
+    def with_related(self, selection=ALL_FIELDS):
+        """Evita consultas N+1 al serializar el estudiante y el empleo anidados que se representan"""
+        queryset = selection.select_related(self, 'student__user')
+        if selection.expands('job'):
+            queryset = queryset.prefetch_related(
+                models.Prefetch('job', queryset=JobPosting.objects.with_related(selection.nested('job')))
+            )
+        return queryset
 
 
 class JobApplication(models.Model):
@@ -57,6 +95,8 @@ class JobApplication(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     notes = models.TextField(blank=True)
 
+    objects = JobApplicationQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.student.user.email} - {self.job.title}"
 
@@ -65,3 +105,49 @@ class JobApplication(models.Model):
         verbose_name_plural = 'Job Applications'
         ordering = ['-applied_at']
         unique_together = ['student', 'job']
+        indexes = [
+            models.Index(fields=['job', '-applied_at'], name='jobs_app_job_applied_idx'),
+            models.Index(fields=['student', '-applied_at'], name='jobs_app_student_applied_idx'),
+            models.Index(fields=['updated_at'], name='jobs_app_updated_idx'),
+        ]
+
+
+class ApplicationStatusEvent(models.Model):
+    """Cambio de estado de una aplicación; registro de solo anexado (ver jobs/status_log.py)"""
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='status_events')
+    # Vacío en el evento de creación
+    from_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES, blank=True)
+    to_status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+',
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Application Status Event'
+        verbose_name_plural = 'Application Status Events'
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['application', 'created_at'], name='jobs_status_event_app_idx'),
+        ]
+
+
+class ApplicationDailyStats(models.Model):
+    """Acumulados diarios de las aplicaciones por empleo y estado (ver jobs/analytics.py)"""
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    status = models.CharField(max_length=20, choices=JobApplication.STATUS_CHOICES)
+    # Aplicaciones creadas ese día (se cuentan en su estado inicial)
+    created = models.PositiveIntegerField(default=0)
+    entered = models.PositiveIntegerField(default=0)
+    exited = models.PositiveIntegerField(default=0)
+    # Primer cambio de estado de la empresa hacia este estado y segundos desde que se aplicó
+    first_responses = models.PositiveIntegerField(default=0)
+    first_response_seconds = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Application Daily Stats'
+        verbose_name_plural = 'Application Daily Stats'
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'day', 'status'], name='jobs_daily_stats_unique'),
+        ]
@@ -0,0 +1,146 @@
+"""
+Ranking de candidatos de un empleo por afinidad.
+
+El puntaje de cada aplicación combina la similitud coseno TF-IDF entre el
+empleo (título y requisitos) y las ``skills``, la ``career`` y la carta de
+presentación del estudiante, más su avance en la carrera para los empleos
+de tiempo completo o contrato. Los pesos IDF son los del índice de
+recomendaciones (ver recommendations.py).
+
+Las aplicaciones se puntúan en lotes con NumPy y los puntajes se guardan en
+caché por versión del empleo (su ``updated_at``); dentro de la entrada cada
+puntaje lleva el sello de la aplicación y del perfil del estudiante, así que
+solo se recalculan los candidatos nuevos o modificados.
+"""
+import math
+from collections import Counter
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from .models import JobApplication
+from .recommendations import job_document, load_index, tokenize
+
+
+SCORE_WEIGHTS = {'skills': 0.5, 'cover_letter': 0.2, 'career': 0.15, 'readiness': 0.15}
+READINESS_JOB_TYPES = ('full_time', 'contract')
+SCORING_BATCH_SIZE = 500
+
+
+def get_cache():
+    return caches[settings.RANKING_CACHE_ALIAS]
+
+
+def ranking_key(job):
+    return f'rank:{job.pk}:{job.updated_at.timestamp()}'
+
+
+class TermWeights:
+    """Vocabulario e IDF del índice de recomendaciones; los términos desconocidos reciben el IDF máximo"""
+
+    def __init__(self):
+        index = load_index()
+        self.vocabulary = dict(index.vocabulary) if index is not None else {}
+        self.idf = list(index.idf) if index is not None else []
+        self.unknown_idf = float(max(self.idf, default=1.0))
+
+    def column(self, term):
+        col = self.vocabulary.get(term)
+        if col is None:
+            col = self.vocabulary[term] = len(self.idf)
+            self.idf.append(self.unknown_idf)
+        return col
+
+    def target(self, text):
+        """Vector denso normalizado del texto del empleo"""
+        columns = {self.column(term): count for term, count in Counter(tokenize(text)).items()}
+        vector = np.zeros(len(self.idf))
+        for col, count in columns.items():
+            vector[col] = (1 + math.log(count)) * self.idf[col]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def similarities(self, texts, target):
+        """Similitud coseno de cada texto con ``target``, calculada para todo el lote a la vez"""
+        rows, cols, counts = [], [], []
+        for row, text in enumerate(texts):
+            for term, count in Counter(tokenize(text)).items():
+                rows.append(row)
+                cols.append(self.column(term))
+                counts.append(count)
+
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        idf = np.array(self.idf)
+        target = np.pad(target, (0, len(idf) - len(target)))
+        weights = (1 + np.log(np.array(counts, dtype=np.float64))) * idf[cols] if counts else np.zeros(0)
+
+        dots = np.bincount(rows, weights=weights * target[cols], minlength=len(texts))
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=len(texts)))
+        return np.divide(dots, norms, out=np.zeros(len(texts)), where=norms > 0)
+
+
+def readiness(job, semesters, graduation_years):
+    """Avance en la carrera (0 a 1); las prácticas y medio tiempo no lo penalizan"""
+    if job.job_type not in READINESS_JOB_TYPES:
+        return np.ones(len(semesters))
+    by_semester = np.clip(np.array(semesters, dtype=np.float64) / 10, 0, 1)
+    years_left = np.array(graduation_years, dtype=np.float64) - timezone.now().year
+    by_graduation = np.clip(1 - years_left / 4, 0, 1)
+    return np.maximum(by_semester, by_graduation)
+
+
+def score_applications(job, rows, terms=None):
+    """
+    Puntajes (0 a 1) de un lote de aplicaciones del empleo. ``rows`` son
+    tuplas (skills, career, cover_letter, semester, graduation_year).
+    """
+    if not rows:
+        return np.zeros(0)
+    terms = terms or TermWeights()
+    target = terms.target(job_document(job.title, job.requirements))
+    skills, careers, letters, semesters, graduation_years = zip(*rows)
+    return (
+        SCORE_WEIGHTS['skills'] * terms.similarities(skills, target)
+        + SCORE_WEIGHTS['cover_letter'] * terms.similarities(letters, target)
+        + SCORE_WEIGHTS['career'] * terms.similarities(careers, target)
+        + SCORE_WEIGHTS['readiness'] * readiness(job, semesters, graduation_years)
+    )
+
+
+def rank_applications(job):
+    """Aplicaciones del empleo como [(application_id, score)], de mayor a menor puntaje"""
+    stamps = {
+        pk: (updated_at.timestamp(), student_updated_at.timestamp())
+        for pk, updated_at, student_updated_at in JobApplication.objects.filter(job=job).values_list(
+            'pk', 'updated_at', 'student__updated_at',
+        )
+    }
+    key = ranking_key(job)
+    cached = get_cache().get(key) or {}
+    scores = {pk: cached[pk][1] for pk, stamp in stamps.items() if pk in cached and cached[pk][0] == stamp}
+
+    missing = [pk for pk in stamps if pk not in scores]
+    if missing:
+        terms = TermWeights()
+        for start in range(0, len(missing), SCORING_BATCH_SIZE):
+            batch = JobApplication.objects.filter(pk__in=missing[start:start + SCORING_BATCH_SIZE]).values_list(
+                'pk', 'student__skills', 'student__career', 'cover_letter',
+                'student__semester', 'student__graduation_year',
+            )
+            batch = list(batch)
+            batch_scores = score_applications(job, [row[1:] for row in batch], terms)
+            scores.update(zip([row[0] for row in batch], batch_scores.tolist()))
+        get_cache().set(
+            key, {pk: (stamps[pk], score) for pk, score in scores.items()}, settings.RANKING_CACHE_TIMEOUT,
+        )
+
+    if not scores:
+        return []
+    ids = np.fromiter(scores.keys(), dtype=np.int64, count=len(scores))
+    values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+    # Mayor puntaje primero; en empate, la aplicación más reciente
+    order = np.lexsort((-ids, -values))
+    return list(zip(ids[order].tolist(), values[order].tolist()))
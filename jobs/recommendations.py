@@ -0,0 +1,274 @@
+"""
+Recomendaciones de empleos a partir de las habilidades del estudiante.
+
+Cada empleo activo se representa con un vector TF-IDF de su título y sus
+requisitos, y el campo ``skills`` del estudiante con otro sobre el mismo
+vocabulario; la recomendación es la similitud coseno entre ambos.
+
+El índice es una matriz dispersa en formato COO guardada como arreglos
+``.npy`` en RECOMMENDATIONS_INDEX_DIR::
+
+    <dir>/CURRENT            nombre de la versión vigente
+    <dir>/<versión>/meta.json vocabulario y fecha de construcción
+    <dir>/<versión>/*.npy    job_ids, rows, cols, counts, weights, idf
+
+Los procesos abren los arreglos con ``mmap_mode='r'``, así todos comparten
+las mismas páginas del caché del sistema operativo en lugar de cargar una
+copia cada uno, y cambian de versión al ver otro nombre en CURRENT.
+
+Cuando cambian los empleos, ``refresh_index`` solo vuelve a tokenizar los
+modificados desde la construcción anterior (y quita los eliminados según
+los tombstones de Sut/sync.py); el IDF y las normas se recalculan con
+operaciones vectorizadas sobre los conteos guardados.
+"""
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import JobPosting
+from Sut.sync import sync_started_at, tombstones_expired, tombstones_since
+
+
+logger = logging.getLogger(__name__)
+
+ARRAYS = ('job_ids', 'rows', 'cols', 'counts', 'weights', 'idf')
+KEPT_VERSIONS = 2
+STOP_WORDS = frozenset(
+    'de la el en y a o con para por los las del al un una que se su sus como mas '
+    'the and or of to in with for on at an as is are be'.split()
+)
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+_loaded = None
+_loaded_lock = threading.Lock()
+_build_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='recommendations')
+_refresh_pending = threading.Event()
+
+
+def tokenize(text):
+    """Términos en minúsculas y sin acentos; conserva tokens como c++ o c#"""
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode().lower()
+    return [token for token in TOKEN_RE.findall(text) if len(token) > 1 and token not in STOP_WORDS]
+
+
+def job_document(title, requirements):
+    return f'{title}\n{requirements}'
+
+
+def sublinear_tf(counts):
+    return 1 + np.log(counts)
+
+
+def compute_weights(rows, cols, counts, n_docs, n_terms):
+    """IDF suavizado y pesos TF-IDF normalizados (L2) por documento"""
+    df = np.bincount(cols, minlength=n_terms)
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    weights = sublinear_tf(counts) * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n_docs))
+    return idf, (weights / norms[rows]).astype(np.float32)
+
+
+class RecommendationIndex:
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / 'meta.json') as meta_file:
+            meta = json.load(meta_file)
+        self.version = self.path.name
+        self.built_at = parse_datetime(meta['built_at'])
+        self.vocabulary = meta['vocabulary']
+        for name in ARRAYS:
+            setattr(self, name, np.load(self.path / f'{name}.npy', mmap_mode='r'))
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def query_vector(self, text):
+        """Vector TF-IDF normalizado del texto, o None si no comparte términos con el índice"""
+        vector = np.zeros(len(self.idf), dtype=np.float32)
+        for term, count in Counter(tokenize(text)).items():
+            col = self.vocabulary.get(term)
+            if col is not None:
+                vector[col] = (1 + math.log(count)) * self.idf[col]
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def scores(self, text):
+        """Similitud coseno del texto con cada empleo del índice (alineada con job_ids)"""
+        vector = self.query_vector(text)
+        if vector is None:
+            return np.zeros(len(self), dtype=np.float32)
+        return np.bincount(self.rows, weights=self.weights * vector[self.cols], minlength=len(self))
+
+    def recommend(self, text, limit, exclude=()):
+        """Los ``limit`` empleos más similares como [(job_id, score)], de mayor a menor"""
+        scores = self.scores(text)
+        if exclude:
+            scores[np.isin(self.job_ids, list(exclude))] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(self.job_ids[i]), float(scores[i])) for i in ranked]
+
+
+def index_dir():
+    return Path(settings.RECOMMENDATIONS_INDEX_DIR)
+
+
+def current_version():
+    try:
+        return (index_dir() / 'CURRENT').read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_index():
+    """Índice vigente (abierto una vez por proceso y versión), o None si aún no existe"""
+    global _loaded
+    version = current_version()
+    if version is None:
+        return None
+    with _loaded_lock:
+        if _loaded is None or _loaded.path != index_dir() / version:
+            _loaded = RecommendationIndex(index_dir() / version)
+        return _loaded
+
+
+def write_index(job_ids, rows, cols, counts, vocabulary, built_at):
+    directory = index_dir()
+    version = f'{time.time_ns():020d}-{uuid.uuid4().hex[:8]}'
+    target = directory / version
+    target.mkdir(parents=True)
+
+    idf, weights = compute_weights(rows, cols, counts, len(job_ids), len(vocabulary))
+    arrays = {'job_ids': job_ids, 'rows': rows, 'cols': cols, 'counts': counts, 'weights': weights, 'idf': idf}
+    for name in ARRAYS:
+        np.save(target / f'{name}.npy', arrays[name])
+    with open(target / 'meta.json', 'w') as meta_file:
+        json.dump({'built_at': built_at.isoformat(), 'vocabulary': vocabulary}, meta_file)
+
+    # El cambio de versión es atómico: un lector ve la anterior o la nueva completa
+    pointer = directory / f'CURRENT.{version}'
+    pointer.write_text(version)
+    os.replace(pointer, directory / 'CURRENT')
+
+    # Los procesos que aún tengan abierta una versión borrada conservan su mapeo
+    versions = sorted(path for path in directory.iterdir() if path.is_dir() and path != target)
+    for path in versions[:-(KEPT_VERSIONS - 1)]:
+        shutil.rmtree(path, ignore_errors=True)
+    return load_index()
+
+
+def tokenize_postings(queryset, vocabulary):
+    """Conteos de términos de cada empleo; agrega al vocabulario los términos nuevos"""
+    job_ids, rows, cols, counts = [], [], [], []
+    postings = queryset.filter(status='active').order_by('pk').values_list('pk', 'title', 'requirements')
+    for pk, title, requirements in postings.iterator():
+        row = len(job_ids)
+        job_ids.append(pk)
+        for term, count in Counter(tokenize(job_document(title, requirements))).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            counts.append(count)
+    return (
+        np.array(job_ids, dtype=np.int64), np.array(rows, dtype=np.int32),
+        np.array(cols, dtype=np.int32), np.array(counts, dtype=np.float32),
+    )
+
+
+def build_index():
+    """Construye el índice completo de los empleos activos"""
+    built_at = sync_started_at()
+    vocabulary = {}
+    job_ids, rows, cols, counts = tokenize_postings(JobPosting.objects.all(), vocabulary)
+    return write_index(job_ids, rows, cols, counts, vocabulary, built_at)
+
+
+def update_index(index):
+    """Aplica al índice los empleos creados, modificados o eliminados desde su construcción"""
+    built_at = sync_started_at()
+    changed = JobPosting.objects.filter(updated_at__gt=index.built_at)
+    stale = set(changed.values_list('pk', flat=True)) | set(tombstones_since(JobPosting, index.built_at))
+    if not stale:
+        return index
+
+    keep_docs = ~np.isin(index.job_ids, list(stale))
+    keep = keep_docs[index.rows]
+    # Renumera las filas conservadas para que sigan siendo contiguas
+    new_row = np.cumsum(keep_docs, dtype=np.int64) - 1
+    vocabulary = dict(index.vocabulary)
+    job_ids, rows, cols, counts = tokenize_postings(changed, vocabulary)
+
+    offset = int(keep_docs.sum())
+    return write_index(
+        np.concatenate([index.job_ids[keep_docs], job_ids]),
+        np.concatenate([new_row[index.rows[keep]].astype(np.int32), rows + offset]),
+        np.concatenate([index.cols[keep], cols]),
+        np.concatenate([index.counts[keep], counts]),
+        vocabulary, built_at,
+    )
+
+
+def refresh_index(full=False):
+    """Actualiza el índice de forma incremental o lo reconstruye si no hay uno utilizable"""
+    with _build_lock:
+        index = None if full else load_index()
+        if index is None or tombstones_expired(index.built_at):
+            return build_index()
+        return update_index(index)
+
+
+def get_index():
+    """Índice vigente; si aún no hay uno encola su construcción y devuelve None"""
+    index = load_index()
+    if index is None:
+        submit_refresh()
+    return index
+
+
+def _refresh_in_background():
+    _refresh_pending.clear()
+    # El hilo reutiliza su conexión entre tareas: se descarta si caducó o quedó inservible
+    close_old_connections()
+    try:
+        refresh_index()
+    except Exception:
+        logger.exception('No se pudo actualizar el índice de recomendaciones')
+    finally:
+        close_old_connections()
+
+
+def submit_refresh():
+    """Encola una actualización del índice; agrupa las que se acumulen"""
+    if not _refresh_pending.is_set():
+        _refresh_pending.set()
+        _executor.submit(_refresh_in_background)
+
+
+def schedule_refresh():
+    """Encola una actualización del índice al confirmar la transacción"""
+    transaction.on_commit(submit_refresh)
+
+
+def recommend_jobs(skills, limit, exclude=()):
+    if not tokenize(skills):
+        return []
+    index = get_index()
+    # Sin índice no se construye dentro de la petición: no hay recomendaciones hasta que esté listo
+    return index.recommend(skills, limit, exclude) if index is not None else []
@@ -0,0 +1,238 @@
+"""
+Índice de búsqueda de texto completo para JobPosting.
+
+El documento indexado cubre title, description, requirements y el
+company_name de la empresa. Se mantiene con triggers de la base de datos:
+
+* PostgreSQL: columna ``search_document`` (tsvector) con índice GIN. La
+  configuración ``sut_spanish`` es la de español precedida de unaccent
+  (requiere poder crear la extensión).
+* SQLite: tabla virtual FTS5 ``jobs_jobposting_fts`` cuyo rowid es el id del empleo.
+
+En ambos casos la búsqueda ignora acentos y cada término es un prefijo.
+
+Este módulo no importa modelos para poder usarse desde las migraciones.
+"""
+import re
+from functools import lru_cache
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+
+SEARCH_CONFIG = 'sut_spanish'
+FTS_TABLE = 'jobs_jobposting_fts'
+
+POSTGRES_INSTALL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    f"""
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+            CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = spanish);
+            ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+                ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+        END IF;
+    END
+    $$
+    """,
+    "ALTER TABLE jobs_jobposting ADD COLUMN IF NOT EXISTS search_document tsvector",
+    f"""
+    CREATE OR REPLACE FUNCTION jobs_jobposting_search_document() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_document :=
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(
+                (SELECT company_name FROM companies_companyprofile WHERE id = NEW.company_id), ''
+            )), 'A') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.requirements, '')), 'B') ||
+            setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS jobs_jobposting_search_document_trg ON jobs_jobposting",
+    """
+    CREATE TRIGGER jobs_jobposting_search_document_trg
+    BEFORE INSERT OR UPDATE OF title, description, requirements, company_id ON jobs_jobposting
+    FOR EACH ROW EXECUTE FUNCTION jobs_jobposting_search_document()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION jobs_companyprofile_search_document() RETURNS trigger AS $$
+    BEGIN
+        UPDATE jobs_jobposting SET title = title WHERE company_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS jobs_companyprofile_search_document_trg ON companies_companyprofile",
+    """
+    CREATE TRIGGER jobs_companyprofile_search_document_trg
+    AFTER UPDATE OF company_name ON companies_companyprofile
+    FOR EACH ROW EXECUTE FUNCTION jobs_companyprofile_search_document()
+    """,
+    "CREATE INDEX IF NOT EXISTS jobs_jobposting_search_idx ON jobs_jobposting USING gin (search_document)",
+]
+
+POSTGRES_BACKFILL = "UPDATE jobs_jobposting SET title = title"
+
+POSTGRES_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS jobs_companyprofile_search_document_trg ON companies_companyprofile",
+    "DROP FUNCTION IF EXISTS jobs_companyprofile_search_document()",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_search_document_trg ON jobs_jobposting",
+    "DROP FUNCTION IF EXISTS jobs_jobposting_search_document()",
+    "ALTER TABLE jobs_jobposting DROP COLUMN IF EXISTS search_document",
+    f"DROP TEXT SEARCH CONFIGURATION IF EXISTS {SEARCH_CONFIG}",
+]
+
+SQLITE_INSERT_ROW = f"""
+    INSERT INTO {FTS_TABLE} (rowid, title, description, requirements, company_name)
+    SELECT NEW.id, NEW.title, NEW.description, NEW.requirements,
+           (SELECT company_name FROM companies_companyprofile WHERE id = NEW.company_id);
+"""
+
+SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE}
+    USING fts5(title, description, requirements, company_name, tokenize = 'unicode61 remove_diacritics 2')
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_fts_insert AFTER INSERT ON jobs_jobposting
+    BEGIN {SQLITE_INSERT_ROW} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_fts_update
+    AFTER UPDATE OF title, description, requirements, company_id ON jobs_jobposting
+    BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id;
+        {SQLITE_INSERT_ROW}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_fts_delete AFTER DELETE ON jobs_jobposting
+    BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_companyprofile_fts_update
+    AFTER UPDATE OF company_name ON companies_companyprofile
+    BEGIN
+        UPDATE {FTS_TABLE} SET company_name = NEW.company_name
+        WHERE rowid IN (SELECT id FROM jobs_jobposting WHERE company_id = NEW.id);
+    END
+    """,
+]
+
+SQLITE_BACKFILL = f"""
+    INSERT INTO {FTS_TABLE} (rowid, title, description, requirements, company_name)
+    SELECT job.id, job.title, job.description, job.requirements, company.company_name
+    FROM jobs_jobposting job
+    JOIN companies_companyprofile company ON company.id = job.company_id
+    WHERE job.id NOT IN (SELECT rowid FROM {FTS_TABLE})
+"""
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS jobs_companyprofile_fts_update",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_fts_delete",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_fts_update",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_fts_insert",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# Pesos bm25 por columna: title, description, requirements, company_name
+SQLITE_RANK = f"-bm25({FTS_TABLE}, 10.0, 1.0, 4.0, 10.0)"
+
+
+@lru_cache(maxsize=None)
+def search_backend(alias='default'):
+    """Devuelve 'postgresql', 'fts5' o None si la base de datos no soporta el índice"""
+    connection = connections[alias]
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA compile_options')
+            options = {row[0] for row in cursor.fetchall()}
+        if 'ENABLE_FTS5' in options:
+            return 'fts5'
+    return None
+
+
+def install_search_index(connection, backfill=False):
+    """Crea (de forma idempotente) la estructura de búsqueda y sus triggers"""
+    backend = search_backend(connection.alias)
+    if backend == 'postgresql':
+        statements = POSTGRES_INSTALL + ([POSTGRES_BACKFILL] if backfill else [])
+    elif backend == 'fts5':
+        statements = SQLITE_INSTALL + ([SQLITE_BACKFILL] if backfill else [])
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def uninstall_search_index(connection):
+    backend = search_backend(connection.alias)
+    if backend == 'postgresql':
+        statements = POSTGRES_UNINSTALL
+    elif backend == 'fts5':
+        statements = SQLITE_UNINSTALL
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text, flags=re.UNICODE)
+
+
+def fts5_query(text):
+    """Convierte texto libre en una consulta FTS5 segura: todos los términos, con prefijo"""
+    return ' '.join('"%s"*' % term for term in search_terms(text))
+
+
+def tsquery_text(text):
+    """Convierte texto libre en una consulta to_tsquery segura: todos los términos, con prefijo"""
+    return ' & '.join(f'{term}:*' for term in search_terms(text))
+
+
+def search(queryset, text):
+    """
+    Filtra el queryset por el texto y anota ``search_rank`` (mayor es más relevante).
+
+    Sin índice disponible se recurre a icontains sobre los mismos campos.
+    """
+    backend = search_backend(queryset.db)
+    if backend == 'postgresql':
+        match = tsquery_text(text)
+        if not match:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        tsquery = f"to_tsquery('{SEARCH_CONFIG}', %s)"
+        return queryset.annotate(
+            search_match=RawSQL(f"jobs_jobposting.search_document @@ {tsquery}", (match,), output_field=BooleanField()),
+            search_rank=RawSQL(f"ts_rank(jobs_jobposting.search_document, {tsquery})", (match,), output_field=FloatField()),
+        ).filter(search_match=True)
+
+    if backend == 'fts5':
+        match = fts5_query(text)
+        if not match:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        return queryset.annotate(
+            search_rank=RawSQL(
+                f"SELECT {SQLITE_RANK} FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = jobs_jobposting.id",
+                (match,), output_field=FloatField(),
+            ),
+        ).filter(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)))
+
+    condition = Q()
+    for term in text.split():
+        condition &= (
+            Q(title__icontains=term) | Q(description__icontains=term)
+            | Q(requirements__icontains=term) | Q(company__company_name__icontains=term)
+        )
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
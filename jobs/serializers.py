@@ -1,23 +1,41 @@
 from rest_framework import serializers
-from .models import JobPosting, JobApplication
+from .models import ApplicationStatusEvent, JobPosting, JobApplication
 from companies.serializers import CompanyProfileSerializer
 from students.serializers import StudentProfileSerializer
+from Sut.fields import SelectableFieldsMixin
+from Sut.serializer_cache import CachedRepresentationMixin, CachedListSerializer
 
 
-class JobPostingSerializer(serializers.ModelSerializer):
+class JobPostingSerializer(SelectableFieldsMixin, CachedRepresentationMixin, serializers.ModelSerializer):
     company = CompanyProfileSerializer(read_only=True)
-    applications_count = serializers.SerializerMethodField()
+
+    # applications_count se actualiza con F() sin tocar updated_at
+    cache_stamp_fields = ('updated_at', 'applications_count')
 
     class Meta:
         model = JobPosting
         fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'applications_count']
+        list_serializer_class = CachedListSerializer
+
+
+class JobPostingImportSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobPosting
+        fields = [
+            'title', 'description', 'requirements', 'responsibilities', 'location',
+            'job_type', 'salary_min', 'salary_max', 'status', 'deadline',
+        ]
 
-    def get_applications_count(self, obj):
-        return obj.applications.count()
+    def validate(self, data):
+        salary_min = data.get('salary_min')
+        salary_max = data.get('salary_max')
+        if salary_min is not None and salary_max is not None and salary_min > salary_max:
+            raise serializers.ValidationError({'salary_max': 'Debe ser mayor o igual que salary_min'})
+        return data
 
 
-class JobApplicationSerializer(serializers.ModelSerializer):
+class JobApplicationSerializer(SelectableFieldsMixin, serializers.ModelSerializer):
     student = StudentProfileSerializer(read_only=True)
     job = JobPostingSerializer(read_only=True)
     job_id = serializers.IntegerField(write_only=True)
@@ -25,7 +43,8 @@ class JobApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobApplication
         fields = '__all__'
-        read_only_fields = ['id', 'applied_at', 'updated_at']
+        # El estado solo cambia con update_status y bulk_update_status, que registran el historial
+        read_only_fields = ['id', 'status', 'applied_at', 'updated_at']
 
     def validate(self, data):
         request = self.context.get('request')
@@ -37,3 +56,14 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             ).exists():
                 raise serializers.ValidationError("You have already applied to this job")
         return data
+
+
+class ApplicationStatusEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ApplicationStatusEvent
+        fields = ['id', 'from_status', 'to_status', 'changed_by', 'created_at']
+
+
+class BulkStatusUpdateSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+    status = serializers.ChoiceField(choices=JobApplication.STATUS_CHOICES)
@@ -0,0 +1,111 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import JobPosting, JobApplication
+from companies.models import CompanyProfile
+from students.models import StudentProfile, User
+from Sut.serializer_cache import invalidate, invalidate_queryset, touch, user_fields_changed
+from Sut.events import publish_to_users
+from Sut.sync import record_tombstone
+from .analytics import record_removal
+from .recommendations import schedule_refresh
+from .status_log import status_writer
+
+
+@receiver(post_save, sender=JobApplication)
+def increment_applications_count(sender, instance, created, **kwargs):
+    if created:
+        JobPosting.objects.filter(pk=instance.job_id).update(
+            applications_count=F('applications_count') + 1
+        )
+        invalidate(JobPosting, [instance.job_id])
+
+
+@receiver(post_delete, sender=JobApplication)
+def decrement_applications_count(sender, instance, **kwargs):
+    JobPosting.objects.filter(pk=instance.job_id, applications_count__gt=0).update(
+        applications_count=F('applications_count') - 1
+    )
+    invalidate(JobPosting, [instance.job_id])
+
+
+@receiver([post_save, post_delete], sender=JobApplication)
+def touch_job_applications(sender, instance, **kwargs):
+    # Las aplicaciones no usan el caché de representaciones, pero sí la versión del listado
+    touch(JobApplication)
+
+
+@receiver(post_save, sender=JobApplication)
+def publish_application_event(sender, instance, created, **kwargs):
+    event = {
+        'type': 'application.created' if created else 'application.updated',
+        'application': instance.pk,
+        'job': instance.job_id,
+        'status': instance.status,
+    }
+    transaction.on_commit(lambda: publish_application_to_users(instance.pk, event))
+
+
+def publish_application_to_users(application_id, event):
+    """Envía el evento al estudiante y a la empresa de la aplicación"""
+    users = JobApplication.objects.filter(pk=application_id).values_list(
+        'student__user_id', 'job__company__user_id'
+    ).first()
+    if users is not None:
+        publish_to_users(users, event)
+
+
+@receiver(pre_delete, sender=JobApplication)
+def flush_application_events(sender, instance, **kwargs):
+    # Los eventos en el búfer de una aplicación eliminada ya no se insertarían
+    # (ni sumarían a los acumulados): se insertan antes para que el descuento
+    # de record_removal corresponda a lo acumulado. El borrado en cascada los elimina.
+    status_writer.flush_matching(lambda event: event.application_id == instance.pk)
+
+
+@receiver(post_delete, sender=JobApplication)
+def remove_application_from_stats(sender, instance, **kwargs):
+    record_removal(instance)
+
+
+@receiver(post_delete, sender=JobApplication)
+def record_application_tombstone(sender, instance, **kwargs):
+    # Solo la ven el estudiante y la empresa del empleo
+    record_tombstone(instance, user_ids=[
+        StudentProfile.objects.filter(pk=instance.student_id).values_list('user_id', flat=True).first(),
+        JobPosting.objects.filter(pk=instance.job_id).values_list('company__user_id', flat=True).first(),
+    ])
+
+
+@receiver(post_delete, sender=JobPosting)
+def record_job_tombstone(sender, instance, **kwargs):
+    # Un empleo que no estaba activo solo lo veía su empresa
+    if instance.status == 'active':
+        record_tombstone(instance)
+    else:
+        user_id = CompanyProfile.objects.filter(pk=instance.company_id).values_list('user_id', flat=True).first()
+        record_tombstone(instance, user_ids=[user_id])
+
+
+@receiver([post_save, post_delete], sender=JobPosting)
+def invalidate_job_posting(sender, instance, **kwargs):
+    invalidate(JobPosting, [instance.pk])
+
+
+@receiver([post_save, post_delete], sender=JobPosting)
+def refresh_recommendations(sender, instance, **kwargs):
+    schedule_refresh()
+
+
+@receiver([post_save, post_delete], sender=CompanyProfile)
+def invalidate_company_job_postings(sender, instance, **kwargs):
+    # Los empleos embeben el perfil completo de la empresa
+    invalidate_queryset(JobPosting.objects.filter(company=instance))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_job_postings(sender, instance, update_fields=None, **kwargs):
+    if user_fields_changed(update_fields) and instance.user_type == 'company':
+        invalidate_queryset(JobPosting.objects.filter(company__user=instance))
@@ -0,0 +1,109 @@
+"""
+Historial de estados de las aplicaciones.
+
+Cada cambio se registra como un ``ApplicationStatusEvent`` al confirmar la
+transacción y se inserta por lotes con ``BufferedWriter`` (Sut/buffered_writes.py),
+así cambiar un estado no agrega una inserción a la petición. El historial
+de una aplicación incluye los eventos que este proceso aún no insertó; los
+de otros procesos aparecen tras APPLICATION_EVENTS_FLUSH_SECONDS.
+
+``bulk_update_status`` cambia el estado de muchas aplicaciones con un solo
+UPDATE; como ``update()`` no emite señales, registra el historial, marca la
+versión del listado y publica los eventos por su cuenta.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .analytics import apply_deltas, event_deltas
+from .models import ApplicationStatusEvent, JobApplication
+from Sut.buffered_writes import BufferedWriter
+from Sut.events import publish_to_users
+from Sut.serializer_cache import touch
+
+
+class StatusEventWriter(BufferedWriter):
+    def write(self, batch):
+        """Inserta el lote y actualiza los acumulados del embudo (jobs/analytics.py) en la misma transacción"""
+        with transaction.atomic():
+            deltas, events = event_deltas(batch)
+            super().write(events)
+            apply_deltas(deltas)
+
+
+status_writer = StatusEventWriter(
+    ApplicationStatusEvent,
+    max_size=settings.APPLICATION_EVENTS_BATCH_SIZE,
+    max_delay=settings.APPLICATION_EVENTS_FLUSH_SECONDS,
+)
+
+
+def record_status_changes(changes, changed_by=None):
+    """Registra [(application_id, from_status, to_status)] al confirmar la transacción"""
+    events = [
+        ApplicationStatusEvent(
+            application_id=application_id, from_status=from_status, to_status=to_status,
+            changed_by_id=getattr(changed_by, 'pk', None),
+        )
+        for application_id, from_status, to_status in changes
+        if from_status != to_status
+    ]
+
+    def enqueue():
+        for event in events:
+            status_writer.add(event)
+
+    if events:
+        transaction.on_commit(enqueue)
+
+
+def status_timeline(application):
+    """Eventos de la aplicación en orden cronológico, incluidos los pendientes de este proceso"""
+    events = list(application.status_events.all())
+    events.extend(event for event in status_writer.pending() if event.application_id == application.pk)
+    return sorted(events, key=lambda event: event.created_at)
+
+
+def bulk_update_status(company_user, application_ids, new_status):
+    """
+    Cambia a ``new_status`` las aplicaciones indicadas de los empleos de la
+    empresa. Devuelve las filas afectadas como [(id, job_id, updated_at)] y
+    los ids que no existen o no son de la empresa.
+    """
+    owned = JobApplication.objects.filter(pk__in=application_ids, job__company__user=company_user)
+    now = timezone.now()
+    with transaction.atomic():
+        # Una consulta valida la propiedad y trae el estado anterior para el historial;
+        # bloquear en orden de pk evita interbloqueos entre cambios masivos simultáneos
+        rows = list(owned.select_for_update(of=('self',)).order_by('pk').values_list(
+            'pk', 'status', 'job_id', 'student__user_id',
+        ))
+        changed = [row for row in rows if row[1] != new_status]
+        if changed:
+            # auto_now no aplica en update()
+            JobApplication.objects.filter(pk__in=[row[0] for row in changed]).update(status=new_status, updated_at=now)
+            record_status_changes([(pk, previous, new_status) for pk, previous, _, _ in changed], company_user)
+            touch(JobApplication)
+            transaction.on_commit(lambda: publish_status_changes(company_user.pk, changed, new_status))
+
+    found = {row[0] for row in rows}
+    return (
+        [(pk, job_id, now) for pk, _, job_id, _ in changed],
+        [pk for pk in dict.fromkeys(application_ids) if pk not in found],
+    )
+
+
+def publish_status_changes(company_user_id, changed, new_status):
+    """Un evento por aplicación para cada estudiante y uno por empleo para la empresa"""
+    by_job = defaultdict(list)
+    for pk, _, job_id, student_user_id in changed:
+        by_job[job_id].append(pk)
+        publish_to_users([student_user_id], {
+            'type': 'application.updated', 'application': pk, 'job': job_id, 'status': new_status,
+        })
+    for job_id, applications in by_job.items():
+        publish_to_users([company_user_id], {
+            'type': 'application.updated', 'applications': applications, 'job': job_id, 'status': new_status,
+        })
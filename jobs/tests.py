@@ -1,3 +1,804 @@
-from django.test import TestCase
+import csv
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import ApplicationStatusEvent, JobPosting, JobApplication
+from .analytics import apply_deltas as real_apply_deltas
+from .recommendations import build_index, refresh_index
+from .search import search_backend, tsquery_text
+from .status_log import status_writer
+from companies.models import CompanyProfile
+from posts.models import Post
+from Sut.hot_queries import autodiscover
+from Sut.serializer_cache import check_serializer_cache
+from students.models import User, StudentProfile
+
+
+def create_company(email, name='Acme'):
+    user = User.objects.create_user(email, 'password123', user_type='company')
+    return CompanyProfile.objects.create(
+        user=user, company_name=name, industry='tech',
+        description='Empresa', address='Calle 1',
+    )
+
+
+def create_student(email):
+    user = User.objects.create_user(email, 'password123', user_type='student')
+    return StudentProfile.objects.create(
+        user=user, university='UNAM', career='Ingeniería', semester=6, graduation_year=2027,
+    )
+
+
+def create_job(company, **kwargs):
+    fields = {
+        'title': 'Backend Developer', 'description': 'Desarrollo de APIs',
+        'requirements': 'Python, Django', 'responsibilities': 'Mantener servicios',
+        'location': 'CDMX', 'job_type': 'full_time',
+    }
+    fields.update(kwargs)
+    return JobPosting.objects.create(company=company, **fields)
+
+
+class QueryCountTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.client = APIClient()
+
+    def populate(self, jobs, students):
+        for _ in range(jobs):
+            job = create_job(self.company)
+            for _ in range(students):
+                student = create_student(f'student-{StudentProfile.objects.count()}@example.com')
+                JobApplication.objects.create(student=student, job=job)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, user_getter):
+        self.populate(1, 1)
+        self.client.force_authenticate(user_getter())
+        small = self.count_queries(url)
+        self.populate(4, 3)
+        large = self.count_queries(url)
+        self.assertEqual(small, large)
+
+    def test_job_postings_list(self):
+        self.assertConstantQueries('/api/jobs/postings/', lambda: self.company.user)
+
+    def test_job_applications_list(self):
+        self.assertConstantQueries('/api/jobs/applications/', lambda: self.company.user)
+
+    def test_job_posting_applications_action(self):
+        job = create_job(self.company, title='Target')
+        self.client.force_authenticate(self.company.user)
+        url = f'/api/jobs/postings/{job.id}/applications/'
+        student = create_student('first@example.com')
+        JobApplication.objects.create(student=student, job=job)
+        small = self.count_queries(url)
+        for i in range(5):
+            JobApplication.objects.create(student=create_student(f'other-{i}@example.com'), job=job)
+        self.assertEqual(self.count_queries(url), small)
+
+    def test_job_posting_applications_action_is_paginated(self):
+        job = create_job(self.company, title='Target')
+        for i in range(3):
+            JobApplication.objects.create(student=create_student(f'student-{i}@example.com'), job=job)
+        self.client.force_authenticate(self.company.user)
+        url = f'/api/jobs/postings/{job.id}/applications/'
+
+        first = self.client.get(url, {'page_size': 2, 'fields': 'id,status'}).data
+        self.assertEqual(len(first['results']), 2)
+        self.assertEqual(set(first['results'][0]), {'id', 'status'})
+        second = self.client.get(first['next']).data
+        self.assertIsNone(second['next'])
+        ids = [item['id'] for item in first['results'] + second['results']]
+        self.assertCountEqual(ids, job.applications.values_list('pk', flat=True))
+
+
+class ApplicationsCountTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.job = create_job(self.company)
+
+    def test_counter_follows_creates_and_deletes(self):
+        first = JobApplication.objects.create(student=create_student('a@example.com'), job=self.job)
+        JobApplication.objects.create(student=create_student('b@example.com'), job=self.job)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 2)
+
+        first.delete()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+
+    def test_recount_command_fixes_drift(self):
+        JobApplication.objects.create(student=create_student('a@example.com'), job=self.job)
+        JobPosting.objects.filter(pk=self.job.pk).update(applications_count=7)
+
+        call_command('recount_applications', stdout=StringIO())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, 1)
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com', name='Globex')
+        self.backend = create_job(self.company, title='Backend Developer', requirements='Python, Django')
+        self.designer = create_job(
+            self.company, title='Diseñador UX', description='Diseño de interfaces',
+            requirements='Figma', job_type='internship', location='Monterrey',
+        )
+        self.client = APIClient()
+
+    def search(self, **params):
+        response = self.client.get('/api/jobs/postings/', params)
+        self.assertEqual(response.status_code, 200)
+        return [job['id'] for job in response.data['results']]
+
+    def test_text_search_covers_requirements_and_company(self):
+        self.assertEqual(self.search(q='django'), [self.backend.id])
+        self.assertEqual(self.search(q='disenador'), [self.designer.id])
+        self.assertCountEqual(self.search(q='globex'), [self.backend.id, self.designer.id])
+
+    def test_company_rename_is_searchable(self):
+        self.company.company_name = 'Initech'
+        self.company.save()
+        self.assertCountEqual(self.search(q='initech'), [self.backend.id, self.designer.id])
+        self.assertEqual(self.search(q='globex'), [])
+
+    def test_filters(self):
+        self.assertEqual(self.search(job_type='internship'), [self.designer.id])
+        self.assertEqual(self.search(location='monterrey'), [self.designer.id])
+        self.assertEqual(self.search(q='python', job_type='internship'), [])
+
+    def test_invalid_filter_value(self):
+        response = self.client.get('/api/jobs/postings/', {'salary_min': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_postgres_query_uses_prefix_terms(self):
+        # Las comillas y operadores del texto nunca llegan a to_tsquery
+        self.assertEqual(tsquery_text("diseñador  UX'; & !"), 'diseñador:* & UX:*')
+        self.assertEqual(tsquery_text('&|!'), '')
+
+    async def test_first_search_in_async_view(self):
+        # Como en un proceso nuevo: search_backend aún no consultó la base de datos
+        search_backend.cache_clear()
+        response = await self.async_client.get('/api/jobs/postings/', {'q': 'disenador'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['id'] for job in response.json()['results']], [self.designer.id])
+
+
+class HotQueryPlanTests(TestCase):
+    def setUp(self):
+        # Con max_rows=0 cualquier recorrido secuencial de una tabla con filas falla
+        company = create_company('company@example.com')
+        job = create_job(company)
+        JobApplication.objects.create(student=create_student('student@example.com'), job=job)
+        Post.objects.create(user=company.user, content='Hola')
+
+    def test_hot_queries_avoid_sequential_scans(self):
+        out = StringIO()
+        call_command('explain_hot_queries', max_rows=0, stdout=out)
+        self.assertNotIn('FAIL', out.getvalue())
+        for name in autodiscover():
+            self.assertIn(f' {name}', out.getvalue())
+
+    def test_reports_sequential_scans(self):
+        with mock.patch.dict('Sut.hot_queries.registry', {
+            'jobs.unindexed': lambda: JobPosting.objects.filter(title='Backend Developer'),
+        }):
+            out = StringIO()
+            with self.assertRaisesMessage(CommandError, 'jobs.unindexed: recorrido secuencial sobre jobs_jobposting (1 filas)'):
+                call_command('explain_hot_queries', max_rows=0, stdout=out)
+        self.assertIn('FAIL jobs.unindexed', out.getvalue())
+
+
+# LocMemCache basta dentro del proceso de las pruebas
+@override_settings(SERIALIZER_CACHE_ENABLED=True)
+class SerializerCacheTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com', name='Globex')
+        self.job = create_job(self.company)
+        self.client = APIClient()
+
+    def get_job(self):
+        response = self.client.get(f'/api/jobs/postings/{self.job.id}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_company_change_invalidates_embedded_job(self):
+        self.assertEqual(self.get_job()['company']['company_name'], 'Globex')
+        self.company.company_name = 'Initech'
+        self.company.save()
+        self.assertEqual(self.get_job()['company']['company_name'], 'Initech')
+
+    def test_new_application_invalidates_count(self):
+        self.assertEqual(self.get_job()['applications_count'], 0)
+        JobApplication.objects.create(student=create_student('a@example.com'), job=self.job)
+        self.assertEqual(self.get_job()['applications_count'], 1)
+
+    def test_count_update_without_invalidation_misses_cache(self):
+        # Otro proceso con su propia caché no recibe la invalidación; el sello sí cambia
+        self.assertEqual(self.get_job()['applications_count'], 0)
+        JobPosting.objects.filter(pk=self.job.pk).update(applications_count=F('applications_count') + 1)
+        self.assertEqual(self.get_job()['applications_count'], 1)
+
+    def test_per_process_cache_is_rejected(self):
+        self.assertEqual([error.id for error in check_serializer_cache(None)], ['Sut.E001'])
+        with override_settings(SERIALIZER_CACHE_ENABLED=False):
+            self.assertEqual(check_serializer_cache(None), [])
+        with override_settings(CACHES={**settings.CACHES, 'serializers': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tempfile.gettempdir(),
+        }}):
+            self.assertEqual(check_serializer_cache(None), [])
+
+
+class ApplicationExportTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.job = create_job(self.company)
+        for i in range(3):
+            JobApplication.objects.create(student=create_student(f's{i}@example.com'), job=self.job)
+        self.client = APIClient()
+        self.client.force_authenticate(self.company.user)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export_for_job(self):
+        body = self.read(self.client.get(f'/api/jobs/postings/{self.job.id}/applications/export/'))
+        lines = body.strip().splitlines()
+        self.assertTrue(lines[0].startswith('id,status,applied_at'))
+        self.assertEqual(len(lines), 4)
+
+    def test_csv_export_escapes_formulas(self):
+        application = JobApplication.objects.first()
+        application.cover_letter = '=HYPERLINK("http://example.com")'
+        application.notes = '-2+3'
+        application.save()
+        student = application.student
+        student.skills = '@SUM(A1)'
+        student.save()
+
+        body = self.read(self.client.get(f'/api/jobs/postings/{self.job.id}/applications/export/'))
+        row = next(row for row in csv.DictReader(StringIO(body)) if row['id'] == str(application.id))
+        self.assertEqual(row['cover_letter'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row['notes'], "'-2+3")
+        self.assertEqual(row['skills'], "'@SUM(A1)")
+        self.assertEqual(row['semester'], '6')
+
+        # NDJSON conserva los valores originales
+        body = self.read(self.client.get(f'/api/jobs/postings/{self.job.id}/applications/export/', {'output': 'ndjson'}))
+        rows = {row['id']: row for row in map(json.loads, body.splitlines())}
+        self.assertEqual(rows[application.id]['notes'], '-2+3')
+
+    def test_ndjson_export_with_updated_since(self):
+        latest = JobApplication.objects.order_by('-updated_at').first()
+        body = self.read(self.client.get('/api/jobs/applications/export/', {
+            'output': 'ndjson', 'updated_since': latest.updated_at.isoformat(),
+        }))
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [latest.id])
+        self.assertEqual(rows[0]['email'], latest.student.user.email)
+
+    def test_export_requires_job_owner(self):
+        self.client.force_authenticate(create_student('outsider@example.com').user)
+        response = self.client.get(f'/api/jobs/postings/{self.job.id}/applications/export/')
+        self.assertEqual(response.status_code, 403)
+
+
+class BulkImportTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.company.user)
+        self.row = {
+            'title': 'QA Engineer', 'description': 'Pruebas', 'requirements': 'Selenium',
+            'responsibilities': 'Automatizar', 'location': 'CDMX', 'job_type': 'contract',
+        }
+
+    def test_json_array_reports_row_errors(self):
+        rows = [self.row, dict(self.row, job_type='freelance'), dict(self.row, salary_min='10', salary_max='5')]
+        response = self.client.post('/api/jobs/postings/bulk/', rows, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([error['row'] for error in response.data['errors']], [1, 2])
+        self.assertEqual(JobPosting.objects.filter(company=self.company).count(), 1)
+
+    def test_csv_upload(self):
+        header = ','.join(list(self.row) + ['salary_min', 'deadline'])
+        line = ','.join(list(self.row.values()) + ['', '2030-01-31'])
+        upload = SimpleUploadedFile('jobs.csv', f'{header}\n{line}\n{line}\n'.encode('utf-8'), content_type='text/csv')
+        response = self.client.post('/api/jobs/postings/bulk/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+        job = JobPosting.objects.get(pk=response.data['ids'][0])
+        self.assertIsNone(job.salary_min)
+        self.assertEqual(job.status, 'active')
+
+    def test_malformed_csv_is_rejected(self):
+        header = ','.join(self.row)
+        for content in (f'{header}\nDiseñador\n'.encode('latin-1'), f'{header}\nQA\0\n'.encode('utf-8')):
+            upload = SimpleUploadedFile('jobs.csv', content, content_type='text/csv')
+            response = self.client.post('/api/jobs/postings/bulk/', {'file': upload}, format='multipart')
+            self.assertEqual(response.status_code, 400)
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_students_cannot_import(self):
+        self.client.force_authenticate(create_student('s@example.com').user)
+        response = self.client.post('/api/jobs/postings/bulk/', [self.row], format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class IncrementalSyncTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.kept = create_job(self.company, title='Kept')
+        self.edited = create_job(self.company, title='Edited')
+        self.closed = create_job(self.company, title='Closed')
+        self.removed = create_job(self.company, title='Removed')
+        self.client = APIClient()
+
+    def test_delta_lists_changes_and_tombstones(self):
+        since = timezone.now()
+        self.edited.title = 'Edited again'
+        self.edited.save()
+        self.closed.status = 'closed'
+        self.closed.save()
+        removed_id = self.removed.id
+        self.removed.delete()
+
+        response = self.client.get('/api/jobs/postings/', {'updated_since': since.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job['title'] for job in response.data['results']], ['Edited again'])
+        self.assertEqual(response.data['deleted'], sorted([self.closed.id, removed_id]))
+        self.assertFalse(response.data['truncated'])
+        self.assertIn('synced_at', response.data)
+
+        response = self.client.get('/api/jobs/postings/', {'updated_since': 'ayer'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_conditional_list_responses(self):
+        response = self.client.get('/api/jobs/postings/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/jobs/postings/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # Un cambio en un objeto anidado también cambia el ETag
+        self.company.company_name = 'Initech'
+        self.company.save()
+        response = self.client.get('/api/jobs/postings/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        # Un cambio escrito por otro proceso, con su propia caché, también lo cambia
+        etag = response['ETag']
+        with mock.patch('Sut.serializer_cache.get_cache', return_value=DummyCache('', {})):
+            self.company.company_name = 'Umbrella'
+            self.company.save()
+        self.assertEqual(self.client.get('/api/jobs/postings/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        self.client.force_authenticate(self.company.user)
+        response = self.client.get('/api/jobs/applications/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/jobs/applications/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        JobApplication.objects.create(student=create_student('a@example.com'), job=self.kept)
+        self.assertEqual(self.client.get('/api/jobs/applications/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_validators_only_read_the_page(self):
+        self.client.force_authenticate(self.company.user)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/jobs/applications/')
+        self.assertFalse([query for query in queries if 'MAX(' in query['sql'] or 'COUNT(' in query['sql']])
+
+    def test_tombstones_only_reach_users_who_saw_the_object(self):
+        student = create_student('student@example.com')
+        other = create_student('other@example.com')
+        application = JobApplication.objects.create(student=student, job=self.kept)
+        draft = create_job(self.company, title='Draft', status='draft')
+        since = timezone.now()
+        application_id, draft_id = application.id, draft.id
+        application.delete()
+        draft.delete()
+
+        def deleted(user, url):
+            self.client.force_authenticate(user)
+            return self.client.get(url, {'updated_since': since.isoformat()}).data['deleted']
+
+        self.assertEqual(deleted(student.user, '/api/jobs/applications/'), [application_id])
+        self.assertEqual(deleted(self.company.user, '/api/jobs/applications/'), [application_id])
+        self.assertEqual(deleted(other.user, '/api/jobs/applications/'), [])
+        self.assertEqual(deleted(self.company.user, '/api/jobs/postings/'), [draft_id])
+        self.assertEqual(deleted(other.user, '/api/jobs/postings/'), [])
+
+
+class ApplicationEventTests(TestCase):
+    def test_status_change_is_pushed_to_student_and_company(self):
+        company = create_company('company@example.com')
+        student = create_student('student@example.com')
+        job = create_job(company)
+        # Inserta en la transacción de la prueba el historial que quede en el búfer
+        self.addCleanup(status_writer.flush)
+
+        with mock.patch('jobs.signals.publish_to_users') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                application = JobApplication.objects.create(student=student, job=job)
+            client = APIClient()
+            client.force_authenticate(company.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                client.patch(f'/api/jobs/applications/{application.id}/update_status/', {'status': 'interview'})
+
+        self.assertEqual([call.args[1]['type'] for call in publish.call_args_list], [
+            'application.created', 'application.updated',
+        ])
+        users, event = publish.call_args.args
+        self.assertCountEqual(users, [student.user_id, company.user_id])
+        self.assertEqual(event['status'], 'interview')
+
+
+class StatusHistoryTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.student = create_student('student@example.com')
+        self.job = create_job(self.company)
+        self.addCleanup(status_writer.flush)
+
+    def test_status_changes_are_buffered_and_listed(self):
+        client = APIClient()
+        client.force_authenticate(self.student.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            application_id = client.post('/api/jobs/applications/', {'job_id': self.job.id}).data['id']
+        client.force_authenticate(self.company.user)
+        for new_status in ('reviewing', 'reviewing', 'interview'):
+            with self.captureOnCommitCallbacks(execute=True):
+                client.patch(f'/api/jobs/applications/{application_id}/update_status/', {'status': new_status})
+
+        # Aún no se insertan, pero el historial ya los incluye
+        self.assertFalse(ApplicationStatusEvent.objects.exists())
+        client.force_authenticate(self.student.user)
+        timeline = client.get(f'/api/jobs/applications/{application_id}/timeline/').data
+        self.assertEqual([(event['from_status'], event['to_status']) for event in timeline], [
+            ('', 'pending'), ('pending', 'reviewing'), ('reviewing', 'interview'),
+        ])
+        self.assertEqual(timeline[-1]['changed_by'], self.company.user_id)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(status_writer.flush(), 3)
+        self.assertEqual(
+            [query['sql'].split()[0] for query in queries if 'INTO "jobs_applicationstatusevent"' in query['sql']],
+            ['INSERT'],
+        )
+        self.assertEqual(client.get(f'/api/jobs/applications/{application_id}/timeline/').data, [
+            {**event, 'id': event_id}
+            for event, event_id in zip(timeline, ApplicationStatusEvent.objects.values_list('id', flat=True))
+        ])
+
+        client.force_authenticate(create_student('other@example.com').user)
+        self.assertEqual(client.get(f'/api/jobs/applications/{application_id}/timeline/').status_code, 404)
+
+    def test_writer_flushes_when_full(self):
+        application = JobApplication.objects.create(student=self.student, job=self.job)
+        with mock.patch.object(status_writer, 'max_size', 2):
+            status_writer.add(ApplicationStatusEvent(application=application, to_status='pending'))
+            self.assertFalse(ApplicationStatusEvent.objects.exists())
+            status_writer.add(ApplicationStatusEvent(application=application, from_status='pending', to_status='rejected'))
+        self.assertEqual(ApplicationStatusEvent.objects.count(), 2)
+        self.assertEqual(status_writer.pending(), [])
+
+    def test_failed_batch_is_retried_row_by_row(self):
+        application = JobApplication.objects.create(student=self.student, job=self.job)
+
+        def apply_deltas(deltas):
+            if any(status == 'broken' for _, _, status in deltas):
+                raise ValueError('broken')
+            return real_apply_deltas(deltas)
+
+        status_writer.add(ApplicationStatusEvent(application=application, to_status='pending'))
+        status_writer.add(ApplicationStatusEvent(application=application, from_status='pending', to_status='broken'))
+        status_writer.add(ApplicationStatusEvent(application=application, from_status='pending', to_status='interview'))
+        with mock.patch('jobs.status_log.apply_deltas', side_effect=apply_deltas), self.assertLogs('Sut.buffered_writes'):
+            self.assertEqual(status_writer.flush(), 3)
+        self.assertEqual(
+            list(ApplicationStatusEvent.objects.order_by('id').values_list('to_status', flat=True)), ['pending', 'interview'],
+        )
+
+    def test_generic_update_cannot_change_status(self):
+        application = JobApplication.objects.create(student=self.student, job=self.job)
+        client = APIClient()
+        client.force_authenticate(self.company.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(f'/api/jobs/applications/{application.id}/', {'status': 'accepted'})
+        self.assertEqual(response.status_code, 200)
+        application.refresh_from_db()
+        self.assertEqual(application.status, 'pending')
+        self.assertEqual(status_writer.pending(), [])
+
+
+class BulkStatusUpdateTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        jobs = [create_job(self.company), create_job(self.company, title='Frontend Developer')]
+        self.applications = [
+            JobApplication.objects.create(student=create_student(f'student{i}@example.com'), job=jobs[i % 2])
+            for i in range(4)
+        ]
+        JobApplication.objects.filter(pk=self.applications[3].pk).update(status='rejected')
+        other = JobApplication.objects.create(
+            student=create_student('other@example.com'), job=create_job(create_company('other-co@example.com', 'Otra')),
+        )
+        self.ids = [application.pk for application in self.applications] + [other.pk, 999999]
+        self.client = APIClient()
+        self.client.force_authenticate(self.company.user)
+        self.addCleanup(status_writer.flush)
+
+    def test_rejects_owned_applications_in_one_update(self):
+        with mock.patch('jobs.status_log.publish_to_users') as publish:
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    '/api/jobs/applications/bulk_update_status/', {'ids': self.ids, 'status': 'rejected'}, format='json',
+                )
+        self.assertEqual(response.status_code, 200)
+        changed = [application.pk for application in self.applications[:3]]
+        self.assertEqual([row['id'] for row in response.data['results']], changed)
+        self.assertEqual(response.data['not_found'], self.ids[4:])
+
+        application_queries = [query['sql'] for query in queries if 'jobs_jobapplication' in query['sql']]
+        self.assertEqual([sql.split()[0] for sql in application_queries], ['SELECT', 'UPDATE'])
+        self.assertEqual(JobApplication.objects.filter(status='rejected').count(), 4)
+        self.assertTrue(JobApplication.objects.get(pk=changed[0]).updated_at > self.applications[0].updated_at)
+
+        status_writer.flush()
+        self.assertEqual(
+            sorted(ApplicationStatusEvent.objects.values_list('application_id', 'from_status', 'to_status')),
+            [(pk, 'pending', 'rejected') for pk in changed],
+        )
+        # Tres estudiantes y un evento por empleo para la empresa
+        company_events = [call.args[1] for call in publish.call_args_list if call.args[0] == [self.company.user_id]]
+        self.assertEqual(publish.call_count, 5)
+        self.assertCountEqual([event['applications'] for event in company_events], [changed[0::2], changed[1:2]])
+
+    def test_requires_company_and_valid_payload(self):
+        self.assertEqual(self.client.post(
+            '/api/jobs/applications/bulk_update_status/', {'ids': [], 'status': 'rejected'}, format='json',
+        ).status_code, 400)
+        self.client.force_authenticate(self.applications[0].student.user)
+        self.assertEqual(self.client.post(
+            '/api/jobs/applications/bulk_update_status/', {'ids': self.ids, 'status': 'accepted'}, format='json',
+        ).status_code, 403)
+
+
+class FunnelAnalyticsTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.job = create_job(self.company)
+        self.students = [create_student(f'student{i}@example.com') for i in range(3)]
+        self.client = APIClient()
+        self.addCleanup(status_writer.flush)
+
+        for student in self.students:
+            self.client.force_authenticate(student.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post('/api/jobs/applications/', {'job_id': self.job.id})
+        self.applications = list(JobApplication.objects.order_by('pk'))
+        self.client.force_authenticate(self.company.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/jobs/applications/{self.applications[0].id}/update_status/', {'status': 'interview'})
+            self.client.post('/api/jobs/applications/bulk_update_status/', {
+                'ids': [application.id for application in self.applications], 'status': 'rejected',
+            }, format='json')
+        status_writer.flush()
+
+    def report(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/jobs/postings/analytics/', params)
+        # Solo se leen los acumulados, nunca la tabla de aplicaciones
+        self.assertFalse([query for query in queries if 'jobs_jobapplication' in query['sql']])
+        return response
+
+    def test_funnel_from_rollups(self):
+        response = self.report()
+        self.assertEqual(response.status_code, 200)
+        totals = response.data['totals']
+        self.assertEqual(totals['created'], 3)
+        self.assertEqual(totals['entered'], {'pending': 3, 'interview': 1, 'rejected': 3})
+        self.assertEqual(totals['current'], {'pending': 0, 'interview': 0, 'rejected': 3})
+        self.assertEqual(totals['first_response']['count'], 3)
+        self.assertEqual(response.data['by_day'], [
+            {'day': timezone.localdate(), 'created': 3, 'entered': {'interview': 1, 'pending': 3, 'rejected': 3}},
+        ])
+        self.assertEqual(response.data['by_job'][0]['job'], self.job.id)
+
+        # Lo acumulado de forma incremental coincide con la reconstrucción
+        call_command('backfill_application_stats', stdout=StringIO())
+        self.assertEqual(self.report().data, response.data)
+
+        self.client.force_authenticate(self.students[0].user)
+        self.client.delete(f'/api/jobs/applications/{self.applications[0].id}/')
+        self.client.force_authenticate(self.company.user)
+        self.assertEqual(self.report().data['totals']['current']['rejected'], 2)
+
+    def test_removing_application_with_buffered_events(self):
+        student = create_student('late@example.com')
+        self.client.force_authenticate(student.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            application_id = self.client.post('/api/jobs/applications/', {'job_id': self.job.id}).data['id']
+        self.assertEqual(len(status_writer.pending()), 1)
+
+        self.client.delete(f'/api/jobs/applications/{application_id}/')
+        self.assertEqual(status_writer.pending(), [])
+        self.assertFalse(ApplicationStatusEvent.objects.filter(application_id=application_id).exists())
+        self.client.force_authenticate(self.company.user)
+        totals = self.report().data['totals']
+        self.assertEqual((totals['created'], totals['current']['pending']), (4, 0))
+
+    def test_range_and_permissions(self):
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        self.assertEqual(self.report(since=tomorrow.isoformat()).status_code, 400)
+        self.assertEqual(self.report(since='ayer').status_code, 400)
+        self.assertEqual(self.report(until='2024-02-30').data, {'until': 'Debe ser una fecha válida con el formato AAAA-MM-DD'})
+        self.assertEqual(self.report(job='abc').data, {'job': 'Debe ser un entero'})
+        self.assertEqual(self.report(since='2020-01-01', until='2022-01-01').status_code, 400)
+        self.assertEqual(self.report(since=tomorrow.isoformat(), until=tomorrow.isoformat()).data['totals']['created'], 0)
+
+        self.client.force_authenticate(self.students[0].user)
+        self.assertEqual(self.client.get('/api/jobs/postings/analytics/').status_code, 403)
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        index_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(index_dir.cleanup)
+        self.enterContext(override_settings(RECOMMENDATIONS_INDEX_DIR=index_dir.name))
+
+        self.company = create_company('company@example.com')
+        self.backend = create_job(self.company, title='Backend', requirements='Python, Django y PostgreSQL')
+        self.data = create_job(self.company, title='Datos', requirements='Python, pandas, SQL')
+        self.frontend = create_job(self.company, title='Frontend', requirements='React, JavaScript, CSS')
+        create_job(self.company, title='Cerrado', requirements='Python, Django', status='closed')
+        self.student = create_student('student@example.com')
+        self.student.skills = 'Python, Django, Docker'
+        self.student.save()
+        self.client = APIClient()
+
+    def test_ranks_active_jobs_by_similarity(self):
+        self.client.force_authenticate(self.student.user)
+        # Sin índice la petición no lo construye: responde vacío y encola la construcción
+        with mock.patch('jobs.recommendations.submit_refresh') as submit_refresh:
+            response = self.client.get('/api/jobs/postings/recommended/')
+        self.assertEqual((response.status_code, response.data), (200, []))
+        submit_refresh.assert_called_once_with()
+
+        build_index()
+        response = self.client.get('/api/jobs/postings/recommended/')
+        self.assertEqual([job['id'] for job in response.data], [self.backend.id, self.data.id])
+        self.assertTrue(1 >= response.data[0]['match_score'] > response.data[1]['match_score'] > 0)
+
+        JobApplication.objects.create(student=self.student, job=self.backend)
+        response = self.client.get('/api/jobs/postings/recommended/')
+        self.assertEqual([job['id'] for job in response.data], [self.data.id])
+
+        self.client.force_authenticate(self.company.user)
+        self.assertEqual(self.client.get('/api/jobs/postings/recommended/').status_code, 403)
+
+    def test_incremental_refresh_matches_full_build(self):
+        build_index()
+        self.frontend.requirements = 'Python, Django, React'
+        self.frontend.save()
+        self.data.status = 'closed'
+        self.data.save()
+        self.backend.delete()
+        create_job(self.company, title='Nuevo', requirements='Docker, Kubernetes')
+
+        incremental = refresh_index()
+        full = build_index()
+        self.assertCountEqual(incremental.job_ids, full.job_ids)
+        scores = lambda index: dict(zip(index.job_ids.tolist(), index.scores(self.student.skills)))
+        incremental_scores, full_scores = scores(incremental), scores(full)
+        for job_id, score in full_scores.items():
+            self.assertAlmostEqual(incremental_scores[job_id], score, places=5)
+
+
+class ApplicantRankingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        index_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(index_dir.cleanup)
+        self.enterContext(override_settings(RECOMMENDATIONS_INDEX_DIR=index_dir.name))
+
+        self.company = create_company('company@example.com')
+        self.job = create_job(self.company, requirements='Python, Django, PostgreSQL')
+        self.applications = {}
+        for name, skills in [('fit', 'Python, Django, PostgreSQL'), ('partial', 'Python'), ('none', 'Photoshop')]:
+            student = create_student(f'{name}@example.com')
+            student.skills = skills
+            student.save()
+            self.applications[name] = JobApplication.objects.create(student=student, job=self.job)
+        self.client = APIClient()
+        self.client.force_authenticate(self.company.user)
+        self.url = f'/api/jobs/postings/{self.job.id}/applications/'
+
+    def ranked_ids(self, **params):
+        response = self.client.get(self.url, {'ordering': 'score', **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.data['results']], response.data
+
+    def test_orders_by_score_with_pagination_and_cache(self):
+        ids, data = self.ranked_ids()
+        self.assertEqual(ids, [self.applications[name].id for name in ('fit', 'partial', 'none')])
+        self.assertEqual(data['count'], 3)
+        self.assertGreater(data['results'][0]['score'], data['results'][1]['score'])
+
+        with mock.patch('jobs.ranking.score_applications') as score:
+            self.assertEqual(self.ranked_ids(page_size=2)[0], ids[:2])
+        score.assert_not_called()
+
+        # Solo se vuelve a puntuar al candidato cuyo perfil cambió
+        student = self.applications['none'].student
+        student.skills = 'Python, Django, PostgreSQL, Docker'
+        student.save()
+        ids, _ = self.ranked_ids()
+        self.assertEqual(ids[-1], self.applications['partial'].id)
+
+        # Sin ordering=score las aplicaciones se paginan por fecha
+        self.assertNotIn('score', self.client.get(self.url).data['results'][0])
+
+
+class FieldSelectionTests(TestCase):
+    def setUp(self):
+        self.company = create_company('company@example.com')
+        self.job = create_job(self.company)
+        for index in range(3):
+            JobApplication.objects.create(student=create_student(f'student-{index}@example.com'), job=self.job)
+        self.client = APIClient()
+        self.client.force_authenticate(self.company.user)
+
+    def test_applications_are_keyset_paginated(self):
+        response = self.client.get('/api/jobs/applications/', {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        ids = [item['id'] for item in response.data['results']]
+        response = self.client.get(response.data['next'])
+        ids += [item['id'] for item in response.data['results']]
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(ids, list(JobApplication.objects.order_by('-applied_at', '-pk').values_list('id', flat=True)))
+
+    def test_sparse_fields_and_expand(self):
+        response = self.client.get('/api/jobs/applications/', {'fields': 'id,status,job.title,job.company.company_name'})
+        item = response.data['results'][0]
+        self.assertEqual(set(item), {'id', 'status', 'job'})
+        self.assertEqual(item['job'], {'title': self.job.title, 'company': {'company_name': 'Acme'}})
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/jobs/applications/', {'fields': 'id,job,student', 'expand': ''})
+        self.assertEqual(response.data['results'][0]['job'], self.job.id)
+        self.assertIsInstance(response.data['results'][0]['student'], int)
+        # Los objetos anidados no pedidos tampoco se consultan
+        loaded = [
+            query for query in context.captured_queries
+            if '"jobs_jobposting"."title"' in query['sql'] or '"students_studentprofile"."skills"' in query['sql']
+        ]
+        self.assertFalse(loaded)
+
+        response = self.client.get('/api/jobs/postings/', {'fields': 'id,title,company.company_name'})
+        self.assertEqual(response.data['results'][0], {
+            'id': self.job.id, 'title': self.job.title, 'company': {'company_name': 'Acme'},
+        })
+        response = self.client.get('/api/jobs/postings/', {'expand': ''})
+        self.assertEqual(response.data['results'][0]['company'], self.company.id)
+        self.assertIn('description', response.data['results'][0])
@@ -1,11 +1,24 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import JobPostingViewSet, JobApplicationViewSet
+from .views import JobPostingViewSet, JobApplicationViewSet, job_posting_detail, job_posting_list
+from Sut.async_api import get_or_delegate
 
 router = DefaultRouter()
 router.register(r'postings', JobPostingViewSet, basename='job-posting')
 router.register(r'applications', JobApplicationViewSet, basename='job-application')
 
 urlpatterns = [
+    path(
+        'postings/',
+        get_or_delegate(job_posting_list, JobPostingViewSet.as_view({'get': 'list', 'post': 'create'})),
+        name='job-posting-list',
+    ),
+    path(
+        'postings/<int:pk>/',
+        get_or_delegate(job_posting_detail, JobPostingViewSet.as_view({
+            'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+        })),
+        name='job-posting-detail',
+    ),
     path('', include(router.urls)),
 ]
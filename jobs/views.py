@@ -1,65 +1,236 @@
+from asgiref.sync import sync_to_async
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.parsers import MultiPartParser, FormParser
 from .models import JobPosting, JobApplication
-from .serializers import JobPostingSerializer, JobApplicationSerializer
+from .serializers import (
+    ApplicationStatusEventSerializer, BulkStatusUpdateSerializer, JobApplicationSerializer, JobPostingSerializer,
+)
+from .analytics import funnel_report, report_range
+from .filters import JobPostingSearchFilter
+from .exports import export_response
+from .imports import ImportFormatError, import_job_postings, read_rows
+from .pagination import ApplicantRankingPagination, JobPostingPagination
+from .ranking import rank_applications
+from .recommendations import recommend_jobs
+from .status_log import bulk_update_status, record_status_changes, status_timeline
+from Sut.async_api import async_read_view
+from Sut.db_routers import ReplicaReadsMixin
+from Sut.fields import FieldSelection
+from Sut.pagination import KeysetPagination
+from Sut.renderers import FastJSONParser
+from Sut.sync import (
+    SyncListMixin, delta_validators, not_modified, parse_updated_since, set_validators,
+)
+from companies.models import CompanyProfile
+from students.models import StudentProfile
+from students.auth import get_principal
 
 
-class JobPostingViewSet(viewsets.ModelViewSet):
+POPULAR_JOBS_LIMIT = 20
+RECOMMENDED_JOBS_LIMIT = 20
+MAX_RECOMMENDED_JOBS_LIMIT = 50
+
+
+class JobPostingViewSet(ReplicaReadsMixin, SyncListMixin, viewsets.ModelViewSet):
     queryset = JobPosting.objects.filter(status='active')
+    replica_actions = ('list', 'retrieve', 'popular')
+    sync_models = (JobPosting,)
     serializer_class = JobPostingSerializer
+    filter_backends = [JobPostingSearchFilter]
+    pagination_class = JobPostingPagination
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'popular']:
             return [AllowAny()]
         return [IsAuthenticated()]
 
     def get_queryset(self):
-        queryset = JobPosting.objects.all()
+        queryset = JobPosting.objects.with_related(FieldSelection.from_request(self.request))
 
         if self.request.user.is_authenticated and self.request.user.user_type == 'company':
             return queryset.filter(company__user=self.request.user)
 
         return queryset.filter(status='active')
 
+    def get_sync_removed(self, since):
+        if self.request.user.is_authenticated and self.request.user.user_type == 'company':
+            return []
+        return JobPosting.objects.inactive_since(since)
+
     def perform_create(self, serializer):
-        if hasattr(self.request.user, 'company_profile'):
-            serializer.save(company=self.request.user.company_profile)
+        principal = get_principal(self.request.user)
+        if principal.is_company:
+            serializer.save(company_id=principal.profile_id)
         else:
             raise PermissionError("Only companies can create job postings")
 
+    @action(detail=False, methods=['post'], url_path='bulk', parser_classes=[FastJSONParser, MultiPartParser, FormParser])
+    def bulk_create(self, request):
+        """Crea muchos empleos desde un arreglo JSON o un archivo CSV/JSON en el campo 'file'"""
+        principal = get_principal(request.user)
+        if not principal.is_company:
+            return Response({'error': 'Only companies can create job postings'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            upload = request.FILES.get('file')
+            rows = read_rows(upload, upload.name) if upload else request.data
+            if not isinstance(rows, list):
+                raise ImportFormatError('Se esperaba un arreglo de empleos o un archivo en el campo file')
+            created, errors = import_job_postings(CompanyProfile(pk=principal.profile_id), rows)
+        except ImportFormatError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {'created': len(created), 'ids': [job.id for job in created], 'errors': errors},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=False, methods=['get'])
+    def popular(self, request):
+        """Empleos activos con más aplicaciones, ordenados por el contador indexado"""
+        jobs = JobPosting.objects.with_related(FieldSelection.from_request(request)).filter(status='active').order_by(
+            '-applications_count', '-created_at'
+        )[:POPULAR_JOBS_LIMIT]
+        serializer = self.get_serializer(jobs, many=True)
+        return Response(serializer.data)
+
+    def query_date(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            # Bien formada pero inexistente, p. ej. 2024-02-30
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Debe ser una fecha válida con el formato AAAA-MM-DD'})
+        return parsed
+
+    def query_int(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: 'Debe ser un entero'})
+
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        """Embudo de contratación de la empresa por estado, día y empleo (?since=, ?until=, ?job=)"""
+        principal = get_principal(request.user)
+        if not principal.is_company:
+            return Response({'error': 'Only companies can view analytics'}, status=status.HTTP_403_FORBIDDEN)
+
+        since, until = self.query_date('since'), self.query_date('until')
+        job_id = self.query_int('job')
+        try:
+            since, until = report_range(since, until)
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        jobs = JobPosting.objects.filter(company_id=principal.profile_id)
+        if job_id is not None:
+            jobs = jobs.filter(pk=job_id)
+        return Response(funnel_report(jobs, since, until))
+
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        """Empleos activos más afines a las habilidades del estudiante, con su match_score"""
+        principal = get_principal(request.user)
+        if not principal.is_student:
+            return Response({'error': 'Only students can get recommendations'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            limit = min(int(request.query_params.get('limit', RECOMMENDED_JOBS_LIMIT)), MAX_RECOMMENDED_JOBS_LIMIT)
+        except ValueError:
+            limit = RECOMMENDED_JOBS_LIMIT
+        skills = StudentProfile.objects.filter(pk=principal.profile_id).values_list('skills', flat=True).first()
+        applied = JobApplication.objects.filter(student_id=principal.profile_id).values_list('job_id', flat=True)
+        ranked = recommend_jobs(skills, max(limit, 1), exclude=set(applied))
+
+        jobs = JobPosting.objects.with_related(FieldSelection.from_request(request)).filter(status='active').in_bulk([job_id for job_id, _ in ranked])
+        results = []
+        for job_id, score in ranked:
+            if job_id in jobs:
+                data = self.get_serializer(jobs[job_id]).data
+                data['match_score'] = round(score, 4)
+                results.append(data)
+        return Response(results)
+
     @action(detail=True, methods=['get'])
     def applications(self, request, pk=None):
         job = self.get_object()
         if request.user.user_type != 'company' or job.company.user != request.user:
             return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
 
-        applications = job.applications.all()
-        serializer = JobApplicationSerializer(applications, many=True)
-        return Response(serializer.data)
+        if request.query_params.get('ordering') == 'score':
+            return self.ranked_applications(request, job)
+
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(job.applications.with_related(), request, view=self)
+        serializer = JobApplicationSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    def ranked_applications(self, request, job):
+        """Página de candidatos ordenados por afinidad con el empleo, con su score"""
+        paginator = ApplicantRankingPagination()
+        page = paginator.paginate_queryset(rank_applications(job), request, view=self)
+        applications = job.applications.with_related().in_bulk([pk for pk, _ in page])
+        # Una aplicación pudo eliminarse entre el ranking y la lectura de la página
+        page = [(pk, score) for pk, score in page if pk in applications]
+        data = JobApplicationSerializer(
+            [applications[pk] for pk, _ in page], many=True, context=self.get_serializer_context(),
+        ).data
+        for item, (_, score) in zip(data, page):
+            item['score'] = round(score, 4)
+        return paginator.get_paginated_response(data)
+
+    @action(detail=True, methods=['get'], url_path='applications/export')
+    def export_applications(self, request, pk=None):
+        """Exporta en streaming las aplicaciones del empleo (CSV o NDJSON)"""
+        job = self.get_object()
+        if request.user.user_type != 'company' or job.company.user != request.user:
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        return export_response(request, JobApplication.objects.filter(job=job), f'job-{job.id}-applications')
 
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+class JobApplicationViewSet(SyncListMixin, viewsets.ModelViewSet):
     queryset = JobApplication.objects.all()
+    sync_models = (JobApplication, JobPosting, StudentProfile)
     serializer_class = JobApplicationSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        queryset = JobApplication.objects.with_related(FieldSelection.from_request(self.request))
         if self.request.user.user_type == 'student':
-            return JobApplication.objects.filter(student__user=self.request.user)
+            return queryset.filter(student__user=self.request.user)
         elif self.request.user.user_type == 'company':
-            return JobApplication.objects.filter(job__company__user=self.request.user)
-        return JobApplication.objects.all()
+            return queryset.filter(job__company__user=self.request.user)
+        return queryset
 
     def perform_create(self, serializer):
-        if hasattr(self.request.user, 'student_profile'):
+        principal = get_principal(self.request.user)
+        if principal.is_student:
             job_id = self.request.data.get('job_id')
             job = JobPosting.objects.get(id=job_id)
-            serializer.save(student=self.request.user.student_profile, job=job)
+            application = serializer.save(student_id=principal.profile_id, job=job)
+            record_status_changes([(application.pk, '', application.status)], self.request.user)
         else:
             raise PermissionError("Only students can apply to jobs")
 
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exporta en streaming las aplicaciones visibles para el usuario (CSV o NDJSON)"""
+        return export_response(request, self.get_queryset().prefetch_related(None), 'applications')
+
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
         application = self.get_object()
@@ -68,7 +239,76 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
 
         new_status = request.data.get('status')
         if new_status in dict(JobApplication.STATUS_CHOICES):
+            previous_status = application.status
             application.status = new_status
             application.save()
+            record_status_changes([(application.pk, previous_status, new_status)], request.user)
             return Response(JobApplicationSerializer(application).data)
         return Response({'error': 'Invalid status'}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'])
+    def bulk_update_status(self, request):
+        """Cambia el estado de varias aplicaciones de la empresa en una sola petición"""
+        if not get_principal(request.user).is_company:
+            return Response({'error': 'Permission denied'}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = BulkStatusUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        new_status = serializer.validated_data['status']
+        updated, not_found = bulk_update_status(request.user, serializer.validated_data['ids'], new_status)
+        return Response({
+            'status': new_status,
+            'results': [
+                {'id': pk, 'job': job_id, 'status': new_status, 'updated_at': updated_at}
+                for pk, job_id, updated_at in updated
+            ],
+            'not_found': not_found,
+        })
+
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        """Historial de estados de la aplicación, del más antiguo al más reciente"""
+        application = self.get_object()
+        return Response(ApplicationStatusEventSerializer(status_timeline(application), many=True).data)
+
+
+def job_posting_view(request, action, **kwargs):
+    """Instancia del viewset para reutilizar su queryset, filtros y serializador"""
+    return JobPostingViewSet(request=request, action=action, args=(), kwargs=kwargs, format_kwarg=None)
+
+
+@async_read_view(replica=True)
+async def job_posting_list(request):
+    """Listado paginado de empleos con el ORM asíncrono, con ?updated_since= y respuestas condicionales"""
+    view = job_posting_view(request, 'list')
+    since = parse_updated_since(request)
+    # Los filtros pueden consultar la base de datos (p. ej. search_backend la primera vez)
+    queryset = await sync_to_async(lambda: view.filter_queryset(view.get_queryset()))()
+    if since is None:
+        paginator = view.paginator
+        jobs = await paginator.apaginate_queryset(queryset, request)
+        validators = await sync_to_async(view.page_validators)(jobs)
+    else:
+        delta = await sync_to_async(view.sync_changes)(queryset, since)
+        validators = await sync_to_async(delta_validators)(request, view.sync_models, delta)
+
+    response = not_modified(request, validators)
+    if response is None:
+        if since is not None:
+            response = await sync_to_async(view.sync_delta)(delta)
+        else:
+            response = await sync_to_async(
+                lambda: paginator.get_paginated_response(view.get_serializer(jobs, many=True).data)
+            )()
+    return set_validators(response, validators)
+
+
+@async_read_view(replica=True)
+async def job_posting_detail(request, pk):
+    """Detalle de un empleo con el ORM asíncrono"""
+    view = job_posting_view(request, 'retrieve', pk=pk)
+    try:
+        job = await view.get_queryset().aget(pk=pk)
+    except JobPosting.DoesNotExist:
+        raise NotFound()
+    return await sync_to_async(lambda: view.get_serializer(job).data)()
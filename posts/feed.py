@@ -0,0 +1,207 @@
+import asyncio
+import base64
+import heapq
+import json
+from collections import namedtuple
+from datetime import datetime
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from .models import Post
+from .serializers import PostSerializer
+from jobs.models import JobPosting
+from jobs.serializers import JobPostingSerializer
+from Sut.fields import ALL_FIELDS, SELECTION_CONTEXT_KEY
+from Sut.sync import (
+    Delta, changed_since, collection_validators, sync_started_at, tombstones_expired, tombstones_since,
+)
+
+
+# Modelos cuya representación aparece en el feed, para sus validadores de caché
+FEED_MODELS = (Post, JobPosting)
+FEED_PAGE_SIZE = 20
+FEED_MAX_PAGE_SIZE = 100
+CURSOR_QUERY_PARAM = 'cursor'
+PAGE_SIZE_QUERY_PARAM = 'page_size'
+
+
+class FeedPage(namedtuple('FeedPage', ['next', 'items'])):
+    """Enlace a la página siguiente y elementos [(kind, objeto)] de una página del feed"""
+
+
+def encode_cursor(key):
+    """Codifica la llave (created_at, kind, id) del último elemento como un token opaco"""
+    created_at, kind, pk = key
+    raw = json.dumps([created_at.isoformat(), kind, pk]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(token):
+    try:
+        created_at, kind, pk = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(kind), int(pk)
+    except (TypeError, ValueError, UnicodeError):
+        raise NotFound('Invalid cursor')
+
+
+def feed_stream(kind, queryset):
+    for obj in queryset:
+        yield (obj.created_at, kind, obj.pk), kind, obj
+
+
+def after_cursor(queryset, kind, cursor):
+    """
+    Filtra un queryset de una fuente del feed para quedarse con los elementos
+    estrictamente posteriores al cursor en el orden (-created_at, -kind, -id).
+    """
+    if cursor is None:
+        return queryset
+
+    created_at, cursor_kind, pk = cursor
+    if kind < cursor_kind:
+        return queryset.filter(created_at__lte=created_at)
+    if kind > cursor_kind:
+        return queryset.filter(created_at__lt=created_at)
+    return queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+
+
+def feed_sources():
+    posts = Post.objects.select_related(
+        'user', 'user__student_profile', 'user__company_profile'
+    )
+    jobs = JobPosting.objects.filter(status='active').with_related()
+    return [('post', posts), ('job', jobs)]
+
+
+def serialize_feed_items(items, request):
+    """Serializa los elementos ya mezclados conservando su orden"""
+    data = []
+    for kind, obj in items:
+        if kind == 'post':
+            item = PostSerializer(obj, context={'request': request}).data
+            item['item_type'] = 'post'
+        else:
+            # El feed siempre usa la forma completa del empleo, sin ?fields= ni ?expand=
+            item = JobPostingSerializer(obj, context={'request': request, SELECTION_CONTEXT_KEY: ALL_FIELDS}).data
+            item['item_type'] = 'job'
+            item['user'] = obj.company.user.id
+            item['user_name'] = f"{obj.company.user.first_name} {obj.company.user.last_name}"
+            item['user_type'] = obj.company.user.user_type
+            item['user_profile_picture_url'] = item['company']['profile_picture_url']
+            item['user_profile_picture_srcset'] = item['company']['profile_picture_srcset']
+        data.append(item)
+    return data
+
+
+def get_page_size(request):
+    try:
+        page_size = int(request.query_params.get(PAGE_SIZE_QUERY_PARAM, FEED_PAGE_SIZE))
+    except ValueError:
+        return FEED_PAGE_SIZE
+    return max(1, min(page_size, FEED_MAX_PAGE_SIZE))
+
+
+def feed_querysets(request, sources=None):
+    """
+    Querysets de cada fuente del feed para la página pedida.
+
+    Cada fuente se ordena en la base de datos por (-created_at, -id) y se
+    limita a page_size + 1 filas, así el costo de cada página es O(page_size)
+    sin importar el tamaño de las tablas.
+    """
+    page_size = get_page_size(request)
+    token = request.query_params.get(CURSOR_QUERY_PARAM)
+    cursor = decode_cursor(token) if token else None
+
+    if sources is None:
+        sources = feed_sources()
+
+    return page_size, [
+        (kind, after_cursor(queryset, kind, cursor).order_by('-created_at', '-id')[:page_size + 1])
+        for kind, queryset in sources
+    ]
+
+
+def build_feed_page(request, page_size, rows):
+    """Mezcla k-way en memoria de las filas de cada fuente"""
+    streams = [feed_stream(kind, objs) for kind, objs in rows]
+    merged = list(islice(heapq.merge(*streams, key=lambda entry: entry[0], reverse=True), page_size + 1))
+    has_next = len(merged) > page_size
+    merged = merged[:page_size]
+
+    next_url = None
+    if has_next:
+        url = request.build_absolute_uri()
+        next_url = replace_query_param(url, CURSOR_QUERY_PARAM, encode_cursor(merged[-1][0]))
+
+    return FeedPage(next_url, [(kind, obj) for _, kind, obj in merged])
+
+
+def get_feed_page(request, sources=None):
+    """Devuelve una página del feed unificado sin serializar"""
+    page_size, querysets = feed_querysets(request, sources)
+    return build_feed_page(request, page_size, querysets)
+
+
+async def aget_feed_page(request, sources=None):
+    """Versión asíncrona de get_feed_page: las fuentes se consultan con asyncio.gather"""
+    page_size, querysets = feed_querysets(request, sources)
+    rows = await asyncio.gather(*(fetch_rows(queryset) for _, queryset in querysets))
+    kinds = [kind for kind, _ in querysets]
+    return await sync_to_async(build_feed_page)(request, page_size, list(zip(kinds, rows)))
+
+
+async def fetch_rows(queryset):
+    return [obj async for obj in queryset.aiterator()]
+
+
+def feed_page_data(request, page):
+    return {'next': page.next, 'results': serialize_feed_items(page.items, request)}
+
+
+def feed_rows(items):
+    return [(kind, obj.pk, obj.updated_at) for kind, obj in items]
+
+
+def feed_validators(request, page):
+    """Validadores de una página del feed ya leída"""
+    return collection_validators(request, FEED_MODELS, feed_rows(page.items), page.next)
+
+
+def feed_changes(request, since, sources=None):
+    """
+    Elementos del feed modificados después de ``since`` en orden de updated_at.
+    Los eliminados y los empleos que dejaron de estar activos se listan en
+    ``deleted`` como {'item_type', 'id'}.
+    """
+    synced_at = sync_started_at()
+    if sources is None:
+        sources = feed_sources()
+
+    items, deleted, truncated = [], [], tombstones_expired(since)
+    for kind, queryset in sources:
+        changed, more = changed_since(queryset, since)
+        truncated = truncated or more
+        items.extend((kind, obj) for obj in changed)
+        deleted.extend({'item_type': kind, 'id': pk} for pk in tombstones_since(queryset.model, since, request.user))
+    deleted.extend({'item_type': 'job', 'id': pk} for pk in JobPosting.objects.inactive_since(since))
+
+    items.sort(key=lambda item: item[1].updated_at)
+    return Delta(items, deleted, synced_at, truncated)
+
+
+def feed_delta_validators(request, delta):
+    return collection_validators(request, FEED_MODELS, feed_rows(delta.changed), delta.deleted, delta.truncated)
+
+
+def feed_delta_data(request, delta):
+    return {
+        'results': serialize_feed_items(delta.changed, request),
+        'deleted': delta.deleted,
+        'synced_at': delta.synced_at.isoformat(),
+        'truncated': delta.truncated,
+    }
@@ -0,0 +1,7 @@
+from Sut.hot_queries import register
+from .models import Post
+
+
+@register('posts.feed')
+def feed():
+    return Post.objects.order_by('-created_at', '-id')[:20]
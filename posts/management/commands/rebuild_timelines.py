@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from posts.timeline import rebuild_timelines, trim_timelines
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los timelines materializados del feed o recorta los que exceden el límite'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Id de usuario (se puede repetir)')
+        parser.add_argument(
+            '--trim', action='store_true',
+            help='Solo recorta los timelines a TIMELINE_MAX_ENTRIES sin reconstruirlos',
+        )
+
+    def handle(self, *args, **options):
+        if options['trim']:
+            removed = trim_timelines(options['users'])
+            self.stdout.write(self.style.SUCCESS(f'{removed} elementos recortados'))
+            return
+        count = rebuild_timelines(options['users'])
+        self.stdout.write(self.style.SUCCESS(f'{count} timelines reconstruidos'))
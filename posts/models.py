@@ -16,3 +16,31 @@ class Post(models.Model):
         verbose_name = 'Post'
         verbose_name_plural = 'Posts'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='posts_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='posts_user_created_idx'),
+            models.Index(fields=['updated_at'], name='posts_updated_idx'),
+        ]
+
+
+class TimelineEntry(models.Model):
+    """Elemento del feed materializado de un usuario (ver posts/timeline.py)"""
+    KIND_CHOICES = (
+        ('job', 'Job'),
+        ('post', 'Post'),
+    )
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_entries')
+    kind = models.CharField(max_length=4, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    # Copia del created_at del elemento: el orden del feed
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'kind', 'object_id'], name='posts_timeline_unique_item'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-kind', '-object_id'], name='posts_timeline_user_idx'),
+            models.Index(fields=['kind', 'object_id'], name='posts_timeline_item_idx'),
+        ]
@@ -1,18 +1,24 @@
 from rest_framework import serializers
 from .models import Post
+from Sut.images import AVATAR_SIZES, IMAGE_SIZES, srcset
+from Sut.serializer_cache import CachedRepresentationMixin, CachedListSerializer
+from Sut.uploads import MediaUploadMixin
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(CachedRepresentationMixin, serializers.ModelSerializer):
     user_email = serializers.CharField(source='user.email', read_only=True)
     user_name = serializers.SerializerMethodField()
     user_type = serializers.CharField(source='user.user_type', read_only=True)
     image_url = serializers.SerializerMethodField()
     user_profile_picture_url = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
+    user_profile_picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
-        fields = ['id', 'user', 'user_email', 'user_name', 'user_type', 'content', 'image_url', 'user_profile_picture_url', 'created_at', 'updated_at']
+        fields = ['id', 'user', 'user_email', 'user_name', 'user_type', 'content', 'image_url', 'image_srcset', 'user_profile_picture_url', 'user_profile_picture_srcset', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = CachedListSerializer
 
     def get_user_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}"
@@ -25,14 +31,22 @@ class PostSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
-    def get_user_profile_picture_url(self, obj):
-        request = self.context.get('request')
-        profile_picture = None
+    def get_image_srcset(self, obj):
+        return srcset(obj.image, IMAGE_SIZES, self.context.get('request'))
 
+    def get_user_profile_picture(self, obj):
         if obj.user.user_type == 'student' and hasattr(obj.user, 'student_profile'):
-            profile_picture = obj.user.student_profile.profile_picture
+            return obj.user.student_profile.profile_picture
         elif obj.user.user_type == 'company' and hasattr(obj.user, 'company_profile'):
-            profile_picture = obj.user.company_profile.profile_picture
+            return obj.user.company_profile.profile_picture
+        return None
+
+    def get_user_profile_picture_srcset(self, obj):
+        return srcset(self.get_user_profile_picture(obj), AVATAR_SIZES, self.context.get('request'))
+
+    def get_user_profile_picture_url(self, obj):
+        request = self.context.get('request')
+        profile_picture = self.get_user_profile_picture(obj)
 
         if profile_picture:
             if request:
@@ -41,7 +55,10 @@ class PostSerializer(serializers.ModelSerializer):
         return None
 
 
-class CreatePostSerializer(serializers.ModelSerializer):
+class CreatePostSerializer(MediaUploadMixin, serializers.ModelSerializer):
+    image_upload = serializers.UUIDField(write_only=True, required=False)
+    upload_fields = {'image_upload': ('image', 'post')}
+
     class Meta:
         model = Post
-        fields = ['content', 'image']
+        fields = ['content', 'image', 'image_upload']
@@ -0,0 +1,62 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Post
+from .timeline import fan_out, rebuild_timelines, remove_from_timelines, schedule, sync_job_posting
+from companies.models import CompanyProfile
+from jobs.models import JobPosting
+from students.models import User, StudentProfile
+from Sut.images import IMAGE_SIZES, schedule_derivatives
+from Sut.serializer_cache import invalidate, invalidate_queryset, user_fields_changed
+from Sut.sync import record_tombstone
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    invalidate(Post, [instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def record_post_tombstone(sender, instance, **kwargs):
+    record_tombstone(instance)
+
+
+@receiver(post_save, sender=Post)
+def generate_post_image_derivatives(sender, instance, **kwargs):
+    schedule_derivatives(instance.image, IMAGE_SIZES)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_posts(sender, instance, update_fields=None, **kwargs):
+    if user_fields_changed(update_fields):
+        invalidate_queryset(Post.objects.filter(user=instance))
+
+
+@receiver([post_save, post_delete], sender=StudentProfile)
+@receiver([post_save, post_delete], sender=CompanyProfile)
+def invalidate_profile_posts(sender, instance, **kwargs):
+    # Las publicaciones embeben la foto de perfil de su autor
+    invalidate_queryset(Post.objects.filter(user_id=instance.user_id))
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, created, **kwargs):
+    if created:
+        schedule(fan_out, [('post', instance.pk, instance.created_at)])
+
+
+@receiver(post_save, sender=JobPosting)
+def fan_out_job_posting(sender, instance, **kwargs):
+    schedule(sync_job_posting, instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=JobPosting)
+def remove_timeline_entries(sender, instance, **kwargs):
+    schedule(remove_from_timelines, 'post' if sender is Post else 'job', [instance.pk])
+
+
+@receiver(post_save, sender=User)
+def build_user_timeline(sender, instance, created, **kwargs):
+    if created:
+        schedule(rebuild_timelines, [instance.pk])
@@ -1 +1,211 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from .models import Post, TimelineEntry
+from .timeline import is_large_audience
+from companies.models import CompanyProfile
+from Sut.images import generate_derivatives
+from jobs.models import JobPosting
+from students.models import User
+
+
+@override_settings(TIMELINE_FANOUT_WORKERS=0)
+class FeedPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('student@example.com', 'password123', user_type='student')
+        company_user = User.objects.create_user('company@example.com', 'password123', user_type='company')
+        company = CompanyProfile.objects.create(
+            user=company_user, company_name='Acme', industry='tech',
+            description='Acme Corp', address='Calle 1',
+        )
+        for i in range(5):
+            Post.objects.create(user=self.user, content=f'post {i}')
+            JobPosting.objects.create(
+                company=company, title=f'job {i}', description='d', requirements='r',
+                responsibilities='r', location='CDMX', job_type='full_time',
+            )
+        JobPosting.objects.create(
+            company=company, title='draft', description='d', requirements='r',
+            responsibilities='r', location='CDMX', job_type='full_time', status='draft',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cursor_walks_whole_feed_in_order(self):
+        seen = []
+        url = '/api/posts/?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen.extend(response.data['results'])
+            url = response.data['next']
+
+        keys = [(item['item_type'], item['id']) for item in seen]
+        self.assertEqual(len(keys), 10)
+        self.assertEqual(len(set(keys)), 10)
+        created = [item['created_at'] for item in seen]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+    def test_ignores_field_selection_of_jobs(self):
+        for params in ({'fields': 'id'}, {'fields': 'id,title'}, {'expand': 'none'}, {'fields': 'company.id'}):
+            response = self.client.get('/api/posts/', params)
+            self.assertEqual(response.status_code, 200, params)
+            job = next(item for item in response.data['results'] if item['item_type'] == 'job')
+            self.assertEqual(job['company']['company_name'], 'Acme', params)
+            self.assertIn('user_profile_picture_srcset', job)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/posts/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_updated_since_and_conditional_feed(self):
+        response = self.client.get('/api/posts/')
+        etag = response['ETag']
+        self.assertEqual(self.client.get('/api/posts/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        since = timezone.now()
+        post = Post.objects.create(user=self.user, content='nuevo')
+        removed = Post.objects.get(content='post 0')
+        removed_id = removed.id
+        removed.delete()
+
+        response = self.client.get('/api/posts/', {'updated_since': since.isoformat()}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(item['item_type'], item['id']) for item in response.data['results']], [('post', post.id)])
+        self.assertEqual(response.data['deleted'], [{'item_type': 'post', 'id': removed_id}])
+
+
+@override_settings(TIMELINE_FANOUT_WORKERS=0)
+class TimelineTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('student@example.com', 'password123', user_type='student')
+        company_user = User.objects.create_user('company@example.com', 'password123', user_type='company')
+        self.company = CompanyProfile.objects.create(
+            user=company_user, company_name='Acme', industry='tech',
+            description='Acme Corp', address='Calle 1',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_job(self, **fields):
+        return JobPosting.objects.create(
+            company=self.company, title='job', description='d', requirements='r',
+            responsibilities='r', location='CDMX', job_type='full_time', **fields,
+        )
+
+    def feed_keys(self):
+        return [(item['item_type'], item['id']) for item in self.client.get('/api/posts/').data['results']]
+
+    def test_items_fan_out_to_every_timeline(self):
+        post = Post.objects.create(user=self.user, content='hola')
+        job = self.create_job()
+        draft = self.create_job(status='draft')
+        self.assertEqual(TimelineEntry.objects.filter(kind='post', object_id=post.pk).count(), 2)
+        self.assertEqual(self.feed_keys(), [('job', job.pk), ('post', post.pk)])
+
+        # Un usuario nuevo recibe el timeline ya existente
+        newcomer = User.objects.create_user('new@example.com', 'password123', user_type='student')
+        self.assertEqual(newcomer.timeline_entries.count(), 2)
+
+        job.status = 'closed'
+        job.save()
+        draft.status = 'active'
+        draft.save()
+        post.delete()
+        self.assertEqual(self.feed_keys(), [('job', draft.pk)])
+
+    def test_feed_page_reads_timeline_with_one_query_per_kind(self):
+        for i in range(3):
+            Post.objects.create(user=self.user, content=f'post {i}')
+            self.create_job()
+        is_large_audience()
+        # Timeline, publicaciones y empleos de la página, y las versiones de los
+        # modelos para los validadores (no consultan las tablas)
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/posts/')
+        self.assertEqual(len(response.data['results']), 6)
+
+    @override_settings(TIMELINE_FANOUT_WORKERS=1)
+    def test_fan_out_runs_after_commit_outside_the_request(self):
+        with mock.patch('posts.timeline.get_executor') as get_executor:
+            submit = get_executor.return_value.submit
+            submit.side_effect = lambda run, function, args: function(*args)
+            with self.captureOnCommitCallbacks(execute=True):
+                post = Post.objects.create(user=self.user, content='hola')
+                self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(submit.call_count, 1)
+        self.assertEqual(TimelineEntry.objects.filter(kind='post', object_id=post.pk).count(), 2)
+
+    @override_settings(TIMELINE_MAX_ENTRIES=2)
+    def test_trim_and_rebuild(self):
+        posts = [Post.objects.create(user=self.user, content=f'post {i}') for i in range(4)]
+        TimelineEntry.objects.filter(user=self.user).delete()
+
+        call_command('rebuild_timelines', user=[self.user.pk], stdout=io.StringIO())
+        self.assertEqual(self.feed_keys(), [('post', posts[3].pk), ('post', posts[2].pk)])
+        call_command('rebuild_timelines', trim=True, stdout=io.StringIO())
+        self.assertEqual(TimelineEntry.objects.count(), 4)
+
+    def test_large_audience_is_read_on_request(self):
+        fanned_out = Post.objects.create(user=self.user, content='antes')
+        with override_settings(TIMELINE_FANOUT_MAX_AUDIENCE=1):
+            pulled = Post.objects.create(user=self.user, content='después')
+            self.assertFalse(TimelineEntry.objects.filter(kind='post', object_id=pulled.pk).exists())
+            # Lo materializado y lo leído de las tablas se mezcla sin duplicados
+            self.assertEqual(self.feed_keys(), [('post', pulled.pk), ('post', fanned_out.pk)])
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        # Las anotaciones de derivados de otras pruebas apuntan a otro MEDIA_ROOT
+        caches['default'].clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.user = User.objects.create_user('student@example.com', 'password123', user_type='student')
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 600), 'red').save(buffer, 'JPEG')
+        self.post = Post.objects.create(
+            user=self.user, content='foto',
+            image=SimpleUploadedFile('foto.jpg', buffer.getvalue(), content_type='image/jpeg'),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_srcset_falls_back_to_lazy_generation(self):
+        response = self.client.get(f'/api/posts/{self.post.id}/')
+        srcset = response.data['image_srcset']
+        self.assertEqual(set(srcset), {'320', '640', '1280'})
+
+        lazy = self.client.get(srcset['320'])
+        self.assertEqual(lazy.status_code, 302)
+        with open(self.media_root + lazy['Location'].replace('/media', '', 1), 'rb') as derivative:
+            image = Image.open(derivative)
+            self.assertEqual(image.size, (320, 240))
+            self.assertNotIn('exif', image.info)
+
+    def test_srcset_uses_recorded_derivatives_without_storage_lookups(self):
+        generate_derivatives(self.post.image.name, [320])
+        with mock.patch('django.core.files.storage.FileSystemStorage.exists') as exists:
+            srcset = self.client.get(f'/api/posts/{self.post.id}/').data['image_srcset']
+        exists.assert_not_called()
+        self.assertTrue(srcset['320'].startswith('http://testserver/media/thumbs/'))
+        self.assertIn('/api/media/thumbnail/', srcset['640'])
+
+    def test_lazy_generation_rejects_unknown_paths(self):
+        response = self.client.get('/api/media/thumbnail/', {'path': '../settings.py', 'w': 320})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,260 @@
+"""
+Timeline materializado del feed de cada usuario (fan-out al escribir).
+
+Al crear una publicación o activar un empleo se inserta una fila de
+``TimelineEntry`` por cada usuario de su audiencia, así leer el feed es un
+solo recorrido del índice (user, -created_at, -kind, -object_id) más una
+consulta por pk de cada tipo para los elementos de la página.
+
+* Las escrituras (``schedule``) se hacen al confirmar la transacción en un
+  hilo aparte, en el orden en que se encolaron, así la petición que crea
+  una publicación no paga el fan-out.
+* Cada timeline conserva como máximo TIMELINE_MAX_ENTRIES elementos; los
+  más antiguos se recortan periódicamente (``trim_timelines``), solo en los
+  timelines que recibieron el elemento.
+* Si la audiencia de un autor supera TIMELINE_FANOUT_MAX_AUDIENCE no se
+  escribe nada: sus elementos se leen de las tablas al consultar el feed
+  (fan-out al leer) y se mezclan con el timeline.
+* ``manage.py rebuild_timelines`` vuelve a llenar los timelines, p. ej.
+  tras cargas masivas que no emiten señales.
+
+Hoy todos los usuarios ven a todos los autores, así que la audiencia es la
+misma para todos (los usuarios activos); seguir empresas solo tiene que
+cambiar ``audience`` y ``large_audience_sources``.
+"""
+import asyncio
+import heapq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q, Value, Window
+from django.db.models.functions import RowNumber
+from rest_framework.utils.urls import replace_query_param
+
+from .feed import (
+    CURSOR_QUERY_PARAM, FeedPage, after_cursor, decode_cursor, encode_cursor, feed_sources, feed_stream, fetch_rows,
+    get_page_size,
+)
+from .models import TimelineEntry
+from jobs.models import JobPosting
+from students.models import User
+
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_ORDERING = ('-created_at', '-kind', '-object_id')
+LARGE_AUDIENCE_CACHE_KEY = 'timeline:large-audience:{}'
+LARGE_AUDIENCE_CACHE_TIMEOUT = 60
+BATCH_SIZE = 1000
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.TIMELINE_FANOUT_WORKERS, thread_name_prefix='timelines')
+        return _executor
+
+
+def _run_in_background(function, args):
+    close_old_connections()
+    try:
+        function(*args)
+    except Exception:
+        logger.exception('No se pudieron actualizar los timelines (%s)', function.__name__)
+    finally:
+        close_old_connections()
+
+
+def schedule(function, *args):
+    """Ejecuta ``function(*args)`` fuera de la petición al confirmar la transacción"""
+    if settings.TIMELINE_FANOUT_WORKERS <= 0:
+        function(*args)
+        return
+    transaction.on_commit(lambda: get_executor().submit(_run_in_background, function, args))
+
+
+def audience():
+    """Usuarios que reciben en su timeline lo que se publica"""
+    return User.objects.filter(is_active=True)
+
+
+def is_large_audience():
+    """Si la audiencia supera el límite del fan-out al escribir; se recalcula cada minuto"""
+    limit = settings.TIMELINE_FANOUT_MAX_AUDIENCE
+    key = LARGE_AUDIENCE_CACHE_KEY.format(limit)
+    cache = caches['default']
+    large = cache.get(key)
+    if large is None:
+        # Contar hasta limit + 1 basta para decidir
+        large = audience()[:limit + 1].count() > limit
+        cache.set(key, large, LARGE_AUDIENCE_CACHE_TIMEOUT)
+    return large
+
+
+def large_audience_sources():
+    """Fuentes del feed que no se materializan y se leen al consultar"""
+    return feed_sources() if is_large_audience() else []
+
+
+def fan_out(items):
+    """Agrega los elementos [(kind, id, created_at)] al timeline de su audiencia"""
+    if not items or is_large_audience():
+        return
+    # El recorte se amortiza entre varias escrituras
+    trim = any(object_id % settings.TIMELINE_TRIM_INTERVAL == 0 for _, object_id, _ in items)
+    # La audiencia está acotada por TIMELINE_FANOUT_MAX_AUDIENCE
+    user_ids = list(audience().values_list('pk', flat=True))
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        batch = user_ids[start:start + BATCH_SIZE]
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(user_id=user_id, kind=kind, object_id=object_id, created_at=created_at)
+            for user_id in batch
+            for kind, object_id, created_at in items
+        ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+        if trim:
+            trim_timelines(batch)
+
+
+def remove_from_timelines(kind, object_ids):
+    TimelineEntry.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def sync_job_posting(job_id):
+    """Agrega el empleo a los timelines si está activo y aún no se distribuyó, o lo quita"""
+    job = JobPosting.objects.filter(pk=job_id).values_list('status', 'created_at').first()
+    if job is None or job[0] != 'active':
+        remove_from_timelines('job', [job_id])
+    elif not TimelineEntry.objects.filter(kind='job', object_id=job_id).exists():
+        fan_out([('job', job_id, job[1])])
+
+
+def trim_timelines(user_ids=None):
+    """Borra los elementos que exceden TIMELINE_MAX_ENTRIES en cada timeline"""
+    entries = TimelineEntry.objects.all() if user_ids is None else TimelineEntry.objects.filter(user_id__in=user_ids)
+    excess = list(entries.annotate(
+        position=Window(RowNumber(), partition_by=F('user_id'), order_by=[F(name[1:]).desc() for name in TIMELINE_ORDERING]),
+    ).filter(position__gt=settings.TIMELINE_MAX_ENTRIES).values_list('pk', flat=True))
+    for start in range(0, len(excess), BATCH_SIZE):
+        TimelineEntry.objects.filter(pk__in=excess[start:start + BATCH_SIZE]).delete()
+    return len(excess)
+
+
+def latest_items():
+    """Los TIMELINE_MAX_ENTRIES elementos más recientes del feed como [(kind, id, created_at)]"""
+    limit = settings.TIMELINE_MAX_ENTRIES
+    streams = [
+        queryset.order_by('-created_at', '-id').annotate(kind=Value(kind)).values_list('created_at', 'kind', 'pk')[:limit]
+        for kind, queryset in feed_sources()
+    ]
+    return [(kind, pk, created_at) for created_at, kind, pk in islice(heapq.merge(*streams, reverse=True), limit)]
+
+
+def rebuild_timelines(user_ids=None):
+    """Reconstruye el timeline de los usuarios indicados (por omisión, de todos); devuelve cuántos"""
+    if user_ids is None:
+        user_ids = audience().values_list('pk', flat=True)
+    user_ids = list(user_ids)
+    items = [] if is_large_audience() else latest_items()
+    for start in range(0, len(user_ids), BATCH_SIZE):
+        batch = user_ids[start:start + BATCH_SIZE]
+        TimelineEntry.objects.filter(user_id__in=batch).delete()
+        TimelineEntry.objects.bulk_create([
+            TimelineEntry(user_id=user_id, kind=kind, object_id=object_id, created_at=created_at)
+            for user_id in batch
+            for kind, object_id, created_at in items
+        ], batch_size=BATCH_SIZE)
+    return len(user_ids)
+
+
+def entries_after_cursor(queryset, cursor):
+    if cursor is None:
+        return queryset
+    created_at, kind, pk = cursor
+    return queryset.filter(
+        Q(created_at__lt=created_at)
+        | Q(created_at=created_at, kind__lt=kind)
+        | Q(created_at=created_at, kind=kind, object_id__lt=pk)
+    )
+
+
+def timeline_querysets(request, sources=None):
+    """Entradas del timeline del usuario y fuentes leídas al consultar para la página pedida"""
+    page_size = get_page_size(request)
+    token = request.query_params.get(CURSOR_QUERY_PARAM)
+    cursor = decode_cursor(token) if token else None
+
+    entries = entries_after_cursor(TimelineEntry.objects.filter(user=request.user), cursor)
+    entries = entries.order_by(*TIMELINE_ORDERING).values_list('created_at', 'kind', 'object_id')[:page_size + 1]
+    pulled = [
+        (kind, after_cursor(queryset, kind, cursor).order_by('-created_at', '-id')[:page_size + 1])
+        for kind, queryset in large_audience_sources()
+    ]
+    if sources is None:
+        sources = feed_sources()
+    return page_size, entries, pulled, dict(sources)
+
+
+def merge_page(page_size, entries, pulled):
+    """Mezcla las entradas y los objetos leídos; devuelve [(llave, kind, objeto o None)] sin duplicados"""
+    streams = [((tuple(key), key[1], None) for key in entries)]
+    streams.extend(feed_stream(kind, objs) for kind, objs in pulled)
+    merged = []
+    for entry in heapq.merge(*streams, key=lambda entry: entry[0], reverse=True):
+        if merged and merged[-1][0] == entry[0]:
+            # Un elemento materializado y también leído de su tabla
+            if entry[2] is not None:
+                merged[-1] = entry
+            continue
+        merged.append(entry)
+        if len(merged) > page_size:
+            break
+    return merged
+
+
+def missing_ids(merged):
+    ids = {}
+    for (_, kind, pk), _, obj in merged:
+        if obj is None:
+            ids.setdefault(kind, []).append(pk)
+    return ids
+
+
+def build_timeline_page(request, page_size, merged, resolved):
+    has_next = len(merged) > page_size
+    merged = merged[:page_size]
+
+    next_url = None
+    if has_next:
+        url = request.build_absolute_uri()
+        next_url = replace_query_param(url, CURSOR_QUERY_PARAM, encode_cursor(merged[-1][0]))
+
+    items = []
+    for (_, _, pk), kind, obj in merged:
+        obj = obj if obj is not None else resolved.get(kind, {}).get(pk)
+        # Una entrada cuyo objeto se eliminó o dejó de estar activo se omite
+        if obj is not None:
+            items.append((kind, obj))
+    return FeedPage(next_url, items)
+
+
+async def aget_timeline_page(request, sources=None):
+    """Página del feed del usuario (sin serializar) a partir de su timeline materializado"""
+    page_size, entries, pulled, sources = await sync_to_async(timeline_querysets)(request, sources)
+    # aiterator() no admite values_list en Django 4.2
+    entry_rows, *pulled_rows = await asyncio.gather(
+        sync_to_async(list)(entries), *(fetch_rows(queryset) for _, queryset in pulled)
+    )
+    merged = merge_page(page_size, entry_rows, list(zip([kind for kind, _ in pulled], pulled_rows)))
+    missing = missing_ids(merged[:page_size])
+    objects = await asyncio.gather(*(sources[kind].ain_bulk(ids) for kind, ids in missing.items()))
+    return await sync_to_async(build_timeline_page)(request, page_size, merged, dict(zip(missing, objects)))
@@ -1,10 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PostViewSet
+from .views import PostViewSet, feed
+from Sut.async_api import get_or_delegate
 
 router = DefaultRouter()
 router.register(r'', PostViewSet)
 
 urlpatterns = [
+    path('', get_or_delegate(feed, PostViewSet.as_view({'post': 'create'})), name='post-list'),
     path('', include(router.urls)),
 ]
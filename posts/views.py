@@ -1,18 +1,27 @@
-from rest_framework import viewsets, status
-from rest_framework.decorators import action
+from asgiref.sync import sync_to_async
+from rest_framework import mixins, viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from .models import Post
 from .serializers import PostSerializer, CreatePostSerializer
-from jobs.models import JobPosting
-from jobs.serializers import JobPostingSerializer
+from .feed import (
+    feed_changes, feed_delta_data, feed_delta_validators, feed_page_data, feed_sources, feed_validators,
+)
+from .timeline import aget_timeline_page
+from Sut.async_api import async_read_view
+from Sut.renderers import FastJSONParser
+from Sut.sync import not_modified, parse_updated_since, set_validators
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(
+    mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """Publicaciones; el listado (el feed) lo atiende la vista asíncrona ``feed``"""
     queryset = Post.objects.all()
     permission_classes = [IsAuthenticated]
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (MultiPartParser, FormParser, FastJSONParser)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -26,34 +35,30 @@ class PostViewSet(viewsets.ModelViewSet):
         output_serializer = PostSerializer(post, context={'request': request})
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
-    def list(self, request, *args, **kwargs):
-        posts = Post.objects.all()
-        jobs = JobPosting.objects.filter(status='active')
-
-        feed_items = []
-
-        for post in posts:
-            post_data = PostSerializer(post, context={'request': request}).data
-            post_data['item_type'] = 'post'
-            feed_items.append(post_data)
-
-        for job in jobs:
-            job_data = JobPostingSerializer(job, context={'request': request}).data
-            job_data['item_type'] = 'job'
-            job_data['user'] = job.company.user.id
-            job_data['user_name'] = f"{job.company.user.first_name} {job.company.user.last_name}"
-            job_data['user_type'] = job.company.user.user_type
-            job_data['user_profile_picture_url'] = None
-            if job.company.profile_picture:
-                job_data['user_profile_picture_url'] = request.build_absolute_uri(job.company.profile_picture.url)
-            feed_items.append(job_data)
-
-        feed_items.sort(key=lambda x: x['created_at'], reverse=True)
-
-        return Response(feed_items)
-
     def destroy(self, request, *args, **kwargs):
         post = self.get_object()
         if post.user != request.user:
             return Response({'detail': 'You do not have permission to delete this post.'}, status=status.HTTP_403_FORBIDDEN)
         return super().destroy(request, *args, **kwargs)
+
+
+@async_read_view(authenticated=True, replica=True)
+async def feed(request):
+    """Versión asíncrona del feed: publicaciones y empleos se consultan en paralelo"""
+    since = parse_updated_since(request)
+    sources = feed_sources()
+    if since is None:
+        page = await aget_timeline_page(request, sources)
+        validators = await sync_to_async(feed_validators)(request, page)
+    else:
+        delta = await sync_to_async(feed_changes)(request, since, sources)
+        validators = await sync_to_async(feed_delta_validators)(request, delta)
+
+    response = not_modified(request, validators)
+    if response is None:
+        if since is None:
+            data = await sync_to_async(feed_page_data)(request, page)
+        else:
+            data = await sync_to_async(feed_delta_data)(request, delta)
+        response = Response(data)
+    return set_validators(response, validators)
@@ -0,0 +1,134 @@
+"""
+Principal cacheado del usuario autenticado.
+
+El backend de autenticación guarda en caché, en una sola entrada por usuario,
+solo lo necesario para autenticar y autorizar: (id, tipo, id del perfil,
+is_active, is_staff, hash de sesión). Nunca se guarda el usuario ni el hash
+de su contraseña. El usuario de la petición se arma con esos campos y el
+resto se carga con una consulta la primera vez que se lee alguno.
+
+Con el motor de sesiones ``cached_db`` una petición autenticada típica no
+hace consultas de autenticación. La entrada se invalida al guardar el usuario
+o su perfil y al cerrar sesión (ver signals.py). La caché debe ser compartida
+entre procesos (p. ej. Redis) para que la invalidación llegue a todos: el
+backend no se habilita con una caché por proceso (ver ``check_principal_cache``).
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router
+
+from .models import User, StudentProfile
+from companies.models import CompanyProfile
+
+
+PROFILE_MODELS = {'student': StudentProfile, 'company': CompanyProfile}
+BACKEND_PATH = 'students.auth.CachedModelBackend'
+PER_PROCESS_CACHES = (LocMemCache, DummyCache)
+
+
+class Principal:
+    """Usuario autenticado con el tipo e id de su perfil (None si aún no lo tiene)"""
+
+    def __init__(self, user_id, profile_type, profile_id, is_active=True, is_staff=False, session_auth_hash=''):
+        self.user_id = user_id
+        self.profile_type = profile_type
+        self.profile_id = profile_id
+        self.is_active = is_active
+        self.is_staff = is_staff
+        self.session_auth_hash = session_auth_hash
+
+    @property
+    def is_student(self):
+        return self.profile_type == 'student' and self.profile_id is not None
+
+    @property
+    def is_company(self):
+        return self.profile_type == 'company' and self.profile_id is not None
+
+    def as_entry(self):
+        return (
+            self.user_id, self.profile_type, self.profile_id, self.is_active, self.is_staff, self.session_auth_hash,
+        )
+
+    def build_user(self):
+        """User con los campos del principal; los demás se cargan juntos al leer el primero"""
+        known = {
+            'id': self.user_id, 'user_type': self.profile_type, 'is_active': self.is_active, 'is_staff': self.is_staff,
+        }
+        fields = [field.attname for field in User._meta.concrete_fields if field.attname in known]
+        user = User.from_db(router.db_for_read(User), fields, [known[name] for name in fields])
+        user.cached_session_auth_hash = self.session_auth_hash
+        user.principal = self
+        return user
+
+
+def get_cache():
+    return caches[settings.PRINCIPAL_CACHE_ALIAS]
+
+
+def principal_key(user_id):
+    return f'principal:{user_id}'
+
+
+def load_principal(user_id):
+    """Principal desde la caché; en un fallo lo arma con dos consultas y lo guarda"""
+    entry = get_cache().get(principal_key(user_id))
+    if entry is not None:
+        return Principal(*entry)
+
+    try:
+        user = User.objects.get(pk=user_id)
+    except User.DoesNotExist:
+        return None
+
+    profile_model = PROFILE_MODELS.get(user.user_type)
+    profile_id = None
+    if profile_model is not None:
+        profile_id = profile_model.objects.filter(user_id=user.pk).values_list('id', flat=True).first()
+
+    principal = Principal(
+        user.pk, user.user_type, profile_id, user.is_active, user.is_staff, user.get_session_auth_hash(),
+    )
+    get_cache().set(principal_key(user_id), principal.as_entry(), settings.PRINCIPAL_CACHE_TIMEOUT)
+    return principal
+
+
+def invalidate_principal(user_id):
+    get_cache().delete(principal_key(user_id))
+
+
+def get_principal(user):
+    """Principal del usuario de la petición, reutilizando el que cargó el backend"""
+    principal = getattr(user, 'principal', None)
+    if principal is None and user.is_authenticated:
+        principal = user.principal = load_principal(user.pk)
+    return principal
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend que resuelve el usuario de la sesión desde el principal cacheado"""
+
+    def get_user(self, user_id):
+        principal = load_principal(user_id)
+        if principal is None or not principal.is_active:
+            return None
+        return principal.build_user()
+
+
+@checks.register(checks.Tags.caches, checks.Tags.security)
+def check_principal_cache(app_configs, **kwargs):
+    """El principal cacheado en una caché por proceso no se invalida en los demás procesos"""
+    if BACKEND_PATH not in settings.AUTHENTICATION_BACKENDS:
+        return []
+    if isinstance(get_cache(), PER_PROCESS_CACHES):
+        return [checks.Error(
+            f'{BACKEND_PATH} requiere que PRINCIPAL_CACHE_ALIAS ({settings.PRINCIPAL_CACHE_ALIAS}) '
+            'sea una caché compartida entre procesos',
+            hint='Configure CACHE_BACKEND (p. ej. Redis) o quite el backend de AUTHENTICATION_BACKENDS',
+            id='students.E001',
+        )]
+    return []
@@ -0,0 +1,12 @@
+from Sut.hot_queries import register
+from .models import StudentProfile
+
+
+@register('students.by_university')
+def by_university():
+    return StudentProfile.objects.filter(university='UNAM')
+
+
+@register('students.by_career')
+def by_career():
+    return StudentProfile.objects.filter(career='Ingeniería')
@@ -39,6 +39,18 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
 
+    def get_session_auth_hash(self):
+        # El usuario armado desde el principal cacheado no trae la contraseña (ver auth.py)
+        cached = self.__dict__.get('cached_session_auth_hash')
+        return cached if cached is not None else super().get_session_auth_hash()
+
+    def refresh_from_db(self, using=None, fields=None):
+        # Al leer un campo diferido se cargan todos los diferidos con una sola consulta
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using, fields)
+
 
 class StudentProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='student_profile')
@@ -60,3 +72,8 @@ class StudentProfile(models.Model):
     class Meta:
         verbose_name = 'Student Profile'
         verbose_name_plural = 'Student Profiles'
+        indexes = [
+            models.Index(fields=['university'], name='students_university_idx'),
+            models.Index(fields=['career'], name='students_career_idx'),
+            models.Index(fields=['updated_at'], name='students_updated_idx'),
+        ]
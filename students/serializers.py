@@ -1,6 +1,10 @@
 from rest_framework import serializers
 from .models import User, StudentProfile
 from companies.models import CompanyProfile
+from Sut.images import AVATAR_SIZES, srcset
+from Sut.fields import SelectableFieldsMixin
+from Sut.serializer_cache import CachedRepresentationMixin, CachedListSerializer
+from Sut.uploads import MediaUploadMixin
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -10,14 +14,19 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'date_joined']
 
 
-class StudentProfileSerializer(serializers.ModelSerializer):
+class StudentProfileSerializer(SelectableFieldsMixin, MediaUploadMixin, CachedRepresentationMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    profile_picture_upload = serializers.UUIDField(write_only=True, required=False)
     profile_picture_url = serializers.SerializerMethodField()
+    profile_picture_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = StudentProfile
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = CachedListSerializer
+
+    upload_fields = {'profile_picture_upload': ('profile_picture', 'student_profile')}
 
     def get_profile_picture_url(self, obj):
         if obj.profile_picture:
@@ -27,6 +36,9 @@ class StudentProfileSerializer(serializers.ModelSerializer):
             return obj.profile_picture.url
         return None
 
+    def get_profile_picture_srcset(self, obj):
+        return srcset(obj.profile_picture, AVATAR_SIZES, self.context.get('request'))
+
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -0,0 +1,43 @@
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .auth import invalidate_principal
+from .models import User, StudentProfile
+from Sut.images import AVATAR_SIZES, schedule_derivatives
+from Sut.serializer_cache import invalidate, invalidate_queryset, user_fields_changed
+from Sut.sync import record_tombstone
+
+
+@receiver([post_save, post_delete], sender=StudentProfile)
+def invalidate_student_profile(sender, instance, **kwargs):
+    invalidate(StudentProfile, [instance.pk])
+    invalidate_principal(instance.user_id)
+
+
+@receiver(post_delete, sender=StudentProfile)
+def record_student_profile_tombstone(sender, instance, **kwargs):
+    # Los estudiantes solo ven su propio perfil
+    record_tombstone(instance, user_ids=[instance.user_id], user_types=['company'])
+
+
+@receiver(post_save, sender=StudentProfile)
+def generate_student_picture_derivatives(sender, instance, **kwargs):
+    schedule_derivatives(instance.profile_picture, AVATAR_SIZES)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_student_profile(sender, instance, update_fields=None, **kwargs):
+    if user_fields_changed(update_fields) and instance.user_type == 'student':
+        invalidate_queryset(StudentProfile.objects.filter(user=instance))
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_logged_out_principal(sender, user, **kwargs):
+    if user is not None:
+        invalidate_principal(user.pk)
@@ -1,3 +1,67 @@
-from django.test import TestCase
+import tempfile
 
-# Create your tests here.
+from django.conf import settings
+from django.test import TestCase, override_settings
+
+from .auth import BACKEND_PATH, check_principal_cache, get_cache, principal_key
+from .models import User, StudentProfile
+
+
+class PrincipalCacheTests(TestCase):
+    def setUp(self):
+        # El backend exige una caché compartida entre procesos
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        self.enterContext(override_settings(
+            CACHES={**settings.CACHES, 'principals': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location.name,
+            }},
+            PRINCIPAL_CACHE_ALIAS='principals',
+            AUTHENTICATION_BACKENDS=[BACKEND_PATH, 'django.contrib.auth.backends.ModelBackend'],
+        ))
+        self.user = User.objects.create_user('student@example.com', 'password123', user_type='student')
+        self.profile = StudentProfile.objects.create(
+            user=self.user, university='UNAM', career='Sistemas', semester=5, graduation_year=2026,
+        )
+        self.client.force_login(self.user)
+
+    def cached(self):
+        return get_cache().get(principal_key(self.user.pk))
+
+    def test_authenticated_read_without_auth_queries(self):
+        self.client.get('/api/students/auth/me/')
+        # Solo se lee la fila del usuario porque la respuesta usa sus datos
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/students/auth/me/')
+        self.assertEqual(response.json()['email'], 'student@example.com')
+        # La entrada no guarda el usuario ni el hash de su contraseña
+        self.assertEqual(self.cached(), (
+            self.user.pk, 'student', self.profile.pk, True, False, self.user.get_session_auth_hash(),
+        ))
+
+    def test_invalidated_on_save_and_logout(self):
+        self.client.get('/api/students/auth/me/')
+        self.user.first_name = 'Ana'
+        self.user.save()
+        self.assertIsNone(self.cached())
+        self.assertEqual(self.client.get('/api/students/auth/me/').json()['first_name'], 'Ana')
+
+        self.profile.delete()
+        self.assertIsNone(self.cached())
+        self.client.get('/api/students/auth/me/')
+        self.assertIsNone(self.cached()[2])
+
+        self.client.post('/api/students/auth/logout/')
+        self.assertIsNone(self.cached())
+        self.assertEqual(self.client.get('/api/students/auth/me/').status_code, 403)
+
+    def test_password_change_ends_sessions(self):
+        self.client.get('/api/students/auth/me/')
+        self.user.set_password('otra-clave-456')
+        self.user.save()
+        self.assertEqual(self.client.get('/api/students/auth/me/').status_code, 403)
+
+    def test_requires_shared_cache(self):
+        self.assertEqual(check_principal_cache(None), [])
+        with override_settings(PRINCIPAL_CACHE_ALIAS='default'):
+            self.assertEqual([error.id for error in check_principal_cache(None)], ['students.E001'])
@@ -1,11 +1,18 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AuthViewSet, StudentProfileViewSet
+from .views import AuthViewSet, StudentProfileViewSet, me, my_profile
+from Sut.async_api import get_or_delegate
 
 router = DefaultRouter()
 router.register(r'auth', AuthViewSet, basename='auth')
 router.register(r'profiles', StudentProfileViewSet, basename='student-profile')
 
 urlpatterns = [
+    path('auth/me/', get_or_delegate(me, AuthViewSet.as_view({'get': 'me'})), name='auth-me'),
+    path(
+        'profiles/my_profile/',
+        get_or_delegate(my_profile, StudentProfileViewSet.as_view({'get': 'my_profile'})),
+        name='student-profile-my-profile',
+    ),
     path('', include(router.urls)),
 ]
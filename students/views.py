@@ -1,11 +1,16 @@
+from asgiref.sync import sync_to_async
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from rest_framework.parsers import MultiPartParser, FormParser
 from django.contrib.auth import authenticate, login, logout
 from .models import User, StudentProfile
 from .serializers import UserSerializer, StudentProfileSerializer, UserRegistrationSerializer
+from Sut.async_api import async_read_view
+from Sut.fields import FieldSelection
+from Sut.renderers import FastJSONParser
+from Sut.sync import SyncListMixin
 
 
 class AuthViewSet(viewsets.ViewSet):
@@ -65,16 +70,18 @@ class AuthViewSet(viewsets.ViewSet):
         return Response(UserSerializer(request.user).data)
 
 
-class StudentProfileViewSet(viewsets.ModelViewSet):
+class StudentProfileViewSet(SyncListMixin, viewsets.ModelViewSet):
     queryset = StudentProfile.objects.all()
+    sync_models = (StudentProfile,)
     serializer_class = StudentProfileSerializer
     permission_classes = [IsAuthenticated]
-    parser_classes = (MultiPartParser, FormParser, JSONParser)
+    parser_classes = (MultiPartParser, FormParser, FastJSONParser)
 
     def get_queryset(self):
+        queryset = FieldSelection.from_request(self.request).select_related(StudentProfile.objects.all(), 'user')
         if self.request.user.user_type == 'student':
-            return StudentProfile.objects.filter(user=self.request.user)
-        return StudentProfile.objects.all()
+            return queryset.filter(user=self.request.user)
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -108,3 +115,21 @@ class StudentProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+
+@async_read_view(authenticated=True)
+async def me(request):
+    """Versión asíncrona de auth/me"""
+    # Los campos que no trae el principal cacheado se leen de la base de datos
+    return await sync_to_async(lambda: UserSerializer(request.user).data)()
+
+
+@async_read_view(authenticated=True)
+async def my_profile(request):
+    """Versión asíncrona de profiles/my_profile"""
+    try:
+        profile = await StudentProfile.objects.select_related('user').aget(user=request.user)
+    except StudentProfile.DoesNotExist:
+        return Response({'error': 'Perfil no encontrado'}, status=status.HTTP_404_NOT_FOUND)
+    return await sync_to_async(
+        lambda: StudentProfileSerializer(profile, context={'request': request}).data
+    )()